@@ -1 +1,26 @@
-from .src.LakehouseClient import LakehouseClient
\ No newline at end of file
+from .src.LakehouseClient import LakehouseClient
+from .src.transport import HTTPTransport
+from .src.cache import MetadataCache, ObjectCache
+from .src.remote import RemoteFile
+from .src.mirror import CatalogMirror
+from .src.types import BatchItemResult, PhaseEvent
+from .src.instrumentation import Instrumentation, InMemoryRecorder, LoggingExporter, PrometheusRegistry
+from .src.tuning import AdaptiveTuner, BandwidthLimiter
+from .src.formatting import iter_table_lines
+
+# the async client pulls in asyncio and httpx, so it is only imported when it is used
+ASYNC_EXPORTS = {
+    "AsyncLakehouseClient": ".src.AsyncLakehouseClient",
+    "AsyncHTTPTransport": ".src.async_transport"
+}
+
+
+def __getattr__(name: str):
+    if name in ASYNC_EXPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(ASYNC_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,930 @@
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Callable, Iterable, Literal
+from .types import BatchItemResult, Storage
+from .async_transport import AsyncHTTPTransport
+from .transfer import SPILL_THRESHOLD, atomic_output, output_file_names, worker_limits
+from .tuning import AdaptiveTuner, BandwidthLimiter
+from .readers import read_dataframe, write_dataframe
+from .query import PAGE_SIZE, FileListing, first_page, included_levels, next_page, order_records, parse_query_args, search_payload
+from .compression import StreamDecompressor, TransferCodec, stored_size, transfer_codec
+from .instrumentation import Instrumentation, detach_operation, record_bytes, request_phase, traced
+from .integrity import file_checksum, verify_file
+from .formatting import COLLECTION_COLUMNS, FILE_COLUMNS, format_file_records, format_output, pages_to_df
+from .payloads import UploadPlan, collection_payload, dataframe_upload, error_detail, request_headers
+import asyncio
+import tempfile
+import io
+import os
+import re
+import json
+import logging
+import time
+
+# pandas is only imported by the functions returning dataframes, see readers.py and formatting.py
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import httpx
+except ImportError:  # the async client is optional, pip install lakehouselib[async]
+    httpx = None
+
+MAX_CONCURRENCY = 8
+
+logger = logging.getLogger(__name__)
+
+class AsyncLakehouseClient:
+
+    def __init__(
+        self,
+        lakehouse_url: str,
+        protocol: Literal["http", "https"] = "https",
+        transport: AsyncHTTPTransport = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        instrumentation: Instrumentation = None,
+        tuner: AdaptiveTuner = None,
+        bandwidth_limiter: BandwidthLimiter = None
+    ) -> None:
+        """Description: Creates an asyncio client for the lakehouse API. It has the functions of the LakehouseClient as coroutines, so many calls can run at once with `asyncio.gather()`.\n
+        Parameters:\n
+        - lakehouse_url: the lakehouse API address\n
+        - protocol [Optional, default https]: the protocol used to reach the API ('http', 'https')\n
+        - transport [Optional]: the AsyncHTTPTransport used for every request, set it to tune the connection pool size, timeouts and retries\n
+        - max_concurrency [Optional, default 8]: the maximum number of file transfers (downloads, uploads and dataframe loads) running at once, further transfers wait for a free slot\n
+        - instrumentation [Optional]: an Instrumentation receiving the timing, bytes and retries of every operation phase, see `LakehouseClient`\n
+        - tuner [Optional]: the AdaptiveTuner choosing the chunk size, part size and concurrency of transfers, see `LakehouseClient`. Its maximum concurrency is capped at the transport `max_connections`\n
+        - bandwidth_limiter [Optional]: a BandwidthLimiter capping the throughput of every transfer, it can be shared with sync clients\n
+        """
+
+        pattern = re.compile(r'^https?://', re.IGNORECASE)
+        domain = pattern.sub('', lakehouse_url)
+
+        self.__lakehouse_url = f'{protocol}://{domain}'
+        self.__access_token = None
+        self.__transport = transport if transport else AsyncHTTPTransport()
+        self.__max_concurrency = max_concurrency
+        self.__transfer_slots = None
+        self.instrumentation = instrumentation if instrumentation else Instrumentation()
+        self.__tuner = tuner if tuner else AdaptiveTuner()
+        self.__tuner.cap_concurrency(self.__transport.max_connections)
+        self.__limiter = bandwidth_limiter
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections held by the client transport"""
+        await self.__transport.aclose()
+
+    # utlities
+    def __get_filename(self, path: str, keep_extension=True):
+        filename = os.path.basename(path)
+        if not keep_extension:
+            filename, _ = os.path.splitext(filename)
+        return filename
+
+    def __transfer_slot(self) -> asyncio.Semaphore:
+        # created on first use, so it belongs to the running event loop
+        if self.__transfer_slots is None:
+            self.__transfer_slots = asyncio.Semaphore(self.__max_concurrency)
+
+        return self.__transfer_slots
+
+    async def __send_request(self, endpoint, method = "POST", **kwargs):
+        url = f"{self.__lakehouse_url}{endpoint}"
+
+        headers = request_headers(self.__access_token, method)
+
+        try:
+            with self.instrumentation.phase(request_phase(endpoint)):
+                response = await self.__transport.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    **kwargs
+                )
+
+                response.raise_for_status()
+
+                return response.json()
+
+        except httpx.HTTPStatusError as _:
+            raise Exception(f"API request failed ({response.status_code}): {error_detail(response)}")
+
+        except httpx.HTTPError as req_err:
+            raise Exception(f"Request failed: {str(req_err)}")
+
+        except ValueError as json_err:
+            raise Exception(f"Failed to parse API response: {str(json_err)}")
+
+    async def __get_file_record(self, catalog_file_id: str) -> dict:
+        return await self.__send_request(method="GET", endpoint=f"/catalog/file/id/{catalog_file_id}")
+
+    async def __fetch_file_records(self, catalog_file_ids: list[str]) -> dict[str, BatchItemResult]:
+        # every id is requested once, however many times it is listed
+        unique_ids = list(dict.fromkeys(catalog_file_ids))
+
+        results = await self.__gather(keys=unique_ids, work=self.__get_file_record, detach=False)
+
+        return {result.key: result for result in results}
+
+    def __record_of(self, record_result: BatchItemResult) -> dict:
+        if not record_result.ok:
+            raise Exception(record_result.error)
+
+        return record_result.value
+
+    async def __request_download_url(self, catalog_file_id: str) -> str:
+        payload = {
+            "catalog_file_id": catalog_file_id
+        }
+
+        # issuing a signed url has no side effects, so it is safe to retry
+        response = await self.__send_request(method="POST", endpoint="/storage/files/download-request", json=payload, retry=True)
+
+        return response["download_url"]
+
+    async def __write_download(self, signed_url: str, file: BinaryIO, codec: str = None, spill_threshold: int = 0) -> int:
+        started = time.perf_counter()
+
+        response = await self.__transport.request("GET", signed_url, stream=True)
+
+        latency = time.perf_counter() - started
+        received = 0
+
+        try:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Failed to download file. Status Code: {response.status_code}, Error: {response.text}")
+
+            decompressor = StreamDecompressor(codec) if codec else None
+            written = 0
+
+            async for chunk in response.aiter_bytes(self.__tuner.chunk_size()):
+                record_bytes(len(chunk))
+                received += len(chunk)
+
+                if self.__limiter:
+                    await self.__limiter.acquire_async(len(chunk))
+
+                if decompressor:
+                    chunk = decompressor.decompress(chunk)
+
+                if chunk:
+                    await self.__write_chunk(file, chunk, in_memory=written + len(chunk) <= spill_threshold)
+                    written += len(chunk)
+
+            if decompressor and (tail := decompressor.flush()):
+                await self.__write_chunk(file, tail, in_memory=written + len(tail) <= spill_threshold)
+                written += len(tail)
+
+            self.__tuner.observe(received, time.perf_counter() - started, latency=latency)
+
+            return written
+        finally:
+            await response.aclose()
+
+    async def __write_chunk(self, file: BinaryIO, chunk: bytes, in_memory: bool = False) -> None:
+        # spooled files below their threshold are copied in memory, only disk writes are worth a worker thread
+        if in_memory:
+            file.write(chunk)
+        else:
+            await asyncio.to_thread(file.write, chunk)
+
+    async def __send_chunk(self, method: str, url: str, chunk: bytes, parallel: bool = False) -> "httpx.Response":
+        if self.__limiter:
+            await self.__limiter.acquire_async(len(chunk))
+
+        started = time.perf_counter()
+
+        response = await self.__transport.request(method, url, content=chunk, headers={"Content-Type": "application/octet-stream"})
+        response.raise_for_status()
+
+        self.__tuner.observe(len(chunk), time.perf_counter() - started, direction="upload", parallel=parallel)
+        record_bytes(len(chunk))
+
+        return response
+
+    async def __gather(
+        self,
+        keys: list[str],
+        work: Callable,
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None,
+        detach: bool = True
+    ) -> list[BatchItemResult]:
+        completed = 0
+
+        async def run(key: str) -> BatchItemResult:
+            nonlocal completed
+
+            # files of a batch are reported as operations of their own, other work as part of the batch
+            if detach:
+                detach_operation()
+
+            try:
+                result = BatchItemResult(key=key, value=await work(key))
+            except Exception as error:
+                result = BatchItemResult(key=key, error=str(error))
+
+            completed += 1
+
+            if progress_callback:
+                progress_callback(completed, len(keys), result)
+
+            return result
+
+        return list(await asyncio.gather(*(run(key) for key in keys)))
+
+    async def __iter_pages(self, endpoint: str, page_size: int = PAGE_SIZE, method: str = "GET", **kwargs) -> AsyncIterator[list[dict]]:
+        params = first_page(page_size)
+
+        while params is not None:
+            response = await self.__send_request(method=method, endpoint=endpoint, params=params, **kwargs)
+
+            records, params = next_page(response, params, page_size)
+
+            if records:
+                yield records
+
+    async def __iter_file_pages(
+        self,
+        include_raw: bool,
+        include_processed: bool,
+        include_curated: bool,
+        page_size: int = PAGE_SIZE,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> AsyncIterator[list[dict]]:
+        levels = included_levels(include_raw, include_processed, include_curated)
+
+        listing = FileListing(levels, page_size, sort_by_key, sort_desc, limit)
+
+        while (request := listing.next_request()) is not None:
+            records = listing.receive(await self.__send_request(**request))
+
+            if records:
+                yield records
+
+    async def __search(self, catalog_type: str, parsed_args: list[tuple], output_format: str):
+        if output_format not in ["df", "json", "dict", "table"]:
+            raise Exception("Must specify output format")
+
+        response = await self.__send_request(method="POST", endpoint=f"/catalog/{catalog_type}/search", json=search_payload(parsed_args))
+
+        return format_output(data=response.get("records", []), output_format=output_format)
+
+    # Authentication function
+    @traced("auth")
+    async def auth(self, email: str, password: str) -> str:
+        """Authenticates the user based on the logn details. It returns the authentication token"""
+
+        auth_payload = dict(email=email, password=password)
+
+        response = await self.__send_request(method="POST", endpoint="/auth/login", json=auth_payload)
+
+        if response:
+            self.__access_token = response["access_token"]
+
+            msg = "Session Authenticated!"
+
+        else:
+            msg = "Unable to authenticate!"
+
+        return msg
+
+
+    # Creating functions
+    @traced("create_collection")
+    async def create_collection(
+        self,
+        storage_type: Storage,
+        collection_name: str,
+        bucket_name: str,
+        collection_description: str = None,
+        public: bool = False,
+        secret: bool = False
+    ) -> str:
+        """Description: Created a new collections of file, see `LakehouseClient.create_collection()`. Returns a collection's name.\n"""
+
+        payload = collection_payload(storage_type, collection_name, bucket_name, collection_description, public, secret)
+
+        return await self.__send_request(method="POST", endpoint="/storage/collections/create", json=payload)
+
+
+    # Downloading functions
+    @traced("download_file", "catalog_file_id")
+    async def download_file(
+        self,
+        catalog_file_id: str,
+        output_file_dir: str = None,
+        verify: bool = True
+    ) -> str:
+        """Description: Downloads a file from the catalog into a local directory. It returns the local file path.\n
+        The file is written and verified in worker threads, so the event loop keeps serving other calls.\n
+        Parameters:\n
+        - catalog_file_id: the file id in the catalog\n
+        - output_file_dir [Optional]: the local directory where the file will be placed, by default the current working directory\n
+        - verify [Optional, default True]: checks the downloaded file against the checksum recorded in the catalog, a file that does not match is removed and an exception is raised\n
+        """
+
+        catalog_item = await self.__get_file_record(catalog_file_id)
+
+        return await self.__download_file(catalog_file_id, catalog_item, output_file_dir, verify)
+
+    @traced("download_file", "catalog_file_id")
+    async def __download_file(
+        self,
+        catalog_file_id: str,
+        catalog_item: dict,
+        output_file_dir: str = None,
+        verify: bool = True,
+        output_file_name: str = None
+    ) -> str:
+        if not output_file_dir:
+            output_file_dir = os.getcwd()
+
+        output_file_path = os.path.join(output_file_dir, output_file_name or catalog_item['file_name'])
+
+        logger.info("Downloading %s (%s)", catalog_item['file_name'], catalog_file_id)
+
+        signed_url = await self.__request_download_url(catalog_file_id)
+
+        # the file only appears at its path once it is complete and verified
+        async with self.__transfer_slot():
+            with atomic_output(output_file_path) as temp_path:
+                file = await asyncio.to_thread(open, temp_path, "wb")
+
+                try:
+                    with self.instrumentation.phase("transfer", total=stored_size(catalog_item)):
+                        await self.__write_download(signed_url, file, codec=transfer_codec(catalog_item))
+                finally:
+                    await asyncio.to_thread(file.close)
+
+                # hashing the file would hold the event loop, so it runs in a worker thread
+                if verify:
+                    with self.instrumentation.phase("checksum"):
+                        await asyncio.to_thread(verify_file, temp_path, catalog_item)
+
+        logger.info("Data downloaded to %s", output_file_path)
+
+        return output_file_path
+
+    @traced("download_files")
+    async def download_files(
+        self,
+        catalog_file_ids: list[str],
+        output_file_dir: str = None,
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None
+    ) -> list[BatchItemResult]:
+        """Description: Downloads many files from the catalog concurrently, up to the client `max_concurrency` at once. It returns one result per id, in the input order, holding the local file path or the error raised for that file.\n
+        Parameters:\n
+        - catalog_file_ids: the file ids in the catalog\n
+        - output_file_dir [Optional]: the local directory where the files will be placed, by default the current working directory. Files sharing a name, like versions of one file, are saved as `<name>_<catalog_file_id><extension>`\n
+        - progress_callback [Optional]: a function called as each file completes with the number of completed files, the total number of files and the file result\n
+        """
+
+        records = await self.__fetch_file_records(catalog_file_ids)
+
+        file_names = output_file_names({key: result.value for key, result in records.items() if result.ok})
+
+        return await self.__gather(
+            keys=list(catalog_file_ids),
+            work=lambda catalog_file_id: self.__download_file(
+                catalog_file_id=catalog_file_id,
+                catalog_item=self.__record_of(records[catalog_file_id]),
+                output_file_dir=output_file_dir,
+                output_file_name=file_names.get(catalog_file_id)
+            ),
+            progress_callback=progress_callback
+        )
+
+
+    # Get functions
+    @traced("get_file_records")
+    async def get_file_records(
+        self,
+        catalog_file_ids: list[str],
+        output_format: Literal["dict", "df"] = "dict"
+    ) -> "dict[str, dict] | pd.DataFrame":
+        """Description: Get the catalog records of many files, fetching them concurrently. Repeated ids are fetched once, see `LakehouseClient.get_file_records()`.\n
+        Parameters:\n
+        - catalog_file_ids: the file ids in the catalog\n
+        - output_format [Optional, default dict]: "dict" or "df"\n
+        """
+
+        if output_format not in ["dict", "df"]:
+            raise Exception("Must specify output format")
+
+        results = await self.__fetch_file_records(catalog_file_ids)
+
+        return format_file_records(results, output_format)
+
+    @traced("get_dataframe", "catalog_file_id")
+    async def get_dataframe(
+        self,
+        catalog_file_id: str,
+        spill_threshold: int = SPILL_THRESHOLD,
+        columns: list[str] = None,
+        filters: list = None
+    ) -> "pd.DataFrame | dict":
+        """Description: Get a file as a dataframe, see `LakehouseClient.get_dataframe()`. \n
+        The file is downloaded into memory and parsed in a worker thread, so the event loop keeps serving other calls while it is parsed.\n
+        Parameters:\n
+        - catalog_file_id: is the id for the dataframe record in the catalog
+        - spill_threshold [Optional, default 64 MB]: the number of bytes kept in memory, larger files are spilled to a temporary file in the system temp directory
+        - columns [Optional]: the columns to load
+        - filters [Optional]: the rows to keep, as a list of (column, operator, value) tuples that must all match, or a list of such lists of which one must match
+        """
+
+        catalog_item = await self.__get_file_record(catalog_file_id)
+
+        return await self.__get_dataframe(catalog_file_id, catalog_item, spill_threshold, columns, filters)
+
+    @traced("get_dataframe", "catalog_file_id")
+    async def __get_dataframe(
+        self,
+        catalog_file_id: str,
+        catalog_item: dict,
+        spill_threshold: int = SPILL_THRESHOLD,
+        columns: list[str] = None,
+        filters: list = None
+    ) -> "pd.DataFrame | dict":
+        signed_url = await self.__request_download_url(catalog_file_id)
+
+        async with self.__transfer_slot():
+            with tempfile.SpooledTemporaryFile(max_size=spill_threshold) as buffer:
+                with self.instrumentation.phase("transfer", total=stored_size(catalog_item)):
+                    await self.__write_download(signed_url, buffer, codec=transfer_codec(catalog_item), spill_threshold=spill_threshold)
+
+                buffer.seek(0)
+
+                with self.instrumentation.phase("parse"):
+                    return await asyncio.to_thread(read_dataframe, buffer, catalog_item["file_name"], columns, filters)
+
+    @traced("get_dataframes")
+    async def get_dataframes(
+        self,
+        catalog_file_ids: list[str],
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None,
+        spill_threshold: int = SPILL_THRESHOLD,
+        columns: list[str] = None,
+        filters: list = None
+    ) -> list[BatchItemResult]:
+        """Description: Get many files as dataframes, loading them concurrently up to the client `max_concurrency` at once. It returns one result per id, in the input order, holding the dataframe or the error raised for that file.\n
+        Parameters:\n
+        - catalog_file_ids: the file ids in the catalog\n
+        - progress_callback [Optional]: a function called as each file completes with the number of completed files, the total number of files and the file result\n
+        - spill_threshold [Optional, default 64 MB]: the number of bytes of each file kept in memory, see `get_dataframe()`\n
+        - columns [Optional]: the columns to load from each file\n
+        - filters [Optional]: the rows to keep from each file\n
+        """
+
+        records = await self.__fetch_file_records(catalog_file_ids)
+
+        return await self.__gather(
+            keys=list(catalog_file_ids),
+            work=lambda catalog_file_id: self.__get_dataframe(
+                catalog_file_id=catalog_file_id,
+                catalog_item=self.__record_of(records[catalog_file_id]),
+                spill_threshold=spill_threshold,
+                columns=columns,
+                filters=filters
+            ),
+            progress_callback=progress_callback
+        )
+
+
+    # listing iterator functions
+    async def list_collections_iter(self, page_size: int = PAGE_SIZE) -> AsyncIterator[dict]:
+        """Description: Iterates over all available collections with `async for`, fetching the catalog page by page. It yields one dictionary per record\n
+        Parameters:\n
+        - page_size [Optional, default 1000]: the number of records requested per page. Servers without pagination return every record in one page
+        """
+
+        async for page in self.__iter_pages("/catalog/collections/all/", page_size=page_size):
+            for record in page:
+                yield record
+
+    async def list_files_iter(
+        self,
+        include_raw: bool = True,
+        include_processed: bool = True,
+        include_curated: bool = True,
+        page_size: int = PAGE_SIZE
+    ) -> AsyncIterator[dict]:
+        """Description: Iterates over all available files with `async for`, fetching the catalog page by page. It yields one dictionary per record\n
+        Parameters:\n
+        - include_raw, include_processed, include_curated [Optional, default True]: whether files of each processing level are included
+        - page_size [Optional, default 1000]: the number of records requested per page. Servers without pagination return every record in one page
+        """
+
+        async for page in self.__iter_file_pages(include_raw, include_processed, include_curated, page_size):
+            for record in page:
+                yield record
+
+
+    # listing dictionaries functions
+    @traced("list_collections_dict")
+    async def list_collections_dict(
+        self,
+        sort_by_key: str = None,
+        sort_desc: bool = False
+    ) -> list[dict]:
+        """Description: Lists all available collections and returns a list of dictionary with the records\n"""
+
+        records = [record async for record in self.list_collections_iter()]
+
+        return order_records(records, sort_by_key, sort_desc)
+
+    @traced("list_files_dict")
+    async def list_files_dict(
+        self,
+        include_raw: bool = True,
+        include_processed: bool = True,
+        include_curated: bool = True,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> list[dict]:
+        """Description: Lists all available files and returns a list of dictionaries with the records. Filters, sorting and limit are evaluated by the server when possible\n"""
+
+        pages = self.__iter_file_pages(include_raw, include_processed, include_curated, PAGE_SIZE, sort_by_key, sort_desc, limit)
+
+        records = [item async for page in pages for item in page]
+
+        return order_records(records, sort_by_key, sort_desc, limit)
+
+    @traced("list_buckets_dict")
+    async def list_buckets_dict(self) -> list[dict]:
+        """Lists all the available storage buckets in the system and returns a list of dictionaries with the records"""
+
+        response = await self.__send_request(method="GET", endpoint="/storage/bucket-list")
+
+        bucket_list = list(dict(response).get("bucket_list", []))
+
+        return sorted(bucket_list, key=lambda item: item["bucket_name"])
+
+
+    # listing json functions
+    @traced("list_collections_json")
+    async def list_collections_json(
+        self,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        indented: bool = True
+    ) -> str:
+        """Description: Lists all available collections and returns a formatted json string with the records\n"""
+
+        records = await self.list_collections_dict(sort_by_key, sort_desc)
+
+        return json.dumps(obj=records, indent=2 if indented else None)
+
+    @traced("list_files_json")
+    async def list_files_json(
+        self,
+        include_raw: bool = True,
+        include_processed: bool = True,
+        include_curated: bool = True,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        indented: bool = True,
+        limit: int = None
+    ) -> str:
+        """Description: Lists all available files and returns a formatted json string with the records\n"""
+
+        records = await self.list_files_dict(include_raw, include_processed, include_curated, sort_by_key, sort_desc, limit)
+
+        return json.dumps(obj=records, indent=2 if indented else None)
+
+    @traced("list_buckets_json")
+    async def list_buckets_json(self, indented: bool = True) -> str:
+        """Lists all the available storage buckets in the system and returns a json string with the records"""
+
+        records = await self.list_buckets_dict()
+
+        return json.dumps(obj=records, indent=2 if indented else None)
+
+
+    # listing df functions
+    @traced("list_collections_df")
+    async def list_collections_df(
+        self,
+        sort_by_key: str = None,
+        sort_desc: bool = False
+    ) -> "pd.DataFrame":
+        """Description: Lists all available collections and returns a dataframe with the records\n"""
+
+        pages = [page async for page in self.__iter_pages("/catalog/collections/all/")]
+
+        return pages_to_df(pages, COLLECTION_COLUMNS, sort_by_key, sort_desc)
+
+    @traced("list_files_df")
+    async def list_files_df(
+        self,
+        include_raw: bool = True,
+        include_processed: bool = True,
+        include_curated: bool = True,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> "pd.DataFrame":
+        """Description: Lists all available files and returns a dataframe with the records. Filters, sorting and limit are evaluated by the server when possible\n"""
+
+        pages = [page async for page in self.__iter_file_pages(include_raw, include_processed, include_curated, PAGE_SIZE, sort_by_key, sort_desc, limit)]
+
+        return pages_to_df(pages, FILE_COLUMNS, sort_by_key, sort_desc, limit)
+
+    @traced("list_buckets_df")
+    async def list_buckets_df(self) -> "pd.DataFrame":
+        """Lists all the available storage buckets in the system and returns a dataframe with the records"""
+
+        import pandas as pd
+
+        return pd.DataFrame(await self.list_buckets_dict())
+
+    @traced("list_collections")
+    async def list_collections(self, sort_by_key: str = None, sort_desc: bool = False) -> "pd.DataFrame":
+        """Description: Lists all available collections and returns a dataframe with the records\n"""
+        return await self.list_collections_df(sort_by_key, sort_desc)
+
+    @traced("list_files")
+    async def list_files(
+        self,
+        include_raw: bool = True,
+        include_processed: bool = True,
+        include_curated: bool = True,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> "pd.DataFrame":
+        """Description: Lists all available files and returns a dataframe with the records\n"""
+        return await self.list_files_df(include_raw, include_processed, include_curated, sort_by_key, sort_desc, limit)
+
+    @traced("list_buckets")
+    async def list_buckets(self) -> "pd.DataFrame":
+        """Lists all the available storage buckets in the system and returns a dataframe with the records"""
+        return await self.list_buckets_df()
+
+
+    # upload function
+    @traced("upload_dataframe", "df_name")
+    async def upload_dataframe(
+        self,
+        df: "pd.DataFrame",
+        df_name: str,
+        collection_catalog_id: str,
+        dataframe_description: str = "",
+        dataframe_version: int = 1,
+        public: bool = False,
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        file_format: Literal["parquet", "feather", "csv"] = "parquet",
+        compression: str = None,
+        row_group_size: int = None,
+        deduplicate: bool = False
+    ) -> dict[str]:
+        """Description: Uploads a dataframe, see `LakehouseClient.upload_dataframe()`. The dataframe is serialized in a worker thread. It returns the catalog item for the new file uploaded.\n"""
+
+        file_name, metadata = dataframe_upload(df_name, file_format, compression)
+
+        buffer = io.BytesIO()
+
+        await asyncio.to_thread(write_dataframe, df, buffer, file_format, compression, row_group_size)
+
+        buffer.seek(0)
+
+        return await self.upload_stream(
+            data=buffer,
+            final_file_name=file_name,
+            collection_catalog_id=collection_catalog_id,
+            file_category="structured",
+            file_description=dataframe_description,
+            file_version=dataframe_version,
+            public=public,
+            processing_level=processing_level,
+            metadata=metadata,
+            deduplicate=deduplicate
+        )
+
+    @traced("upload_file", "final_file_name")
+    async def upload_file(
+        self,
+        local_file_path: str,
+        final_file_name: str,
+        collection_catalog_id: str,
+        file_category: Literal["structured", "unstructured"] = "unstructured",
+        file_description: str = None,
+        file_version: int = 1,
+        public: bool = False,
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        metadata: dict = None,
+        multipart: bool = False,
+        part_size: int = None,
+        max_workers: int = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None
+    ) -> dict[str]:
+        """Description: Uploads a file from local storage, see `LakehouseClient.upload_file()`. It returns the catalog item for the new file uploaded.\n"""
+
+        _, file_extension = os.path.splitext(local_file_path)
+
+        if file_extension and not final_file_name.lower().endswith(file_extension.lower()):
+            final_file_name += file_extension
+
+        # opening a file can block on slow or network disks
+        file = await asyncio.to_thread(open, local_file_path, "rb")
+
+        try:
+            return await self.upload_stream(
+                data=file,
+                final_file_name=final_file_name,
+                collection_catalog_id=collection_catalog_id,
+                file_category=file_category,
+                file_description=file_description,
+                file_version=file_version,
+                public=public,
+                processing_level=processing_level,
+                metadata=metadata,
+                multipart=multipart,
+                part_size=part_size,
+                max_workers=max_workers,
+                deduplicate=deduplicate,
+                transfer_compression=transfer_compression
+            )
+        finally:
+            await asyncio.to_thread(file.close)
+
+    @traced("upload_stream", "final_file_name")
+    async def upload_stream(
+        self,
+        data: bytes | BinaryIO | Iterable[bytes],
+        final_file_name: str,
+        collection_catalog_id: str,
+        file_category: Literal["structured", "unstructured"] = "unstructured",
+        file_description: str = None,
+        file_version: int = 1,
+        file_size: int = None,
+        public: bool = False,
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        metadata: dict = None,
+        multipart: bool = False,
+        part_size: int = None,
+        max_workers: int = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None
+    ) -> dict[str]:
+        """Description: Uploads data held in memory or produced on the fly, see `LakehouseClient.upload_stream()`. It returns the catalog item for the new file uploaded.\n
+        The data is read, hashed and compressed in a worker thread, so the event loop keeps serving other calls.\n
+        """
+
+        logger.info("Uploading %s", final_file_name)
+
+        async with self.__transfer_slot():
+            # the plan seeks file objects to measure them
+            plan = await asyncio.to_thread(
+                UploadPlan,
+                data=data,
+                final_file_name=final_file_name,
+                collection_catalog_id=collection_catalog_id,
+                file_category=file_category,
+                file_description=file_description,
+                file_version=file_version,
+                file_size=file_size,
+                public=public,
+                processing_level=processing_level,
+                metadata=metadata,
+                multipart=multipart,
+                part_size=part_size,
+                deduplicate=deduplicate,
+                transfer_compression=transfer_compression,
+                tuner=self.__tuner
+            )
+
+            if deduplicate:
+                with self.instrumentation.phase("checksum"):
+                    plan.set_checksum(await asyncio.to_thread(file_checksum, plan.file))
+
+                identical_file = plan.identical_file(await self.__send_request(**plan.identical_file_request()))
+
+                if identical_file:
+                    logger.info("Identical file already uploaded as %s, transfer skipped", identical_file.get("id"))
+                    return identical_file
+
+            plan.receive(await self.__send_request(**plan.upload_request()))
+
+            parts = None
+            bytes_sent = 0
+
+            with self.instrumentation.phase("transfer", total=None if plan.codec else plan.file_size):
+                if plan.part_urls:
+                    parts = await self.__upload_parts(plan.part_urls, plan.file, plan.part_size, max_workers, plan.part_method)
+                else:
+                    body = plan.body()
+
+                    while chunk := await asyncio.to_thread(body.read, self.__tuner.chunk_size("upload")):
+                        await self.__send_chunk(plan.method, plan.upload_url, chunk)
+                        bytes_sent += len(chunk)
+
+            response = await self.__send_request(**plan.finalize_request(bytes_sent=bytes_sent, parts=parts))
+
+        logger.info("Data uploaded as %s", plan.catalog_record_id)
+
+        return response
+
+    async def __upload_parts(self, part_urls: list[str], file: BinaryIO, part_size: int, max_workers: int, method: str) -> list[dict]:
+        async def send_part(part_number: int, url: str, chunk: bytes) -> dict:
+            response = await self.__send_chunk(method, url, chunk, parallel=True)
+            return {"part_number": part_number, "size": len(chunk), "etag": response.headers.get("ETag")}
+
+        parts = []
+        pending = set()
+
+        _, in_flight = worker_limits(max_workers, self.__tuner)
+
+        try:
+            for part_number, url in enumerate(part_urls, start=1):
+                while len(pending) >= in_flight():
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    parts.extend(task.result() for task in done)
+
+                chunk = await asyncio.to_thread(file.read, part_size)
+
+                if not chunk and part_number > 1:
+                    raise Exception(f"File ended before part {part_number} of {len(part_urls)}")
+
+                pending.add(asyncio.ensure_future(send_part(part_number, url, chunk)))
+
+            if await asyncio.to_thread(file.read, 1):
+                raise Exception(f"File is larger than the {len(part_urls)} parts granted by the server")
+
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                parts.extend(task.result() for task in done)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        return sorted(parts, key=lambda part: part["part_number"])
+
+    @traced("upload_files")
+    async def upload_files(
+        self,
+        local_file_paths: list[str],
+        collection_catalog_id: str,
+        file_category: Literal["structured", "unstructured"] = "unstructured",
+        file_description: str = None,
+        file_version: int = 1,
+        public: bool = False,
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None
+    ) -> dict[str, list[dict]]:
+        """Description: Uploads many local files concurrently into a collection, up to the client `max_concurrency` at once, see `LakehouseClient.upload_files()`. It returns a manifest with the catalog records of the uploaded files and the errors of the failed ones.\n"""
+
+        results = await self.__gather(
+            keys=list(local_file_paths),
+            work=lambda local_file_path: self.upload_file(
+                local_file_path=local_file_path,
+                final_file_name=self.__get_filename(local_file_path),
+                collection_catalog_id=collection_catalog_id,
+                file_category=file_category,
+                file_description=file_description,
+                file_version=file_version,
+                public=public,
+                processing_level=processing_level,
+                deduplicate=deduplicate,
+                transfer_compression=transfer_compression
+            ),
+            progress_callback=progress_callback
+        )
+
+        return {
+            "uploaded": [dict(local_file_path=result.key, record=result.value) for result in results if result.ok],
+            "failed": [dict(local_file_path=result.key, error=result.error) for result in results if not result.ok]
+        }
+
+
+    # search function
+    @traced("search_collections_by_keyword")
+    async def search_collections_by_keyword(self, keyword: str, output_format: Literal["df", "json", "dict", "table"] = "df"):
+        """Description: Search collections whose name contains the keyword, see `LakehouseClient.search_collections_by_keyword()`\n"""
+        return await self.__search("collections", [("collection_name", "*", keyword)], output_format)
+
+    @traced("search_files_by_keyword")
+    async def search_files_by_keyword(self, keyword: str, output_format: Literal["df", "json", "dict", "table"] = "df"):
+        """Description: Search files whose name contains the keyword, see `LakehouseClient.search_files_by_keyword()`\n"""
+        return await self.__search("files", [("file_name", "*", keyword)], output_format)
+
+    @traced("search_collections_query")
+    async def search_collections_query(self, *args, output_format: Literal["df", "json", "dict", "table"] = "df"):
+        """Description: Search collections with query strings such as "collection_name=lakehouse", see `LakehouseClient.search_collections_query()`\n"""
+        return await self.__search("collections", parse_query_args(args=args), output_format)
+
+    @traced("search_files_query")
+    async def search_files_query(self, *args, output_format: Literal["df", "json", "dict", "table"] = "df"):
+        """Description: Search files with query strings such as "file_name*sample", see `LakehouseClient.search_files_query()`\n"""
+        return await self.__search("files", parse_query_args(args=args), output_format)
@@ -1,22 +1,97 @@
-from typing import Literal
-from .types import CatalogFilter, CatalogFilterPayload, Storage
-import pandas as pd
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator, Literal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .types import BatchItemResult, Storage
+from .transport import HTTPTransport
+from .transfer import CHUNK_SIZE, PREFETCH_CHUNKS, SPILL_THRESHOLD, ChunkReader, atomic_output, download_ranges, output_file_names, prefetch, response_chunks, send_chunk, spool_response, upload_parts, write_response
+from .tuning import AdaptiveTuner, BandwidthLimiter
+from .readers import DATAFRAME_CHUNK_ROWS, STREAMING_EXTENSIONS, iter_dataframe, read_dataframe, write_dataframe
+from .remote import REMOTE_BLOCK_SIZE, REMOTE_CACHE_BLOCKS, RemoteFile
+from .cache import MetadataCache, ObjectCache
+from .query import PAGE_SIZE, FileListing, first_page, included_levels, is_cut_short, next_page, order_records, parse_query_args, search_payload
+from .mirror import CatalogMirror
+from .compression import TransferCodec, stored_size, transfer_codec
+from .instrumentation import Instrumentation, detach_operation, request_phase, traced
+from .integrity import file_checksum, verify_file, verify_stream
+from .formatting import COLLECTION_COLUMNS, FILE_COLUMNS, format_file_records, format_output, pages_to_df
+from .payloads import UploadPlan, collection_payload, dataframe_upload, error_detail, request_headers
 import requests
+import shutil
+import glob
+import contextvars
+import io
 import os
 import re
 import json
+import logging
+import time
 
-CHUNK_SIZE = 1 * 1024 * 1024
+# pandas is only imported by the functions returning dataframes, see readers.py and formatting.py
+if TYPE_CHECKING:
+    import pandas as pd
+
+BATCH_MAX_WORKERS = 8
+RECORDS_MAX_WORKERS = 16
+
+logger = logging.getLogger(__name__)
 class LakehouseClient:
      
-    def __init__(self, lakehouse_url: str, protocol: Literal["http", "https"] = "https") -> None:
+    def __init__(
+        self,
+        lakehouse_url: str,
+        protocol: Literal["http", "https"] = "https",
+        transport: HTTPTransport = None,
+        cache: ObjectCache = None,
+        metadata_cache: MetadataCache = None,
+        mirror: CatalogMirror = None,
+        instrumentation: Instrumentation = None,
+        tuner: AdaptiveTuner = None,
+        bandwidth_limiter: BandwidthLimiter = None
+    ) -> None:
+        """Description: Creates a client for the lakehouse API.\n
+        Parameters:\n
+        - lakehouse_url: the lakehouse API address\n
+        - protocol [Optional, default https]: the protocol used to reach the API ('http', 'https')\n
+        - transport [Optional]: the HTTPTransport used for every request, set it to tune the connection pool size, timeouts and retries\n
+        - cache [Optional]: an ObjectCache where downloaded files are kept, files already in the cache are not downloaded again\n
+        - metadata_cache [Optional]: a MetadataCache reusing catalog responses for a short time, it is invalidated after uploads and collection creations\n
+        - mirror [Optional]: a CatalogMirror the search functions can run against with `use_mirror=True`, see `sync_catalog_mirror()`\n
+        - instrumentation [Optional]: an Instrumentation receiving the timing, bytes and retries of every operation phase, it can also be set later through `client.instrumentation`\n
+        - tuner [Optional]: the AdaptiveTuner choosing the chunk size, part size and concurrency of transfers from the throughput observed, by default each client has its own. Its maximum concurrency is capped at the transport pool size\n
+        - bandwidth_limiter [Optional]: a BandwidthLimiter capping the throughput of every transfer, share it between clients to cap their combined throughput\n
+        """
 
         pattern = re.compile(r'^https?://', re.IGNORECASE)
         domain = pattern.sub('', lakehouse_url)
 
         self.__lakehouse_url = f'{protocol}://{domain}'
         self.__access_token = None
-        self.__file_load_path = "./"
+        self.__transport = transport if transport else HTTPTransport()
+        self.__cache = cache
+        self.__metadata_cache = metadata_cache
+        self.__mirror = mirror
+        self.instrumentation = instrumentation if instrumentation else Instrumentation()
+        self.__tuner = tuner if tuner else AdaptiveTuner()
+        # parts beyond the connection pool would wait for a connection or open throwaway ones
+        self.__tuner.cap_concurrency(self.__transport.pool_size)
+        self.__limiter = bandwidth_limiter
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """Closes the pooled connections held by the client transport"""
+        self.__transport.close()
+
+    def invalidate_metadata_cache(self, endpoint_prefix: str = None) -> None:
+        """Description: Drops the catalog responses kept by the client metadata cache.\n
+        Parameters:\n
+        - endpoint_prefix [Optional]: only drops the responses of endpoints starting with this prefix (e.g. "/catalog/files"), by default every response is dropped\n
+        """
+        if self.__metadata_cache:
+            self.__metadata_cache.invalidate(endpoint_prefix)
 
     # utlities
     def __file_chunk_generator(self, file_path, chunk_size=1*1024*1024):
@@ -24,67 +99,6 @@ class LakehouseClient:
             while chunk := file.read(chunk_size):
                 yield chunk
 
-    def __format_size(self, bytes: int):
-        kb = bytes / 1024
-        if kb < 1024:
-            return f"{kb:.2f} KB"
-        else:
-            mb = kb / 1024
-            return f"{mb:.2f} MB"
-
-    def __parse_query_args(self, args: list[str]) -> list[tuple]:
-        pattern = re.compile(r"^\s*([a-zA-Z_][a-zA-Z0-9_]+)\s*(=|!=|>=|<=|>|<|\*)\s*(.+?)\s*$")
-
-        parsed_args = []
-
-        for arg in args:
-            if not isinstance(arg, str):
-                raise TypeError(f"Arguments must be a string, got: {type(arg).__name__}")
-            
-            match = pattern.match(arg)
-            if not match:
-                raise ValueError(f"Invalid format: {arg!r}. Expected format: (KEY)(OPERATOR)(VALUE). Ex: 'collection_name=lakehouse'")
-            
-            key, op, value = match.groups()
-            parsed_args.append((key, op, value))
-        
-        return parsed_args
-    
-    def __df_to_tablestring(self, df: pd.DataFrame) -> str:
-       
-        col_widths = [max(df[col].astype(str).str.len().max(), len(col)) for col in df.columns]
-        header = '| ' + ' | '.join(f'{col:^{width}}' for col, width in zip(df.columns, col_widths)) + ' |'
-        separator = '|-' + '-|-'.join('-' * width for width in col_widths) + '-|'
-        rows = []
-        for _, row in df.iterrows():
-            row_str = '| ' + ' | '.join(f'{str(val):^{width}}' for val, width in zip(row, col_widths)) + ' |'
-            rows.append(row_str)
-
-        table_string = '\n'.join([header, separator] + rows)
-        return table_string
-
-    def __format_output(self, data: list[dict], output_format: Literal["df", "json", "table", "dict"]):
-        if output_format == "json":
-            return json.dumps(obj=data, indent=2)
-        elif output_format == "df":
-            df = pd.DataFrame(data)
-            cols = list(df.columns)
-
-            if "id" in cols:
-                cols.remove("id")
-                df = df[["id"] + cols]
-
-            return df
-        elif output_format == "table":
-            df = pd.DataFrame(data)
-            cols = list(df.columns)
-            if "id" in cols:
-                cols.remove("id")
-                df = df[["id"] + cols]
-        
-            return self.__df_to_tablestring(df=df)
-        return data
-    
     def __get_filename(self, path: str, keep_extension=True):
         filename = os.path.basename(path)
         if not keep_extension:
@@ -103,7 +117,7 @@ class LakehouseClient:
         Args:
             method (str): HTTP method ("GET", "POST", "PUT", "DELETE", etc.).
             endpoint (str): API endpoint (e.g., "/catalog/collections/all").
-            **kwargs: Additional arguments for `requests.request()` (e.g., `json`, `params`).
+            **kwargs: Additional arguments for `HTTPTransport.request()` (e.g., `json`, `params`, `retry`).
         
         Returns:
             dict: Parsed JSON response.
@@ -112,37 +126,33 @@ class LakehouseClient:
             Exception: If the request fails, includes API error details.
         """
 
+        if self.__metadata_cache and self.__metadata_cache.ttl_for(endpoint) is not None:
+            key = (method.upper(), endpoint, json.dumps(kwargs.get("params"), sort_keys=True), json.dumps(kwargs.get("json"), sort_keys=True))
+
+            return self.__metadata_cache.get_or_fetch(key, endpoint, lambda: self.__send_request(endpoint, method, **kwargs))
+
+        return self.__send_request(endpoint, method, **kwargs)
+
+    def __send_request(self, endpoint, method = "POST", **kwargs):
         url = f"{self.__lakehouse_url}{endpoint}"
 
-        if(method.lower() == "get"):
-            headers = {
-                "Authorization": f"Bearer {self.__access_token}"
-            }
-        else:
-            headers = {
-                "Authorization": f"Bearer {self.__access_token}",
-                "Content-Type": "application/json",
-            }
+        headers = request_headers(self.__access_token, method)
 
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                **kwargs
-            )
-            
-            response.raise_for_status()
-            
-            return response.json()
+            with self.instrumentation.phase(request_phase(endpoint)):
+                response = self.__transport.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    **kwargs
+                )
+
+                response.raise_for_status()
+
+                return response.json()
         
         except requests.exceptions.HTTPError as _:
-            try:
-                error_detail = response.json().get("detail", response.text)
-            except ValueError:
-                error_detail = response.text or "No error details provided"
-            
-            raise Exception(f"API request failed ({response.status_code}): {error_detail}")
+            raise Exception(f"API request failed ({response.status_code}): {error_detail(response)}")
         
         except requests.exceptions.RequestException as req_err:
             raise Exception(f"Request failed: {str(req_err)}")
@@ -150,7 +160,192 @@ class LakehouseClient:
         except ValueError as json_err:
             raise Exception(f"Failed to parse API response: {str(json_err)}")
     
+    def __get_file_record(self, catalog_file_id: str) -> dict:
+        return self.__make_request(method="GET", endpoint=f"/catalog/file/id/{catalog_file_id}")
+
+    def __fetch_file_records(self, catalog_file_ids: list[str], max_workers: int = RECORDS_MAX_WORKERS) -> dict[str, BatchItemResult]:
+        # every id is requested once, however many times it is listed
+        unique_ids = list(dict.fromkeys(catalog_file_ids))
+
+        results = self.__run_batch(keys=unique_ids, work=self.__get_file_record, max_workers=max_workers, detach=False)
+
+        return {result.key: result for result in results}
+
+    def __record_of(self, record_result: BatchItemResult) -> dict:
+        if not record_result.ok:
+            raise Exception(record_result.error)
+
+        return record_result.value
+
+    def __request_download_url(self, catalog_file_id: str) -> str:
+        payload = {
+            "catalog_file_id": catalog_file_id
+        }
+
+        # issuing a signed url has no side effects, so it is safe to retry
+        response = self.__make_request(method="POST", endpoint="/storage/files/download-request", json=payload, retry=True)
+
+        return response["download_url"]
+
+    def __download_to_path(
+        self,
+        signed_url: str,
+        output_file_path: str,
+        catalog_item: dict,
+        parallel: bool = False,
+        part_size: int = None,
+        max_workers: int = None
+    ) -> None:
+        codec = transfer_codec(catalog_item)
+
+        with self.instrumentation.phase("transfer", total=stored_size(catalog_item)):
+            # compressed objects are decompressed as a single stream
+            if parallel and not codec:
+                download_ranges(
+                    transport=self.__transport,
+                    url=signed_url,
+                    output_file_path=output_file_path,
+                    part_size=part_size or self.__tuner.part_size(stored_size(catalog_item)),
+                    max_workers=max_workers,
+                    tuner=self.__tuner,
+                    limiter=self.__limiter
+                )
+                return
+
+            started = time.perf_counter()
+
+            with self.__transport.request("GET", signed_url, stream=True) as response:
+                if response.status_code != 200:
+                    raise Exception(f"Failed to download file. Status Code: {response.status_code}, Error: {response.text}")
+
+                with open(output_file_path, "wb") as file:
+                    written = write_response(response, file, chunk_size=self.__tuner.chunk_size(), codec=codec, limiter=self.__limiter)
+
+            self.__tuner.observe(stored_size(catalog_item) or written, time.perf_counter() - started, latency=response.elapsed.total_seconds())
+
+    def __verify_file(self, output_file_path: str, catalog_item: dict) -> None:
+        with self.instrumentation.phase("checksum"):
+            verify_file(output_file_path, catalog_item)
+
+    def __download_and_verify(self, signed_url: str, output_file_path: str, catalog_item: dict, verify: bool = True, **download_options) -> None:
+        self.__download_to_path(signed_url, output_file_path, catalog_item, **download_options)
+
+        if verify:
+            self.__verify_file(output_file_path, catalog_item)
+
+    def __open_cached(self, catalog_file_id: str, catalog_item: dict, verify: bool = True, **download_options):
+        key = ObjectCache.key_for({**catalog_item, "id": catalog_file_id})
+
+        file = self.__cache.open(key)
+
+        if file is None:
+            signed_url = self.__request_download_url(catalog_file_id)
+            return self.__cache.store(key, lambda path: self.__download_and_verify(signed_url, path, catalog_item, verify, **download_options))
+
+        # hits are checked like downloads, a cached file that was altered on disk is dropped
+        if verify:
+            try:
+                with self.instrumentation.phase("checksum"):
+                    verify_stream(file, catalog_item)
+            except Exception:
+                file.close()
+                self.__cache.discard(key)
+                raise
+
+        return file
+
+    def __run_batch(
+        self,
+        keys: list[str],
+        work: Callable,
+        max_workers: int,
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None,
+        detach: bool = True
+    ) -> list[BatchItemResult]:
+        results = [None] * len(keys)
+
+        def run(key: str):
+            # files of a batch are reported as operations of their own, other work as part of the batch
+            if detach:
+                detach_operation()
+            return work(key)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(contextvars.copy_context().run, run, key): index for index, key in enumerate(keys)}
+
+            for completed, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+
+                try:
+                    result = BatchItemResult(key=keys[index], value=future.result())
+                except Exception as error:
+                    result = BatchItemResult(key=keys[index], error=str(error))
+
+                results[index] = result
+
+                if progress_callback:
+                    progress_callback(completed, len(keys), result)
+
+        return results
+
+    def __iter_pages(self, endpoint: str, page_size: int = PAGE_SIZE, method: str = "GET", **kwargs) -> Iterator[list[dict]]:
+        params = first_page(page_size)
+
+        while params is not None:
+            response = self.__make_request(method=method, endpoint=endpoint, params=params, **kwargs)
+
+            records, params = next_page(response, params, page_size)
+
+            if records:
+                yield records
+
+    def __search_all(self, endpoint: str, parsed_args: list[tuple], page_size: int = PAGE_SIZE) -> list[dict] | None:
+        """Returns every record matching a search, fetched page by page without the metadata cache, or None if the server does not page searches and the records may be cut short"""
+        records = []
+        params = first_page(page_size)
+
+        while params is not None:
+            response = self.__send_request(method="POST", endpoint=endpoint, json={**search_payload(parsed_args), **params})
+
+            if is_cut_short(response, page_size):
+                return None
+
+            page, params = next_page(response, params, page_size)
+            records.extend(page)
+
+        return records
+
+    def __iter_file_pages(
+        self,
+        include_raw: bool,
+        include_processed: bool,
+        include_curated: bool,
+        page_size: int = PAGE_SIZE,
+        sort_by_key: str = None,
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> Iterator[list[dict]]:
+        levels = included_levels(include_raw, include_processed, include_curated)
+
+        listing = FileListing(levels, page_size, sort_by_key, sort_desc, limit)
+
+        while (request := listing.next_request()) is not None:
+            records = listing.receive(self.__make_request(**request))
+
+            if records:
+                yield records
+
+    def __search_mirror(self, catalog_type: str, parsed_args: list[tuple]) -> list[dict]:
+        if not self.__mirror:
+            raise Exception("The client has no catalog mirror, create it with LakehouseClient(..., mirror=CatalogMirror())")
+
+        if self.__mirror.watermark(catalog_type) is None:
+            self.sync_catalog_mirror(catalog_types=[catalog_type])
+
+        return self.__mirror.search(catalog_type, parsed_args)
+
     # Authentication function
+    @traced("auth")
     def auth(self, email: str, password: str) -> str:
         """Authenticates the user based on the logn details. It returns the authentication token"""
 
@@ -161,6 +356,9 @@ class LakehouseClient:
         if response:
             self.__access_token = response["access_token"]
 
+            # records visible to the previous session may differ
+            self.invalidate_metadata_cache()
+
             msg = "Session Authenticated!"
 
         else:
@@ -170,6 +368,7 @@ class LakehouseClient:
      
 
     # Creating functions
+    @traced("create_collection")
     def create_collection(
         self,
         storage_type: Storage,
@@ -190,147 +389,377 @@ class LakehouseClient:
         - secret [Optional]: optional boolean value indicating whether the collection will be secret\n
         """
 
-        payload = {
-            "storage_type": storage_type,
-            "collection_name": collection_name,
-            "public": public,
-            "secret": secret
-        }
-
-        if collection_description:
-            payload["collection_description"] = collection_description
-
-        if storage_type == 'hdfs':
-            payload["namenode_address"] = bucket_name
-        elif bucket_name: 
-            payload["bucket_name"] = bucket_name
+        payload = collection_payload(storage_type, collection_name, bucket_name, collection_description, public, secret)
 
         response = self.__make_request(method="POST", endpoint="/storage/collections/create", json=payload)
 
+        self.invalidate_metadata_cache("/catalog/collections")
+
         return response
     
 
+    # Mirror functions
+    @traced("sync_catalog_mirror")
+    def sync_catalog_mirror(
+        self,
+        catalog_types: list[Literal["files", "collections"]] = ("files", "collections"),
+        full: bool = False
+    ) -> dict[str, int]:
+        """Description: Refreshes the client catalog mirror. It returns the number of records fetched for each catalog.\n
+        Only the records inserted since the newest mirrored record are fetched, page by page, using 'inserted_at' as a watermark. The first sync, and a full sync, fetch the whole listing and replace the mirrored records, like the syncs with a server that does not page searches.\n
+        Parameters:\n
+        - catalog_types [Optional, default both]: the catalogs to refresh, "files" and/or "collections"\n
+        - full [Optional, default False]: fetches the whole listing, which also drops deleted records and refreshes changed ones\n
+        """
+
+        if not self.__mirror:
+            raise Exception("The client has no catalog mirror, create it with LakehouseClient(..., mirror=CatalogMirror())")
+
+        counts = {}
+
+        for catalog_type in catalog_types:
+            watermark = None if full else self.__mirror.watermark(catalog_type)
+            records = None
+
+            if watermark is not None:
+                # records inserted in the same second as the watermark may be missing, they are fetched again and replaced
+                records = self.__search_all(f"/catalog/{catalog_type}/search", [("inserted_at", ">=", watermark)])
+
+            if records is None:
+                # the listing must not come from the metadata cache
+                self.invalidate_metadata_cache(f"/catalog/{catalog_type}/all/")
+
+                records = [item for page in self.__iter_pages(f"/catalog/{catalog_type}/all/") for item in page]
+
+                counts[catalog_type] = self.__mirror.replace(catalog_type, records)
+            else:
+                counts[catalog_type] = self.__mirror.upsert(catalog_type, records)
+
+        return counts
+
+
     # Downloading functions
+    @traced("download_file", "catalog_file_id")
     def download_file( 
         self,
         catalog_file_id: str,
-        output_file_dir: str = None
+        output_file_dir: str = None,
+        parallel: bool = False,
+        part_size: int = None,
+        max_workers: int = None,
+        verify: bool = True
     ) -> str:
+        """Description: Downloads a file from the catalog into a local directory. It returns the local file path.\n
+        Parameters:\n
+        - catalog_file_id: the file id in the catalog\n
+        - output_file_dir [Optional]: the local directory where the file will be placed, by default the current working directory\n
+        - parallel [Optional, default False]: fetches byte ranges of the file concurrently, falls back to a single stream if the storage does not support ranges\n
+        - part_size [Optional]: the size in bytes of each range of a parallel download, by default it is chosen by the client tuner from the throughput observed\n
+        - max_workers [Optional]: the number of ranges downloaded concurrently, by default it is adjusted by the client tuner while the file is downloaded\n
+        - verify [Optional, default True]: checks the downloaded file against the checksum recorded in the catalog, a file that does not match is removed and an exception is raised. Files served from the client cache are checked too, and a cached file that does not match is dropped from the cache. Files uploaded without a checksum are not checked\n
+        """
         
-        print("Downloading data...")
+        catalog_item = self.__get_file_record(catalog_file_id)
 
-        catalog_item = self.__make_request(method="GET", endpoint=f"/catalog/file/id/{catalog_file_id}")      
+        return self.__download_file(catalog_file_id, catalog_item, output_file_dir, parallel, part_size, max_workers, verify)
 
-        payload = {
-            "catalog_file_id": catalog_file_id
-        }
-
-        response = self.__make_request(method="POST", endpoint="/storage/files/download-request", json=payload)
-        
-        signed_url = response["download_url"]
+    @traced("download_file", "catalog_file_id")
+    def __download_file(
+        self,
+        catalog_file_id: str,
+        catalog_item: dict,
+        output_file_dir: str = None,
+        parallel: bool = False,
+        part_size: int = None,
+        max_workers: int = None,
+        verify: bool = True,
+        output_file_name: str = None
+    ) -> str:
+        logger.info("Downloading %s (%s)", catalog_item['file_name'], catalog_file_id)
 
         if not output_file_dir:
             output_file_dir = os.getcwd()
 
-        output_file_path = os.path.join(output_file_dir, catalog_item['file_name'])
-        
-        response = requests.get(signed_url, stream=True)
+        output_file_path = os.path.join(output_file_dir, output_file_name or catalog_item['file_name'])
 
-        if response.status_code == 200:
-            with open(output_file_path, "wb") as file:
-                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):  # 1  MB
-                    if chunk:
-                        file.write(chunk)
-        else:
-            print(f"Failed to download file. Status Code: {response.status_code}, Error: {response.text}")
+        # the file only appears at its path once it is complete and verified
+        with atomic_output(output_file_path) as temp_path:
+            if self.__cache:
+                cached_file = self.__open_cached(catalog_file_id, catalog_item, verify=verify, parallel=parallel, part_size=part_size, max_workers=max_workers)
+
+                with cached_file, open(temp_path, "wb") as file:
+                    shutil.copyfileobj(cached_file, file, CHUNK_SIZE)
+            else:
+                signed_url = self.__request_download_url(catalog_file_id)
+                self.__download_and_verify(signed_url, temp_path, catalog_item, verify, parallel=parallel, part_size=part_size, max_workers=max_workers)
 
-        print(f"Data downloaded to {output_file_path}")
+        logger.info("Data downloaded to %s", output_file_path)
 
         return output_file_path
 
 
+    @traced("download_files")
+    def download_files(
+        self,
+        catalog_file_ids: list[str],
+        output_file_dir: str = None,
+        max_workers: int = BATCH_MAX_WORKERS,
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None
+    ) -> list[BatchItemResult]:
+        """Description: Downloads many files from the catalog concurrently. It returns one result per id, in the input order, holding the local file path or the error raised for that file.\n
+        Parameters:\n
+        - catalog_file_ids: the file ids in the catalog\n
+        - output_file_dir [Optional]: the local directory where the files will be placed, by default the current working directory. Files sharing a name, like versions of one file, are saved as `<name>_<catalog_file_id><extension>`\n
+        - max_workers [Optional, default 8]: the maximum number of files downloaded concurrently\n
+        - progress_callback [Optional]: a function called as each file completes with the number of completed files, the total number of files and the file result\n
+        """
+
+        records = self.__fetch_file_records(catalog_file_ids)
+
+        file_names = output_file_names({key: result.value for key, result in records.items() if result.ok})
+
+        return self.__run_batch(
+            keys=list(catalog_file_ids),
+            work=lambda catalog_file_id: self.__download_file(
+                catalog_file_id=catalog_file_id,
+                catalog_item=self.__record_of(records[catalog_file_id]),
+                output_file_dir=output_file_dir,
+                output_file_name=file_names.get(catalog_file_id)
+            ),
+            max_workers=max_workers,
+            progress_callback=progress_callback
+        )
+
+
     # Get functions
-    def get_dataframe(self, catalog_file_id: str) -> pd.DataFrame | dict:
+    @traced("get_file_records")
+    def get_file_records(
+        self,
+        catalog_file_ids: list[str],
+        output_format: Literal["dict", "df"] = "dict",
+        max_workers: int = RECORDS_MAX_WORKERS
+    ) -> "dict[str, dict] | pd.DataFrame":
+        """Description: Get the catalog records of many files, fetching them concurrently. Repeated ids are fetched once.\n
+        It returns a dictionary mapping each id to its record, or a dataframe with one row per id indexed by the id. If any record can not be fetched, an exception naming the failed ids is raised.\n
+        Parameters:\n
+        - catalog_file_ids: the file ids in the catalog\n
+        - output_format [Optional, default dict]: "dict" or "df"\n
+        - max_workers [Optional, default 16]: the maximum number of records fetched concurrently\n
+        """
+
+        if output_format not in ["dict", "df"]:
+            raise Exception("Must specify output format")
+
+        results = self.__fetch_file_records(catalog_file_ids, max_workers=max_workers)
+
+        return format_file_records(results, output_format)
+
+    @traced("get_dataframe", "catalog_file_id")
+    def get_dataframe(
+        self,
+        catalog_file_id: str,
+        spill_threshold: int = SPILL_THRESHOLD,
+        columns: list[str] = None,
+        filters: list = None
+    ) -> "pd.DataFrame | dict":
         """Description: Get a file as a dataframe. \n
         Condition: the file must be CSV, XLSX, TSV, JSON, MD, HTML, TEX or PARQUET. If the file record's 'file_category' property is marked as 'structured' in the catalogue, the file is can be converted into a dataframe. \n
+        The file is parsed from memory and nothing is written to the working directory. If the client has a cache, the file is parsed from the cache instead.\n
+        When columns or filters are set on a parquet file that is not cached, only its footer and the selected column chunks are transferred, see `open_remote()`.\n
         Parameters:\n
         - catalog_file_id: is the id for the dataframe record in the catalog
+        - spill_threshold [Optional, default 64 MB]: the number of bytes kept in memory, larger files are spilled to a temporary file in the system temp directory
+        - columns [Optional]: the columns to load. Parquet, feather, CSV and TSV files only decode these columns
+        - filters [Optional]: the rows to keep, as a list of (column, operator, value) tuples that must all match, or a list of such lists of which one must match. Parquet files skip the row groups that cannot match and CSV and TSV files are filtered chunk by chunk
         """
 
-        downloaded_file_path = self.download_file(
-            catalog_file_id=catalog_file_id,
-            output_file_dir=self.__file_load_path
-        )
+        catalog_item = self.__get_file_record(catalog_file_id)
 
-        df = None
-
-        if downloaded_file_path.endswith(".csv"):
-            df = pd.read_csv(downloaded_file_path)
-        elif downloaded_file_path.endswith(".xlsx") or downloaded_file_path.endswith(".xls"):
-            df = pd.read_excel(downloaded_file_path)
-        elif downloaded_file_path.endswith(".tsv"):
-            df = pd.read_csv(downloaded_file_path, sep="\t")
-        elif downloaded_file_path.endswith(".json"):
-            df = pd.read_json(downloaded_file_path)
-        elif downloaded_file_path.endswith(".md"):
-            df = pd.read_csv(downloaded_file_path, delimiter="|", skipinitialspace=True)
-        elif downloaded_file_path.endswith(".html"):
-            df_list = pd.read_html(downloaded_file_path)  # Returns a list of tables
-            df = df_list[0] if df_list else None
-        elif downloaded_file_path.endswith(".parquet"):
-            df = pd.read_parquet(downloaded_file_path)
-        else:
-            with open(downloaded_file_path, "r", encoding="UTF-8") as f:
-                file_content = f.read()
+        return self.__get_dataframe(catalog_file_id, catalog_item, spill_threshold, columns, filters)
 
-            pattern = r"[^\\/]+$"
+    @traced("get_dataframe", "catalog_file_id")
+    def __get_dataframe(
+        self,
+        catalog_file_id: str,
+        catalog_item: dict,
+        spill_threshold: int = SPILL_THRESHOLD,
+        columns: list[str] = None,
+        filters: list = None
+    ) -> "pd.DataFrame | dict":
+        if self.__cache:
+            with self.__open_cached(catalog_file_id, catalog_item) as file, self.instrumentation.phase("parse"):
+                return read_dataframe(file, catalog_item["file_name"], columns=columns, filters=filters)
 
-            match = re.search(pattern, downloaded_file_path)
+        signed_url = self.__request_download_url(catalog_file_id)
 
-            filename = match.group() if match else None
+        codec = transfer_codec(catalog_item)
 
-            parsed_file = dict(
-                dataset_name=filename,
-                content=file_content
-            )
+        if (columns is not None or filters) and catalog_item["file_name"].lower().endswith(".parquet") and not codec:
+            # the selected parts of the file are fetched while it is parsed
+            with self.instrumentation.phase("stream"), RemoteFile(self.__transport, signed_url, spill_threshold=spill_threshold, bandwidth_limiter=self.__limiter) as remote_file:
+                return read_dataframe(remote_file, catalog_item["file_name"], columns=columns, filters=filters)
+
+        with self.instrumentation.phase("transfer", total=stored_size(catalog_item)):
+            with self.__transport.request("GET", signed_url, stream=True) as response:
+                if response.status_code != 200:
+                    raise Exception(f"Failed to download file. Status Code: {response.status_code}, Error: {response.text}")
+
+                buffer = spool_response(response, max_size=spill_threshold, chunk_size=self.__tuner.chunk_size(), codec=codec, limiter=self.__limiter)
+
+        with buffer, self.instrumentation.phase("parse"):
+            df = read_dataframe(buffer, catalog_item["file_name"], columns=columns, filters=filters)
 
-            df = parsed_file
-        
-        if os.path.exists(downloaded_file_path):
-            os.remove(downloaded_file_path)
-    
         return df
+
+    def get_dataframe_chunks(
+        self,
+        catalog_file_id: str,
+        chunksize: int = DATAFRAME_CHUNK_ROWS,
+        columns: list[str] = None,
+        as_arrow: bool = False,
+        prefetch_chunks: int = PREFETCH_CHUNKS,
+        spill_threshold: int = SPILL_THRESHOLD
+    ) -> Iterator["pd.DataFrame"]:
+        """Description: Get a file as a sequence of dataframes of up to `chunksize` rows, so files larger than the memory can be processed.\n
+        CSV, TSV and NDJSON files are parsed while they are downloaded, a background thread reads up to `prefetch_chunks` network chunks ahead of the parser.
+        Parquet files are read one batch at a time with range requests, see `open_remote()`. Other structured files are downloaded whole and then split.\n
+        Parameters:\n
+        - catalog_file_id: the file id in the catalog\n
+        - chunksize [Optional, default 100000]: the maximum number of rows of each dataframe\n
+        - columns [Optional]: the columns to load\n
+        - as_arrow [Optional, default False]: yields pyarrow record batches instead of pandas dataframes\n
+        - prefetch_chunks [Optional, default 8]: the maximum number of 1 MB network chunks read ahead of the parser\n
+        - spill_threshold [Optional, default 64 MB]: the number of bytes kept in memory when a file has to be downloaded whole, see `get_dataframe()`\n
+        """
+
+        with self.instrumentation.operation("get_dataframe_chunks", catalog_file_id, emit=False):
+            catalog_item = self.__get_file_record(catalog_file_id)
+
+        file_name = catalog_item["file_name"]
+
+        if self.__cache:
+            with self.__open_cached(catalog_file_id, catalog_item) as file:
+                yield from iter_dataframe(file, file_name, chunksize=chunksize, columns=columns, as_arrow=as_arrow)
+            return
+
+        with self.instrumentation.operation("get_dataframe_chunks", catalog_file_id, emit=False):
+            signed_url = self.__request_download_url(catalog_file_id)
+
+        codec = transfer_codec(catalog_item)
+
+        # the transfer is interleaved with the parsing, so the phase also counts the time the caller spends between chunks
+        with self.instrumentation.phase("stream", total=stored_size(catalog_item), operation="get_dataframe_chunks", key=catalog_file_id):
+            if file_name.lower().endswith(".parquet") and not codec:
+                with RemoteFile(self.__transport, signed_url, spill_threshold=spill_threshold, bandwidth_limiter=self.__limiter) as remote_file:
+                    yield from iter_dataframe(remote_file, file_name, chunksize=chunksize, columns=columns, as_arrow=as_arrow)
+                return
+
+            with self.__transport.request("GET", signed_url, stream=True) as response:
+                if response.status_code != 200:
+                    raise Exception(f"Failed to download file. Status Code: {response.status_code}, Error: {response.text}")
+
+                if file_name.lower().endswith(STREAMING_EXTENSIONS):
+                    chunks = prefetch(response_chunks(response, chunk_size=CHUNK_SIZE, codec=codec, limiter=self.__limiter), depth=prefetch_chunks)
+                    buffer = io.BufferedReader(ChunkReader(chunks), buffer_size=CHUNK_SIZE)
+                else:
+                    buffer = spool_response(response, max_size=spill_threshold, chunk_size=self.__tuner.chunk_size(), codec=codec, limiter=self.__limiter)
+
+                # closing the buffer stops the background reader before the response is closed
+                with buffer:
+                    yield from iter_dataframe(buffer, file_name, chunksize=chunksize, columns=columns, as_arrow=as_arrow)
+
+    @traced("open_remote", "catalog_file_id")
+    def open_remote(
+        self,
+        catalog_file_id: str,
+        block_size: int = REMOTE_BLOCK_SIZE,
+        cache_blocks: int = REMOTE_CACHE_BLOCKS
+    ) -> RemoteFile:
+        """Description: Opens a file of the catalog as a seekable read-only file object without downloading it. Reads are served with HTTP range requests, so readers like pyarrow only transfer the parts of the file they read.\n
+        Parameters:\n
+        - catalog_file_id: the file id in the catalog\n
+        - block_size [Optional, default 1 MB]: the size in bytes of the blocks fetched and kept in memory\n
+        - cache_blocks [Optional, default 64]: the maximum number of blocks kept in memory\n
+        """
+
+        catalog_item = self.__get_file_record(catalog_file_id)
+
+        if transfer_codec(catalog_item):
+            raise Exception(f"The file {catalog_item['file_name']} is stored compressed and can not be read with range requests, use get_dataframe_chunks() or download_file()")
+
+        signed_url = self.__request_download_url(catalog_file_id)
+
+        return RemoteFile(self.__transport, signed_url, block_size=block_size, cache_blocks=cache_blocks, bandwidth_limiter=self.__limiter)
+
+    @traced("get_dataframes")
+    def get_dataframes(
+        self,
+        catalog_file_ids: list[str],
+        max_workers: int = BATCH_MAX_WORKERS,
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None,
+        spill_threshold: int = SPILL_THRESHOLD,
+        columns: list[str] = None,
+        filters: list = None
+    ) -> list[BatchItemResult]:
+        """Description: Get many files as dataframes, loading them concurrently. It returns one result per id, in the input order, holding the dataframe or the error raised for that file.\n
+        Parameters:\n
+        - catalog_file_ids: the file ids in the catalog\n
+        - max_workers [Optional, default 8]: the maximum number of files loaded concurrently\n
+        - progress_callback [Optional]: a function called as each file completes with the number of completed files, the total number of files and the file result\n
+        - spill_threshold [Optional, default 64 MB]: the number of bytes of each file kept in memory, see `get_dataframe()`\n
+        - columns [Optional]: the columns to load from each file, see `get_dataframe()`\n
+        - filters [Optional]: the rows to keep from each file, see `get_dataframe()`\n
+        """
+
+        records = self.__fetch_file_records(catalog_file_ids)
+
+        return self.__run_batch(
+            keys=list(catalog_file_ids),
+            work=lambda catalog_file_id: self.__get_dataframe(
+                catalog_file_id=catalog_file_id,
+                catalog_item=self.__record_of(records[catalog_file_id]),
+                spill_threshold=spill_threshold,
+                columns=columns,
+                filters=filters
+            ),
+            max_workers=max_workers,
+            progress_callback=progress_callback
+        )
     
     
     # listing dictionaries functions
+    @traced("list_collections")
     def list_collections(
         self,
         sort_by_key: str = None, 
         sort_desc: bool = False
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
     # ) -> str:
         """Description: Lists all available collections and returns a string in a table format\n"""
         df = self.list_collections_df(sort_by_key, sort_desc)
         # return self.__df_to_tablestring(df=df)
         return df
     
+    @traced("list_files")
     def list_files(
         self,
         include_raw: bool = True, 
         include_processed: bool = True, 
         include_curated: bool = True, 
         sort_by_key: str = None, 
-        sort_desc: bool = False
-    ) -> pd.DataFrame:
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> "pd.DataFrame":
     # ) -> str:
         """Description: Lists all available files and returns a string in a table format with the records\n"""
-        df  = self.list_files_df(include_raw, include_processed, include_curated, sort_by_key, sort_desc)
+        df  = self.list_files_df(include_raw, include_processed, include_curated, sort_by_key, sort_desc, limit)
         return df
         # return self.__df_to_tablestring(df=df)
       
+    @traced("list_buckets")
     def list_buckets(
         self
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
     # ) -> str:
         """Lists all the available storage buckets in the system and returns a string formated as a table with the records"""
         df = self.list_buckets_df()
@@ -338,7 +767,35 @@ class LakehouseClient:
         return df
 
 
+    # listing iterator functions
+    def list_collections_iter(self, page_size: int = PAGE_SIZE) -> Iterator[dict]:
+        """Description: Iterates over all available collections, fetching the catalog page by page. It yields one dictionary per record\n
+        Parameters:\n
+        - page_size [Optional, default 1000]: the number of records requested per page. Servers without pagination return every record in one page
+        """
+
+        for page in self.__iter_pages("/catalog/collections/all/", page_size=page_size):
+            yield from page
+
+    def list_files_iter(
+        self,
+        include_raw: bool = True, 
+        include_processed: bool = True, 
+        include_curated: bool = True, 
+        page_size: int = PAGE_SIZE
+    ) -> Iterator[dict]:
+        """Description: Iterates over all available files, fetching the catalog page by page. It yields one dictionary per record\n
+        Parameters:\n
+        - include_raw, include_processed, include_curated [Optional, default True]: whether files of each processing level are included
+        - page_size [Optional, default 1000]: the number of records requested per page. Servers without pagination return every record in one page
+        """
+
+        for page in self.__iter_file_pages(include_raw, include_processed, include_curated, page_size):
+            yield from page
+
+
     # listing dictionaries functions
+    @traced("list_collections_dict")
     def list_collections_dict(
         self,
         sort_by_key: str = None, 
@@ -346,47 +803,32 @@ class LakehouseClient:
     ) -> list[dict]:
         """Description: Lists all available collections and returns a list of dictionary with the records\n"""
 
-        response = self.__make_request(method="GET", endpoint="/catalog/collections/all/")
-
-        records = response.get("records", [])
+        records = list(self.list_collections_iter())
 
         if sort_by_key:
-            records = sorted(iterable=records, key=lambda item: item[sort_by_key], reverse=sort_desc)
+            records = sorted(records, key=lambda item: item[sort_by_key], reverse=sort_desc)
 
         return records
     
+    @traced("list_files_dict")
     def list_files_dict(
         self,
         include_raw: bool = True, 
         include_processed: bool = True, 
         include_curated: bool = True, 
         sort_by_key: str = None, 
-        sort_desc: bool = False
+        sort_desc: bool = False,
+        limit: int = None
     ) -> list[dict]:
-        """Description: Lists all available files and returns a list of dictionaries with the records\n"""
-
-        response = self.__make_request(method="GET", endpoint="/catalog/files/all/")
-
-        records = response.get("records", [])
-
-        if sort_by_key:
-            records = sorted(iterable=records, key=lambda item: item[sort_by_key], reverse=sort_desc)
+        """Description: Lists all available files and returns a list of dictionaries with the records. Filters, sorting and limit are evaluated by the server when possible\n"""
 
-        filter_options = []
+        pages = self.__iter_file_pages(include_raw, include_processed, include_curated, PAGE_SIZE, sort_by_key, sort_desc, limit)
 
-        if include_raw:
-            filter_options.append("raw")
-        if include_processed:
-            filter_options.append("processed")
-        if include_curated:
-            filter_options.append("curated")
+        records = [item for page in pages for item in page]
 
-        filtered_response = [
-            item for item in records if item["processing_level"] in filter_options
-        ]
-
-        return filtered_response
+        return order_records(records, sort_by_key, sort_desc, limit)
 
+    @traced("list_buckets_dict")
     def list_buckets_dict(self) -> list[dict]:
         """Lists all the available storage buckets in the system and returns a list of dictionaries with the records"""
 
@@ -402,6 +844,7 @@ class LakehouseClient:
 
 
     # listing json functions
+    @traced("list_collections_json")
     def list_collections_json(
         self,
         sort_by_key: str = None, 
@@ -416,6 +859,7 @@ class LakehouseClient:
 
         return records
     
+    @traced("list_files_json")
     def list_files_json(
         self,
         include_raw: bool = True, 
@@ -423,16 +867,18 @@ class LakehouseClient:
         include_curated: bool = True, 
         sort_by_key: str = None, 
         sort_desc: bool = False,
-        indented: bool = True
+        indented: bool = True,
+        limit: int = None
     ) -> str:
         """Description: Lists all available files and returns a formatted json string with the records\n"""
 
-        records = self.list_files_dict(include_raw, include_processed, include_curated, sort_by_key, sort_desc)
+        records = self.list_files_dict(include_raw, include_processed, include_curated, sort_by_key, sort_desc, limit)
 
         records = json.dumps(obj=records,indent=2) if indented else json.dumps(obj=records)
 
         return records
     
+    @traced("list_buckets_json")
     def list_buckets_json(self, indented: bool = True) -> str:
         """Lists all the available storage buckets in the system and returns a json string with the records"""
 
@@ -444,56 +890,40 @@ class LakehouseClient:
 
 
     # listing df functions
+    @traced("list_collections_df")
     def list_collections_df(
         self,
         sort_by_key: str = None, 
         sort_desc: bool = False
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """Description: Lists all available collections and returns a dataframe with the records\n"""
 
-        records  = self.list_collections_dict(sort_by_key, sort_desc)
-
-        df = pd.DataFrame(records)
-
-        columns_order = ["id", "collection_name", "inserted_by", "inserted_at", "public"]
-
-        filtered_df = df[columns_order].copy()
-
-        filtered_df["inserted_at"] = pd.to_datetime(filtered_df["inserted_at"], unit='s').dt.strftime('%Y-%m-%d')
+        pages = self.__iter_pages("/catalog/collections/all/")
 
-        filtered_df["inserted_by"] = filtered_df["inserted_by"].str.split(":").str[1]
-
-        return filtered_df
+        return pages_to_df(pages, COLLECTION_COLUMNS, sort_by_key, sort_desc)
     
+    @traced("list_files_df")
     def list_files_df(
         self,
         include_raw: bool = True, 
         include_processed: bool = True, 
         include_curated: bool = True, 
         sort_by_key: str = None, 
-        sort_desc: bool = False
-    ) -> pd.DataFrame:
-        """Description: Lists all available files and returns a dataframe with the records\n"""
-
-        records  = self.list_files_dict(include_raw, include_processed, include_curated, sort_by_key, sort_desc)
-
-        df = pd.DataFrame(records)
-
-        columns_order = ["id", "file_name", "file_category", "file_size", "processing_level", "public", "inserted_by", "inserted_at", "collection_id", "collection_name", "file_location"]
-
-        filtered_df = df[columns_order].copy()
-
-        filtered_df["inserted_at"] = pd.to_datetime(filtered_df["inserted_at"], unit='s').dt.strftime('%Y-%m-%d')
-
-        filtered_df["inserted_by"] = filtered_df["inserted_by"].str.split(":").str[1]
+        sort_desc: bool = False,
+        limit: int = None
+    ) -> "pd.DataFrame":
+        """Description: Lists all available files and returns a dataframe with the records. Filters, sorting and limit are evaluated by the server when possible\n"""
 
-        filtered_df["file_size"] = filtered_df["file_size"].apply(lambda size: self.__format_size(int(size)))
+        pages = self.__iter_file_pages(include_raw, include_processed, include_curated, PAGE_SIZE, sort_by_key, sort_desc, limit)
 
-        return filtered_df
+        return pages_to_df(pages, FILE_COLUMNS, sort_by_key, sort_desc, limit)
       
-    def list_buckets_df(self) -> pd.DataFrame:
+    @traced("list_buckets_df")
+    def list_buckets_df(self) -> "pd.DataFrame":
         """Lists all the available storage buckets in the system and returns a dataframe with the records"""
 
+        import pandas as pd
+
         records = self.list_buckets_dict()
 
         df = pd.DataFrame(records)
@@ -501,48 +931,60 @@ class LakehouseClient:
         return df
 
     # upload function
+    @traced("upload_dataframe", "df_name")
     def upload_dataframe(
         self,
-        df: pd.DataFrame,
+        df: "pd.DataFrame",
         df_name: str,
         collection_catalog_id: str,
         dataframe_description: str = "",
         dataframe_version: int = 1,
         public: bool = False,
-        processing_level: Literal["raw", "processed", "curated"] = "raw"
-    )-> tuple[str, str, str]:
-        """Description: Set up a new file to be uploaded from local storage. It returns the upload token, the credential id and the local dataframe file path to upload it.\n
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        file_format: Literal["parquet", "feather", "csv"] = "parquet",
+        compression: str = None,
+        row_group_size: int = None,
+        deduplicate: bool = False
+    ) -> dict[str]:
+        """Description: Serializes a dataframe in memory and uploads it. It returns the catalog item for the new file uploaded.\n
          Parameters:\n
         - df: the dataframe that should be uploaded
-        - df_name: the dataframe name only, without the extension. By default the dataframe will be stored as a CSV file\n
+        - df_name: the dataframe name only, without the extension. By default the dataframe will be stored as a PARQUET file\n
         - collection_catalog_id: the collection identifiyer, from the collection catalog, where the file will be placed in\n
         - file_description [Optional]: Additional description for the file\n
         - dataframe_version [Optional, default 1]: The version of this dataframe in the system \n
         - public [Optional, default False]: The visibility of the dataframe, if public all users can see in the catalog
         - processing_level [Optional, default raw]: The processing level of this dataframe
+        - file_format [Optional, default parquet]: The format the dataframe is stored in: "parquet", "feather" (Arrow IPC) or "csv", csv files are written without the index
+        - compression [Optional]: The parquet ("snappy", "zstd", "gzip") or feather ("lz4", "zstd", "uncompressed") codec, by default snappy for parquet and lz4 for feather
+        - row_group_size [Optional]: The maximum number of rows in each parquet row group
+        - deduplicate [Optional, default False]: skips the transfer if the collection already holds an identical file with the same name, see `upload_stream()`
         """      
 
-        # saving dataframe into csv
-        df_file_path = f"{self.__file_load_path}/{df_name}.csv"
+        file_name, metadata = dataframe_upload(df_name, file_format, compression)
+
+        buffer = io.BytesIO()
 
-        df.to_csv(df_file_path)
+        write_dataframe(df, buffer, file_format=file_format, compression=compression, row_group_size=row_group_size)
 
-        upload_response = self.upload_file(
-            local_file_path=df_file_path,
-            final_file_name=f"{df_name}.csv",
+        buffer.seek(0)
+
+        upload_response = self.upload_stream(
+            data=buffer,
+            final_file_name=file_name,
             collection_catalog_id=collection_catalog_id,
             file_category="structured",
             file_description=dataframe_description,
             file_version=dataframe_version,
             public=public,
-            processing_level=processing_level
+            processing_level=processing_level,
+            metadata=metadata,
+            deduplicate=deduplicate
         )
 
-        if os.path.exists(df_file_path):
-            os.remove(df_file_path)
-
         return upload_response
 
+    @traced("upload_file", "final_file_name")
     def upload_file(
         self,
         local_file_path: str,
@@ -553,7 +995,13 @@ class LakehouseClient:
         file_version: int = 1,
         file_size: int = 0,
         public: bool = False,
-        processing_level: Literal["raw", "processed", "curated"] = "raw"
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        metadata: dict = None,
+        multipart: bool = False,
+        part_size: int = None,
+        max_workers: int = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None
     ) -> dict[str]:
         """Description: Set up a new file to be uploaded from local storage. It returns the catalog item for the new file uploaded.\n
          Parameters:\n
@@ -567,10 +1015,14 @@ class LakehouseClient:
         - file_size [Optional, default 0]: The size of the file you are uploading in bytes, the sizen will be taken by default from your system
         - public [Optional, default False]: The visibility of the dataframe, if public all users can see in the catalog
         - processing_level [Optional]: A string containing the processing level of the file to be uploaded, e.g., ["raw", "processed", "curated"]\n
+        - metadata [Optional]: A dictionary of extra properties stored with the catalog record, e.g. {"file_format": "parquet"}\n
+        - multipart [Optional, default False]: uploads the file as parts sent in parallel, falls back to the serial upload if the server does not return part urls\n
+        - part_size [Optional]: the size in bytes of each part of a multipart upload, by default it is chosen by the client tuner from the throughput observed\n
+        - max_workers [Optional]: the number of parts uploaded concurrently, by default it is adjusted by the client tuner while the data is sent\n
+        - deduplicate [Optional, default False]: skips the transfer if the collection already holds an identical file with the same name and returns its catalog item, see `upload_stream()`\n
+        - transfer_compression [Optional]: "gzip" or "zstd", compresses text files while they are sent, see `upload_stream()`\n
         """  
 
-        print("Uploading data...")
-
         file_size = os.path.getsize(local_file_path)
 
         file_extension = self.__get_file_extension(local_file_path)
@@ -581,128 +1033,296 @@ class LakehouseClient:
             
             if not final_file_name_lower.endswith(file_extension_lower):
                 final_file_name += file_extension
-        
-        payload = {
-            "collection_catalog_id": collection_catalog_id,
-            "file_name": final_file_name,
-            "file_category": file_category,
-            "file_version": file_version,
-            "file_size": file_size,
-            "public": public,
-            "processing_level": processing_level,
-            "file_description": file_description
-        }
 
-        response = self.__make_request(method="POST", endpoint="/storage/files/upload-request", json=payload)
+        with open(local_file_path, "rb") as file:
+            return self.upload_stream(
+                data=file,
+                final_file_name=final_file_name,
+                collection_catalog_id=collection_catalog_id,
+                file_category=file_category,
+                file_description=file_description,
+                file_version=file_version,
+                file_size=file_size,
+                public=public,
+                processing_level=processing_level,
+                metadata=metadata,
+                multipart=multipart,
+                part_size=part_size,
+                max_workers=max_workers,
+                deduplicate=deduplicate,
+                transfer_compression=transfer_compression
+            )
 
-        signed_url = response["upload_url"]
+    @traced("upload_stream", "final_file_name")
+    def upload_stream(
+        self,
+        data: bytes | BinaryIO | Iterable[bytes],
+        final_file_name: str,
+        collection_catalog_id: str,
+        file_category: Literal["structured", "unstructured"] = "unstructured",
+        file_description: str = None,
+        file_version: int = 1,
+        file_size: int = None,
+        public: bool = False,
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        metadata: dict = None,
+        multipart: bool = False,
+        part_size: int = None,
+        max_workers: int = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None
+    ) -> dict[str]:
+        """Description: Uploads data held in memory or produced on the fly, without writing it to local storage. It returns the catalog item for the new file uploaded.\n
+        A sha256 checksum of the data is computed while it is sent and recorded in the catalog metadata, it is checked when the file is downloaded.\n
+         Parameters:\n
+        - data: the content of the file, as bytes, a binary file object or an iterator of byte chunks\n
+        - final_file_name: the output file name in the storage, including its extension\n
+        - collection_catalog_id: the collection identifiyer, from the collection catalog, where the file will be placed in\n
+        - file_category: the file class must indicate if the file is 'structured' or 'unstructured', by default the file is set to be 'unstructured'\n
+        - file_description [Optional]: Additional description for the file\n
+        - file_version [Optional, default 1]: The version of the file you are uploading for version control
+        - file_size [Optional]: The size of the data in bytes. It is taken from bytes and seekable file objects, otherwise the bytes sent are counted and the size is recorded once the upload completes
+        - public [Optional, default False]: The visibility of the file, if public all users can see in the catalog
+        - processing_level [Optional]: A string containing the processing level of the file to be uploaded, e.g., ["raw", "processed", "curated"]\n
+        - metadata [Optional]: A dictionary of extra properties stored with the catalog record\n
+        - multipart [Optional, default False]: uploads the data as parts sent in parallel, requires a known size and falls back to the serial upload otherwise\n
+        - part_size [Optional]: the size in bytes of each part of a multipart upload, by default it is chosen by the client tuner from the throughput observed\n
+        - max_workers [Optional]: the number of parts uploaded concurrently, by default it is adjusted by the client tuner while the data is sent\n
+        - deduplicate [Optional, default False]: computes the checksum before the upload and skips the transfer if the collection already holds a file with the same name and checksum, returning its catalog item. Requires bytes or a seekable file object\n
+        - transfer_compression [Optional]: "gzip" or "zstd", compresses text files (csv, tsv, json, md, html, ...) while they are sent. The codec is recorded in the catalog metadata and the files are decompressed while they are downloaded. Compressed uploads are never multipart\n
+        """
 
-        catalog_record_id = response["catalog_record_id"]
+        logger.info("Uploading %s", final_file_name)
 
-        method = str(response["method"])
+        plan = UploadPlan(
+            data=data,
+            final_file_name=final_file_name,
+            collection_catalog_id=collection_catalog_id,
+            file_category=file_category,
+            file_description=file_description,
+            file_version=file_version,
+            file_size=file_size,
+            public=public,
+            processing_level=processing_level,
+            metadata=metadata,
+            multipart=multipart,
+            part_size=part_size,
+            deduplicate=deduplicate,
+            transfer_compression=transfer_compression,
+            tuner=self.__tuner
+        )
 
-        CHUNK_SIZE = 10 * 1024 * 1024
+        if deduplicate:
+            with self.instrumentation.phase("checksum"):
+                plan.set_checksum(file_checksum(plan.file))
 
-        if method.lower() == "put":
-            with open(local_file_path, "rb") as file:
-                while chunk := file.read(CHUNK_SIZE):
-                    response = requests.put(signed_url, data=chunk, headers={"Content-Type": "application/octet-stream"})
-                    response.raise_for_status()
-        else:
-            with open(local_file_path, 'rb') as file:
-                while chunk := file.read(CHUNK_SIZE):
-                    response = requests.post(signed_url, data=chunk, headers={'Content-Type': 'application/octet-stream'})
-                    response.raise_for_status()
-     
-        payload = {"status": "ready"}
+            identical_file = plan.identical_file(self.__make_request(**plan.identical_file_request()))
+
+            if identical_file:
+                logger.info("Identical file already uploaded as %s, transfer skipped", identical_file.get("id"))
+                return identical_file
+
+        plan.receive(self.__make_request(**plan.upload_request()))
+
+        parts = None
+        bytes_sent = 0
 
-        response = self.__make_request(method="PUT", endpoint=f"/catalog/set-file-status/{catalog_record_id}", json=payload)
+        with self.instrumentation.phase("transfer", total=None if plan.codec else plan.file_size):
+            if plan.part_urls:
+                parts = upload_parts(
+                    transport=self.__transport,
+                    part_urls=plan.part_urls,
+                    file=plan.file,
+                    part_size=plan.part_size,
+                    max_workers=max_workers,
+                    method=plan.part_method,
+                    tuner=self.__tuner,
+                    limiter=self.__limiter
+                )
+            else:
+                body = plan.body()
 
-        print("Data uploaded!")
+                # each request is sized from the throughput of the previous ones
+                while chunk := body.read(self.__tuner.chunk_size("upload")):
+                    send_chunk(self.__transport, plan.method, plan.upload_url, chunk, tuner=self.__tuner, limiter=self.__limiter)
+                    bytes_sent += len(chunk)
+
+        response = self.__make_request(**plan.finalize_request(bytes_sent=bytes_sent, parts=parts))
+
+        self.invalidate_metadata_cache("/catalog/files")
+        self.invalidate_metadata_cache(f"/catalog/file/id/{plan.catalog_record_id}")
+
+        logger.info("Data uploaded as %s", plan.catalog_record_id)
 
         return response
 
+    @traced("upload_files")
+    def upload_files(
+        self,
+        local_file_paths: list[str],
+        collection_catalog_id: str,
+        file_category: Literal["structured", "unstructured"] = "unstructured",
+        file_description: str = None,
+        file_version: int = 1,
+        public: bool = False,
+        processing_level: Literal["raw", "processed", "curated"] = "raw",
+        max_workers: int = BATCH_MAX_WORKERS,
+        progress_callback: Callable[[int, int, BatchItemResult], None] = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None
+    ) -> dict[str, list[dict]]:
+        """Description: Uploads many local files concurrently into a collection, each file keeps its own name. It returns a manifest with the catalog records of the uploaded files and the errors of the failed ones.\n
+        Parameters:\n
+        - local_file_paths: the local paths to the files to be uploaded\n
+        - collection_catalog_id: the collection identifiyer, from the collection catalog, where the files will be placed in\n
+        - file_category [Optional, default 'unstructured']: the file class of every file, 'structured' or 'unstructured'\n
+        - file_description [Optional]: Additional description for every file\n
+        - file_version [Optional, default 1]: The version of every file
+        - public [Optional, default False]: The visibility of every file
+        - processing_level [Optional, default raw]: The processing level of every file, e.g., ["raw", "processed", "curated"]\n
+        - max_workers [Optional, default 8]: the maximum number of files uploaded concurrently\n
+        - progress_callback [Optional]: a function called as each file completes with the number of completed files, the total number of files and the file result\n
+        - deduplicate [Optional, default False]: skips the files the collection already holds, see `upload_file()`\n
+        - transfer_compression [Optional]: "gzip" or "zstd", compresses the text files while they are sent, see `upload_stream()`\n
+        """
+
+        results = self.__run_batch(
+            keys=list(local_file_paths),
+            work=lambda local_file_path: self.upload_file(
+                local_file_path=local_file_path,
+                final_file_name=self.__get_filename(local_file_path),
+                collection_catalog_id=collection_catalog_id,
+                file_category=file_category,
+                file_description=file_description,
+                file_version=file_version,
+                public=public,
+                processing_level=processing_level,
+                deduplicate=deduplicate,
+                transfer_compression=transfer_compression
+            ),
+            max_workers=max_workers,
+            progress_callback=progress_callback
+        )
+
+        return {
+            "uploaded": [dict(local_file_path=result.key, record=result.value) for result in results if result.ok],
+            "failed": [dict(local_file_path=result.key, error=result.error) for result in results if not result.ok]
+        }
+
+    @traced("upload_directory")
+    def upload_directory(
+        self,
+        local_dir: str,
+        collection_catalog_id: str,
+        pattern: str = "*",
+        recursive: bool = False,
+        **kwargs
+    ) -> dict[str, list[dict]]:
+        """Description: Uploads the files of a local directory matching a glob pattern concurrently into a collection. It returns the same manifest as `upload_files()`.\n
+        Parameters:\n
+        - local_dir: the local directory holding the files to be uploaded\n
+        - collection_catalog_id: the collection identifiyer, from the collection catalog, where the files will be placed in\n
+        - pattern [Optional, default '*']: a glob pattern the file names must match, e.g. '*.csv'\n
+        - recursive [Optional, default False]: also uploads the matching files of the subdirectories. Files keep their base name, so files sharing a name in different subdirectories are not uploaded and are listed as failed instead of overwriting each other\n
+        - **kwargs: the remaining options of `upload_files()` (file_category, file_description, file_version, public, processing_level, max_workers, progress_callback, deduplicate, transfer_compression)\n
+        """
+
+        search_pattern = os.path.join(local_dir, "**", pattern) if recursive else os.path.join(local_dir, pattern)
+
+        local_file_paths = sorted(path for path in glob.glob(search_pattern, recursive=recursive) if os.path.isfile(path))
+
+        paths_by_name = {}
+
+        for local_file_path in local_file_paths:
+            paths_by_name.setdefault(self.__get_filename(local_file_path), []).append(local_file_path)
+
+        duplicates = {name: paths for name, paths in paths_by_name.items() if len(paths) > 1}
+
+        manifest = self.upload_files(
+            local_file_paths=[path for path in local_file_paths if self.__get_filename(path) not in duplicates],
+            collection_catalog_id=collection_catalog_id,
+            **kwargs
+        )
+
+        for name, paths in duplicates.items():
+            relative_paths = ", ".join(os.path.relpath(path, local_dir) for path in paths)
+
+            manifest["failed"].extend(
+                dict(local_file_path=path, error=f"Several files are named {name} ({relative_paths}), none of them was uploaded")
+                for path in paths
+            )
+
+        return manifest
+
 
     # search function
+    @traced("search_collections_by_keyword")
     def search_collections_by_keyword(
         self,
         keyword: str,
-        output_format: Literal["df", "json", "dict", "table"] = "df"
+        output_format: Literal["df", "json", "dict", "table"] = "df",
+        use_mirror: bool = False
     ) -> dict:
         """Description: Search files on the catalogue based on the given filters\n
             Parameter: \n
             - keyword: A string containing the keyword to search for, the search will match the collection names to the keyword
             - output_format: A string containing one of the following options ["df", "json", "dict", "table"]
+            - use_mirror [Optional, default False]: runs the search against the client catalog mirror instead of the server, see `sync_catalog_mirror()`
         """
 
         if output_format not in ["df", "json", "dict", "table"]:
             raise Exception("Must specify output format")
 
-        filters = [
-            CatalogFilter(
-                property_name="collection_name",
-                operator="*",
-                property_value=keyword
-            ) 
-        ]
-
-        try:
-            payload = CatalogFilterPayload(filters=filters)
-        except Exception:
-            raise Exception("Incorrect filter format!")
-
-        dumped_payload = payload.model_dump()
+        parsed_args = [("collection_name", "*", keyword)]
 
-        response = self.__make_request(method="POST", endpoint="/catalog/collections/search", json=dumped_payload)
+        if use_mirror:
+            records = self.__search_mirror("collections", parsed_args)
+        else:
+            response = self.__make_request(method="POST", endpoint="/catalog/collections/search", json=search_payload(parsed_args))
 
-        records = response.get("records", [])
+            records = response.get("records", [])
 
-        records = self.__format_output(data=records, output_format=output_format)
+        records = format_output(data=records, output_format=output_format)
       
         return records
     
+    @traced("search_files_by_keyword")
     def search_files_by_keyword(
         self,
         keyword: str,
-        output_format: Literal["df", "json", "dict", "table"] = "df"
+        output_format: Literal["df", "json", "dict", "table"] = "df",
+        use_mirror: bool = False
     ) -> dict:
         """Description: Search files on the catalogue based on the given filters\n
             Parameter: \n
             - keyword: A string containing the keyword to search for, the search will match the file names to the keyword
             - output_format: A string containing one of the following options ["df", "json", "dict", "table"]
+            - use_mirror [Optional, default False]: runs the search against the client catalog mirror instead of the server, see `sync_catalog_mirror()`
         """
 
         if output_format not in ["df", "json", "dict", "table"]:
             raise Exception("Must specify output format")
 
-        filters = [
-            CatalogFilter(
-                property_name="file_name",
-                operator="*",
-                property_value=keyword
-            ) 
-        ]
-
-        try:
-            payload = CatalogFilterPayload(filters=filters)
-        except Exception:
-            raise Exception("Incorrect filter format!")
+        parsed_args = [("file_name", "*", keyword)]
 
-        dumped_payload = payload.model_dump()
-
-        response = self.__make_request(method="POST", endpoint="/catalog/files/search", json=dumped_payload)
+        if use_mirror:
+            records = self.__search_mirror("files", parsed_args)
+        else:
+            response = self.__make_request(method="POST", endpoint="/catalog/files/search", json=search_payload(parsed_args))
 
-        records = response.get("records", [])
+            records = response.get("records", [])
 
-        records = self.__format_output(data=records, output_format=output_format)
+        records = format_output(data=records, output_format=output_format)
       
         return records
     
     
+    @traced("search_collections_query")
     def search_collections_query(
         self,
         *args,
-        output_format: Literal["df", "json", "dict", "table"] = "df"
+        output_format: Literal["df", "json", "dict", "table"] = "df",
+        use_mirror: bool = False
     ) -> list[dict]:
         """Description: Search files on the catalogue based on the given filters\n
             
@@ -716,6 +1336,9 @@ class LakehouseClient:
             Query string structure: 
                 KEY[OPERATOR]VALUE. Operator can be "=", ">","<", ">=", "<=" or the wildcard operator "*" (substring match)
 
+            Mirror:
+                use_mirror=True runs the search against the client catalog mirror instead of the server, see `sync_catalog_mirror()`
+
             Usage example: 
                 search_collections_query('collection_name*lake','inserted_by=user1@gmail.com','inserted_at>1747934722', 'public=True', output_format='table')
         """
@@ -723,37 +1346,26 @@ class LakehouseClient:
         if output_format not in ["df", "json", "dict", "table"]:
             raise Exception("Must specify output format")
 
-        parsed_args = self.__parse_query_args(args=args)
-
-        filters = [
-            CatalogFilter(
-                property_name=key,
-                operator=op,
-                property_value=value
-            ) 
-            for (key, op, value) in parsed_args
-        ]
-
-        try:
-            payload = CatalogFilterPayload(filters=filters)
-        except Exception:
-            raise Exception("Incorrect filter format!")
+        parsed_args = parse_query_args(args=args)
 
-        parsed_payload = payload.model_dump()
-
-        response = self.__make_request(method="POST", endpoint="/catalog/collections/search", json=parsed_payload)
+        if use_mirror:
+            records = self.__search_mirror("collections", parsed_args)
+        else:
+            response = self.__make_request(method="POST", endpoint="/catalog/collections/search", json=search_payload(parsed_args))
 
-        records = response.get("records", [])
+            records = response.get("records", [])
 
-        records = self.__format_output(data=records, output_format=output_format)
+        records = format_output(data=records, output_format=output_format)
       
         return records
     
 
+    @traced("search_files_query")
     def search_files_query(
         self,
         *args,
-        output_format: Literal["df", "json", "dict", "table"] = "df"
+        output_format: Literal["df", "json", "dict", "table"] = "df",
+        use_mirror: bool = False
     ) -> list[dict]:
         """Description: Search files on the catalogue based on the given filters\n
             Parameters:
@@ -766,6 +1378,9 @@ class LakehouseClient:
              Query string structure: 
                 KEY[OPERATOR]VALUE. Operator can be "=", ">","<", ">=", "<=" or the wildcard operator "*" (substring match)
 
+            Mirror:
+                use_mirror=True runs the search against the client catalog mirror instead of the server, see `sync_catalog_mirror()`
+
             Usage example: 
                 search_files_query('file_name*sample','inserted_by=user1@gmail.com','inserted_at>1747934722', 'public=True', output_format='table')
         """
@@ -773,29 +1388,16 @@ class LakehouseClient:
         if output_format not in ["df", "json", "dict", "table"]:
             raise Exception("Must specify output format")
 
-        parsed_args = self.__parse_query_args(args=args)
-
-        filters = [
-            CatalogFilter(
-                property_name=key,
-                operator=op,
-                property_value=value
-            ) 
-            for (key, op, value) in parsed_args
-        ]
+        parsed_args = parse_query_args(args=args)
 
-        try:
-            payload = CatalogFilterPayload(filters=filters)
-        except Exception:
-            raise Exception("Incorrect filter format!")
-
-        parsed_payload = payload.model_dump()
-
-        response = self.__make_request(method="POST", endpoint="/catalog/files/search", json=parsed_payload)
+        if use_mirror:
+            records = self.__search_mirror("files", parsed_args)
+        else:
+            response = self.__make_request(method="POST", endpoint="/catalog/files/search", json=search_payload(parsed_args))
 
-        records = response.get("records", [])
+            records = response.get("records", [])
 
-        records = self.__format_output(data=records, output_format=output_format)
+        records = format_output(data=records, output_format=output_format)
       
         return records
 
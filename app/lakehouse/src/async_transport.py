@@ -0,0 +1,79 @@
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # the async client is optional, pip install lakehouselib[async]
+    httpx = None
+
+from .instrumentation import record_retry
+from .transport import RetryPolicy
+
+
+class AsyncHTTPTransport(RetryPolicy):
+    """Description: Pooled keep-alive HTTP transport shared by every request made by the AsyncLakehouseClient, with the retry policy of HTTPTransport.\n
+    Requests waiting for a connection are queued by the pool instead of failing, so any number of calls can be gathered at once.\n
+    Parameters:\n
+    - max_connections [Optional, default 10]: maximum number of connections open at once, further requests wait for a free connection\n
+    - connect_timeout [Optional, default 10]: seconds to wait for a connection to be established\n
+    - read_timeout [Optional, default 300]: seconds to wait for the server between bytes\n
+    - max_retries [Optional, default 3]: number of retries for failed idempotent calls and 429/5xx responses\n
+    - backoff_factor [Optional, default 0.5]: base delay in seconds, doubled on every attempt and jittered\n
+    - backoff_max [Optional, default 30]: upper bound in seconds for a single backoff delay\n
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        connect_timeout: float = 10,
+        read_timeout: float = 300,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30
+    ) -> None:
+        if httpx is None:
+            raise Exception("The async client requires the httpx package: pip install lakehouselib[async]")
+
+        super().__init__(max_retries=max_retries, backoff_factor=backoff_factor, backoff_max=backoff_max)
+
+        self.max_connections = max_connections
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=None),
+            follow_redirects=True
+        )
+
+    async def request(self, method: str, url: str, retry: bool = None, stream: bool = False, **kwargs) -> "httpx.Response":
+        """Description: Sends a request, retrying it with exponential backoff when the call can safely be sent again.\n
+        Parameters:\n
+        - method: the HTTP method\n
+        - url: the request url\n
+        - retry [Optional]: forces retries on or off. By default only idempotent methods are retried, and any method is retried on 429\n
+        - stream [Optional, default False]: returns before the body is read, the response must then be closed with `await response.aclose()`\n
+        - **kwargs: additional arguments for `httpx.AsyncClient.build_request()` (e.g. `json`, `content`, `headers`, `params`)\n
+        """
+        attempt = 0
+
+        while True:
+            try:
+                response = await self.client.send(self.client.build_request(method, url, **kwargs), stream=stream)
+            except httpx.TransportError:
+                if attempt >= self.max_retries or not self.is_retryable(method, retry):
+                    raise
+                record_retry()
+                await asyncio.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if attempt >= self.max_retries or not self.should_retry_status(method, response.status_code, retry):
+                return response
+
+            delay = self.backoff_delay(attempt, response)
+            record_retry()
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """Closes every pooled connection"""
+        await self.client.aclose()
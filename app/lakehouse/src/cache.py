@@ -0,0 +1,256 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CACHE_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+# seconds each catalog endpoint response is reused for, matched by endpoint prefix
+METADATA_TTLS = {
+    "/catalog/file/id/": 300,
+    "/catalog/files/all/": 30,
+    "/catalog/collections/all/": 30,
+    "/catalog/files/search": 30,
+    "/catalog/collections/search": 30,
+    "/storage/bucket-list": 300
+}
+
+
+class ObjectCache:
+    """Description: On-disk cache of downloaded catalog files with a size budget and least recently used eviction.\n
+    Entries are keyed by the catalog record, so a new version of a file never hits an old entry.
+    Writes are atomic and a lock file makes the cache safe to share between processes.\n
+    Parameters:\n
+    - directory: the local directory holding the cached files\n
+    - max_bytes [Optional, default 10 GB]: the size budget, the least recently used files are evicted once it is exceeded\n
+    """
+
+    def __init__(self, directory: str, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+
+        self.__objects_dir = os.path.join(self.directory, "objects")
+        self.__lock_path = os.path.join(self.directory, ".lock")
+
+        os.makedirs(self.__objects_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(catalog_item: dict) -> str:
+        """Returns the cache key of a catalog file record, built from its id, version, size and etag when available"""
+        parts = [
+            catalog_item["id"],
+            catalog_item.get("file_version"),
+            catalog_item.get("file_size"),
+            catalog_item.get("etag")
+        ]
+
+        return hashlib.sha256(":".join(str(part) for part in parts).encode("UTF-8")).hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.__objects_dir, key[:2], key)
+
+    @contextmanager
+    def __lock(self):
+        with open(self.__lock_path, "a+b") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def open(self, key: str) -> BinaryIO | None:
+        """Description: Opens a cached file for reading and marks it as recently used. It returns None on a cache miss.\n
+        The open file stays readable even if another process evicts the entry afterwards.\n
+        Parameters:\n
+        - key: the cache key, see `ObjectCache.key_for()`\n
+        """
+        path = self.__path(key)
+
+        with self.__lock():
+            try:
+                file = open(path, "rb")
+            except FileNotFoundError:
+                return None
+
+            now = time.time()
+            os.utime(path, (now, now))
+
+        return file
+
+    def store(self, key: str, write: Callable[[str], None]) -> BinaryIO:
+        """Description: Adds a file to the cache and evicts the least recently used files over the size budget. It returns the cached file opened for reading.\n
+        Parameters:\n
+        - key: the cache key, see `ObjectCache.key_for()`\n
+        - write: a function writing the file content into the temporary path it receives\n
+        """
+        path = self.__path(key)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # the temporary file lives in the cache directory so the final rename is atomic
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+
+        try:
+            write(temp_path)
+
+            with self.__lock():
+                os.replace(temp_path, path)
+                file = open(path, "rb")
+                self.__evict(keep=path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return file
+
+    def discard(self, key: str) -> None:
+        """Description: Removes a cached file, for example one that no longer matches its catalog checksum. Missing entries are ignored.\n
+        Parameters:\n
+        - key: the cache key, see `ObjectCache.key_for()`\n
+        """
+        with self.__lock():
+            try:
+                os.remove(self.__path(key))
+            except OSError:
+                pass
+
+    def __evict(self, keep: str = None) -> None:
+        entries = []
+        total_size = 0
+
+        for root, _, files in os.walk(self.__objects_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:  # still open by a reader on Windows
+                continue
+            total_size -= size
+
+    def clear(self) -> None:
+        """Removes every cached file"""
+        with self.__lock():
+            for root, _, files in os.walk(self.__objects_dir):
+                for name in files:
+                    if not name.endswith(".tmp"):
+                        try:
+                            os.remove(os.path.join(root, name))
+                        except OSError:
+                            continue
+
+
+class MetadataCache:
+    """Description: In-process cache of catalog responses with a time to live per endpoint.\n
+    Identical requests made at the same time share a single round trip. Cached responses are shared between callers and must not be modified.\n
+    Parameters:\n
+    - ttls [Optional]: a dictionary mapping endpoint prefixes to the number of seconds their responses are reused for, by default `METADATA_TTLS`. Endpoints without a matching prefix are not cached\n
+    """
+
+    def __init__(self, ttls: dict[str, float] = None) -> None:
+        self.ttls = dict(METADATA_TTLS if ttls is None else ttls)
+
+        self.__entries = {}
+        self.__inflight = {}
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        """Returns the time to live of an endpoint, or None if its responses are not cached"""
+        prefixes = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+
+        return self.ttls[max(prefixes, key=len)] if prefixes else None
+
+    def get_or_fetch(self, key: tuple, endpoint: str, fetch: Callable[[], Any]) -> Any:
+        """Description: Returns the cached response for a request, calling `fetch` on a miss or after the entry expired.\n
+        Parameters:\n
+        - key: a hashable identifier of the request\n
+        - endpoint: the endpoint the request is sent to, used to pick the time to live and for invalidation\n
+        - fetch: a function sending the request and returning its response\n
+        """
+        ttl = self.ttl_for(endpoint)
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry and entry[1] > time.monotonic():
+                return entry[2]
+
+            future = self.__inflight.get(key)
+            owner = future is None
+
+            if owner:
+                future = Future()
+                self.__inflight[key] = future
+                generation = self.__generation
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as error:
+            with self.__lock:
+                del self.__inflight[key]
+            future.set_exception(error)
+            raise
+
+        with self.__lock:
+            del self.__inflight[key]
+            # responses fetched before an invalidation may already be stale
+            if ttl and generation == self.__generation:
+                self.__entries[key] = (endpoint, time.monotonic() + ttl, value)
+
+        future.set_result(value)
+
+        return value
+
+    def invalidate(self, endpoint_prefix: str = None) -> None:
+        """Description: Drops cached responses.\n
+        Parameters:\n
+        - endpoint_prefix [Optional]: only drops the responses of endpoints starting with this prefix, by default every response is dropped\n
+        """
+        with self.__lock:
+            self.__generation += 1
+
+            if endpoint_prefix is None:
+                self.__entries.clear()
+                return
+
+            for key in [key for key, entry in self.__entries.items() if entry[0].startswith(endpoint_prefix)]:
+                del self.__entries[key]
@@ -0,0 +1,126 @@
+import zlib
+from typing import Iterable, Iterator, Literal
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, pip install lakehouselib[zstd]
+    zstandard = None
+
+TransferCodec = Literal["gzip", "zstd"]
+
+TRANSFER_CODECS = ("gzip", "zstd")
+
+# text formats worth compressing, other formats are usually compressed already
+COMPRESSIBLE_EXTENSIONS = (".csv", ".tsv", ".json", ".jsonl", ".ndjson", ".md", ".html", ".txt", ".tex")
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def check_codec(codec: str) -> None:
+    """Raises an exception if a transfer codec is unknown or its library is not installed"""
+    if codec not in TRANSFER_CODECS:
+        raise Exception(f"Unsupported transfer compression: {codec!r}. Expected one of {list(TRANSFER_CODECS)}")
+
+    if codec == "zstd" and zstandard is None:
+        raise Exception("zstd transfer compression requires the zstandard package: pip install lakehouselib[zstd]")
+
+
+def is_compressible(file_name: str) -> bool:
+    """Returns True if a file is stored in a text format that benefits from transfer compression"""
+    return file_name.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def compress_chunks(chunks: Iterable[bytes], codec: TransferCodec) -> Iterator[bytes]:
+    """Description: Compresses a sequence of byte chunks as they are produced.\n
+    Parameters:\n
+    - chunks: an iterator of byte chunks\n
+    - codec: "gzip" or "zstd"\n
+    """
+    check_codec(codec)
+
+    if codec == "gzip":
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    else:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+
+    if tail := compressor.flush():
+        yield tail
+
+
+class StreamDecompressor:
+    """Description: Decompresses a transfer compressed body fed one chunk at a time, for bodies that are not read as an iterator.\n
+    Parameters:\n
+    - codec: "gzip" or "zstd"\n
+    """
+
+    def __init__(self, codec: TransferCodec) -> None:
+        check_codec(codec)
+
+        self.codec = codec
+
+        if codec == "gzip":
+            self.__decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self.__decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """Returns the data decompressed from a chunk, possibly empty"""
+        return self.__decompressor.decompress(chunk)
+
+    def flush(self) -> bytes:
+        """Returns the remaining data once the body ended, raising an exception if the body was truncated"""
+        # zstd returns every byte as it is decompressed, its flush only checks that the frame ended
+        tail = self.__decompressor.flush() if self.codec == "gzip" else b""
+
+        if not self.__decompressor.eof:
+            raise Exception(f"Truncated {self.codec} transfer")
+
+        return tail
+
+
+def decompress_chunks(chunks: Iterable[bytes], codec: TransferCodec) -> Iterator[bytes]:
+    """Description: Decompresses a sequence of byte chunks as they arrive.\n
+    Parameters:\n
+    - chunks: an iterator of compressed byte chunks, like the body of a streamed response\n
+    - codec: "gzip" or "zstd"\n
+    """
+    decompressor = StreamDecompressor(codec)
+
+    for chunk in chunks:
+        if data := decompressor.decompress(chunk):
+            yield data
+
+    if tail := decompressor.flush():
+        yield tail
+
+
+def select_codec(file_name: str, transfer_compression: TransferCodec = None) -> str | None:
+    """Returns the codec an upload is compressed with, None when no compression is requested or the file is not a text format"""
+    if not transfer_compression or not is_compressible(file_name):
+        return None
+
+    check_codec(transfer_compression)
+
+    return transfer_compression
+
+
+def stored_size(catalog_item: dict) -> int | None:
+    """Returns the number of bytes stored for a file, its compressed size when it was uploaded with a transfer codec"""
+    metadata = catalog_item.get("metadata")
+
+    if transfer_codec(catalog_item):
+        return metadata.get("compressed_size")
+
+    return catalog_item.get("file_size")
+
+
+def transfer_codec(catalog_item: dict) -> str | None:
+    """Returns the transfer compression recorded in a catalog record metadata, or None if the file is stored uncompressed"""
+    metadata = catalog_item.get("metadata")
+
+    return metadata.get("transfer_compression") if isinstance(metadata, dict) else None
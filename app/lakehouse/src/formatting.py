@@ -0,0 +1,178 @@
+import json
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal
+
+# pandas and numpy are imported by the functions that use them, records formatted as dict or json do not need them
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .types import BatchItemResult
+
+TABLE_CHUNK_ROWS = 10000
+
+COLLECTION_COLUMNS = ["id", "collection_name", "inserted_by", "inserted_at", "public"]
+FILE_COLUMNS = ["id", "file_name", "file_category", "file_size", "processing_level", "public", "inserted_by", "inserted_at", "collection_id", "collection_name", "file_location"]
+
+
+def to_text(column: "pd.Series") -> "pd.Series":
+    """Converts a column to the text printed by `str()`, including missing values"""
+    text = column.astype(str)
+
+    missing = text.isna()
+    if missing.any():
+        text = text.astype(object)
+        text[missing] = column[missing].map(str)
+
+    return text
+
+
+def center(text: "pd.Series", width: int) -> "pd.Series":
+    """Centers a text column like the '^' format specifier, which puts the odd padding space on the right"""
+    centered = text.str.center(width)
+
+    if width % 2:
+        # str.center puts the odd padding space on the left when the width is odd
+        odd_padding = (width - text.str.len()) % 2 == 1
+        centered = centered.where(~odd_padding, centered.str[1:] + " ")
+
+    return centered
+
+
+def iter_table_lines(df: "pd.DataFrame", chunk_rows: int = TABLE_CHUNK_ROWS) -> Iterator[str]:
+    """Description: Renders a dataframe as a text table, yielding the header first and then blocks of up to `chunk_rows` rows.\n
+    Parameters:\n
+    - df: the dataframe to be rendered\n
+    - chunk_rows [Optional, default 10000]: the number of rows rendered per block\n
+    """
+    import numpy as np
+
+    columns = [to_text(df[col]) for col in df.columns]
+
+    col_widths = [max(int(text.str.len().max()) if len(text) else 0, len(str(col))) for text, col in zip(columns, df.columns)]
+
+    yield '| ' + ' | '.join(f'{col:^{width}}' for col, width in zip(df.columns, col_widths)) + ' |'
+    yield '|-' + '-|-'.join('-' * width for width in col_widths) + '-|'
+
+    for start in range(0, len(df), chunk_rows):
+        rows = np.full(min(chunk_rows, len(df) - start), '| ', dtype=object)
+
+        for i, (text, width) in enumerate(zip(columns, col_widths)):
+            separator = ' | ' if i else ''
+            rows = rows + separator + center(text.iloc[start:start + chunk_rows], width).to_numpy(dtype=object)
+
+        yield '\n'.join(rows + ' |')
+
+
+def render_table(df: "pd.DataFrame") -> str:
+    """Renders a dataframe as a text table"""
+    return '\n'.join(iter_table_lines(df))
+
+
+def format_sizes(sizes: "pd.Series") -> "pd.Series":
+    """Formats a column of sizes in bytes as KB or MB strings"""
+    import numpy as np
+    import pandas as pd
+
+    kb = pd.to_numeric(sizes).astype("int64").to_numpy() / 1024
+
+    formatted = np.where(kb < 1024, np.char.mod("%.2f KB", kb), np.char.mod("%.2f MB", kb / 1024))
+
+    return pd.Series(formatted, index=sizes.index, dtype=object)
+
+
+def format_dates(timestamps: "pd.Series") -> "pd.Series":
+    """Formats a column of unix timestamps in seconds as YYYY-MM-DD dates"""
+    import pandas as pd
+
+    return pd.to_datetime(timestamps, unit='s').dt.strftime('%Y-%m-%d')
+
+
+def format_users(inserted_by: "pd.Series") -> "pd.Series":
+    """Keeps the second field of 'id:email' user references"""
+    return inserted_by.str.extract(r'^[^:]*:([^:]*)', expand=False)
+
+
+def pages_to_df(pages: Iterable[list[dict]], columns_order: list[str], sort_by_key: str = None, sort_desc: bool = False, limit: int = None) -> "pd.DataFrame":
+    """Description: Builds the dataframe of a catalog listing, keeping the listed columns with readable dates, users and file sizes.\n
+    Parameters:\n
+    - pages: the pages of records of the listing\n
+    - columns_order: the columns kept, in order\n
+    - sort_by_key [Optional]: the record key to sort by\n
+    - sort_desc [Optional, default False]: whether to sort in descending order\n
+    - limit [Optional]: the maximum number of rows to keep\n
+    """
+    import pandas as pd
+
+    # each page is converted as it arrives, so the records of only one page are held as dictionaries
+    frames = [pd.DataFrame(page) for page in pages if page]
+
+    if not frames:
+        return pd.DataFrame(columns=columns_order)
+
+    df = pd.concat(frames, ignore_index=True)
+
+    if sort_by_key:
+        df = df.sort_values(by=sort_by_key, ascending=not sort_desc, kind="stable", ignore_index=True)
+
+    if limit is not None:
+        df = df.head(limit)
+
+    filtered_df = df[columns_order].copy()
+
+    filtered_df["inserted_at"] = format_dates(filtered_df["inserted_at"])
+
+    filtered_df["inserted_by"] = format_users(filtered_df["inserted_by"])
+
+    if "file_size" in columns_order:
+        filtered_df["file_size"] = format_sizes(filtered_df["file_size"])
+
+    return filtered_df
+
+
+def format_output(data: list[dict], output_format: Literal["df", "json", "table", "dict"]):
+    """Description: Formats catalog records. Dictionaries and json are produced without building a dataframe.\n
+    Parameters:\n
+    - data: the catalog records\n
+    - output_format: one of "df", "json", "table" or "dict"\n
+    """
+
+    if output_format == "json":
+        return json.dumps(obj=data, indent=2)
+    elif output_format in ("df", "table"):
+        import pandas as pd
+
+        df = pd.DataFrame(data)
+        cols = list(df.columns)
+
+        if "id" in cols:
+            cols.remove("id")
+            df = df[["id"] + cols]
+
+        return df if output_format == "df" else render_table(df)
+
+    return data
+
+
+def format_file_records(results: "dict[str, BatchItemResult]", output_format: Literal["dict", "df"] = "dict") -> "dict[str, dict] | pd.DataFrame":
+    """Description: Formats the fetched records of many files as a dictionary mapping each id to its record, or a dataframe indexed by the id. An exception naming the failed ids is raised if any record could not be fetched.\n
+    Parameters:\n
+    - results: the fetch result of each file id\n
+    - output_format [Optional, default dict]: "dict" or "df"\n
+    """
+
+    failed = [result for result in results.values() if not result.ok]
+
+    if failed:
+        errors = "; ".join(f"{result.key}: {result.error}" for result in failed[:5])
+        raise Exception(f"Failed to fetch {len(failed)} of {len(results)} file records. {errors}")
+
+    records = {key: result.value for key, result in results.items()}
+
+    if output_format == "dict":
+        return records
+
+    import pandas as pd
+
+    df = format_output(data=list(records.values()), output_format="df")
+    df.index = pd.Index(list(records), name="catalog_file_id")
+
+    return df
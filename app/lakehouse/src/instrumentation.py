@@ -0,0 +1,441 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from .types import PhaseEvent
+
+# catalog_request, signed_url and finalize are API calls, stream is a transfer interleaved with parsing
+PHASES = ("auth", "catalog_request", "signed_url", "transfer", "stream", "checksum", "parse", "finalize", "total")
+
+PROGRESS_INTERVAL = 0.5
+
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+Exporter = Callable[[PhaseEvent], None]
+ProgressCallback = Callable[[str, str, int, int | None], None]
+
+logger = logging.getLogger(__name__)
+
+_active_operation = contextvars.ContextVar("lakehouse_operation", default=None)
+_active_phase = contextvars.ContextVar("lakehouse_phase", default=None)
+
+
+def request_phase(endpoint: str) -> str:
+    """Returns the phase an API request belongs to, by its endpoint"""
+    if endpoint.startswith("/auth/"):
+        return "auth"
+    if endpoint.startswith("/storage/files/"):
+        return "signed_url"
+    if endpoint.startswith("/catalog/set-file-status/"):
+        return "finalize"
+
+    return "catalog_request"
+
+
+def record_bytes(size: int) -> None:
+    """Adds transferred bytes to the active phase, if any. Called by the transfer functions for every chunk sent or received"""
+    timer = _active_phase.get()
+
+    if timer is not None:
+        timer.add_bytes(size)
+
+
+def record_retry() -> None:
+    """Counts a retried request in the active phase, if any. Called by the transports before every retry"""
+    timer = _active_phase.get()
+
+    if timer is not None:
+        timer.add_retry()
+
+
+def detach_operation() -> None:
+    """Starts a new operation scope in the current context, so the calls of a task gathered by a batch function are reported as their own operations"""
+    _active_operation.set(None)
+
+
+class PhaseTimer:
+    """Measures one phase of an operation, the transfer functions add the bytes and retries through `record_bytes()` and `record_retry()`"""
+
+    def __init__(self, instrumentation: "Instrumentation", phase: str, operation: str = None, key: str = None, total: int = None) -> None:
+        self.phase = phase
+        self.operation = operation
+        self.key = key
+        self.total = total
+        self.bytes = 0
+        self.retries = 0
+        self.started_at = time.time()
+
+        self.__instrumentation = instrumentation
+        self.__started = time.perf_counter()
+        self.__reported_at = self.__started
+        self.__lock = threading.Lock()
+
+    def add_bytes(self, size: int) -> None:
+        with self.__lock:
+            self.bytes += size
+            now = time.perf_counter()
+            report = now - self.__reported_at >= self.__instrumentation.progress_interval
+
+            if report:
+                self.__reported_at = now
+
+        if report:
+            self.__instrumentation.report_progress(self)
+
+    def add_retry(self) -> None:
+        with self.__lock:
+            self.retries += 1
+
+    def add_phase(self, timer: "PhaseTimer") -> None:
+        with self.__lock:
+            self.bytes += timer.bytes
+            self.retries += timer.retries
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.__started
+
+
+class Instrumentation:
+    """Description: Collects timing events of the client operations and hands them to exporters.\n
+    Each operation (e.g. `get_dataframe`) is split in phases: the catalog request, the signed url request, the transfer, the parse and the finalize request,
+    and a `total` event is emitted once the operation completes. Events carry the bytes transferred, the throughput and the number of retried requests.
+    Without exporters nor progress callback, the instrumentation is disabled and costs nothing.\n
+    Parameters:\n
+    - exporters [Optional]: functions called with every `PhaseEvent`, like a `LoggingExporter`, an `InMemoryRecorder` or a `PrometheusRegistry`\n
+    - progress_callback [Optional]: a function called during long transfers with the operation, the key (file id or name), the bytes transferred and the expected bytes, or None when unknown\n
+    - progress_interval [Optional, default 0.5]: the minimum number of seconds between two progress calls of a transfer\n
+    """
+
+    def __init__(self, exporters: list[Exporter] = None, progress_callback: ProgressCallback = None, progress_interval: float = PROGRESS_INTERVAL) -> None:
+        self.exporters = list(exporters or [])
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters or self.progress_callback)
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        """Adds a function called with every event"""
+        self.exporters.append(exporter)
+
+    def emit(self, event: PhaseEvent) -> None:
+        """Hands an event to every exporter, a failing exporter is logged and never fails the operation"""
+        for exporter in self.exporters:
+            try:
+                exporter(event)
+            except Exception:
+                logger.exception("Instrumentation exporter %r failed", exporter)
+
+    def report_progress(self, timer: PhaseTimer) -> None:
+        if self.progress_callback is None:
+            return
+
+        try:
+            self.progress_callback(timer.operation, timer.key, timer.bytes, timer.total)
+        except Exception:
+            logger.exception("Progress callback failed")
+
+    @contextmanager
+    def operation(self, name: str, key: str = None, emit: bool = True) -> Iterator[None]:
+        """Description: Times a client operation and emits its `total` event. Operations started inside another one are part of it and emit no event of their own.\n
+        Parameters:\n
+        - name: the operation name, usually the client function name\n
+        - key [Optional]: the file id or file name the operation works on\n
+        - emit [Optional, default True]: emits the `total` event, generators that can not keep an operation open across their yields only use it to name their phases\n
+        """
+        if not self.enabled or _active_operation.get() is not None:
+            yield
+            return
+
+        timer = PhaseTimer(self, "total", name, key)
+        token = _active_operation.set(timer)
+        error = None
+
+        try:
+            yield
+        except BaseException as exception:
+            error = str(exception) or type(exception).__name__
+            raise
+        finally:
+            _active_operation.reset(token)
+
+            if emit:
+                self.emit(PhaseEvent(
+                    operation=name,
+                    phase="total",
+                    key=key,
+                    started_at=timer.started_at,
+                    duration=timer.elapsed(),
+                    bytes=timer.bytes,
+                    retries=timer.retries,
+                    error=error
+                ))
+
+    @contextmanager
+    def phase(self, name: str, total: int = None, operation: str = None, key: str = None) -> Iterator[PhaseTimer | None]:
+        """Description: Times a phase of the running operation and emits its event. Bytes and retries recorded while the phase runs are added to it and to the operation.\n
+        Parameters:\n
+        - name: the phase name, see `PHASES`\n
+        - total [Optional]: the number of bytes the phase is expected to transfer, passed to the progress callback\n
+        - operation, key [Optional]: the operation the phase belongs to, by default the running operation\n
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        owner = _active_operation.get()
+
+        timer = PhaseTimer(
+            self,
+            name,
+            operation or (owner.operation if owner else None),
+            key or (owner.key if owner else None),
+            total
+        )
+        token = _active_phase.set(timer)
+        error = None
+
+        try:
+            yield timer
+        except GeneratorExit:
+            # a generator closed before its end, like a chunk iterator the caller stopped reading
+            raise
+        except BaseException as exception:
+            error = str(exception) or type(exception).__name__
+            raise
+        finally:
+            _active_phase.reset(token)
+
+            if owner is not None:
+                owner.add_phase(timer)
+
+            if timer.bytes:
+                self.report_progress(timer)
+
+            self.emit(PhaseEvent(
+                operation=timer.operation,
+                phase=name,
+                key=timer.key,
+                started_at=timer.started_at,
+                duration=timer.elapsed(),
+                bytes=timer.bytes,
+                retries=timer.retries,
+                error=error
+            ))
+
+
+def traced(operation: str, key: str = None) -> Callable:
+    """Description: Decorates a client function, sync or async, so its calls are timed as an operation of the client `instrumentation`.\n
+    Parameters:\n
+    - operation: the operation name\n
+    - key [Optional]: the name of the argument identifying the file, like "catalog_file_id"\n
+    """
+
+    def decorate(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+
+        def key_of(args: tuple, kwargs: dict) -> str | None:
+            if key is None:
+                return None
+
+            value = signature.bind_partial(*args, **kwargs).arguments.get(key)
+
+            return None if value is None else str(value)
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(self, *args, **kwargs):
+                if not self.instrumentation.enabled:
+                    return await function(self, *args, **kwargs)
+
+                with self.instrumentation.operation(operation, key_of((self, *args), kwargs)):
+                    return await function(self, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if not self.instrumentation.enabled:
+                return function(self, *args, **kwargs)
+
+            with self.instrumentation.operation(operation, key_of((self, *args), kwargs)):
+                return function(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def format_bytes(size: float) -> str:
+    """Formats a number of bytes as KB, MB or GB"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.2f} {unit}"
+        size /= 1024
+
+
+class LoggingExporter:
+    """Description: Exporter writing every event as a log line.\n
+    Parameters:\n
+    - logger [Optional]: the logger used, by default the "lakehouse.metrics" logger\n
+    - level [Optional, default DEBUG]: the level of the phase events, `total` events and errors are logged at INFO and WARNING\n
+    """
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.DEBUG) -> None:
+        self.logger = logger or logging.getLogger("lakehouse.metrics")
+        self.level = level
+
+    def __call__(self, event: PhaseEvent) -> None:
+        level = logging.WARNING if event.error else logging.INFO if event.phase == "total" else self.level
+
+        if not self.logger.isEnabledFor(level):
+            return
+
+        message = f"{event.operation or '-'} {event.phase}{f' {event.key}' if event.key else ''}: {event.duration * 1000:.1f} ms"
+
+        if event.bytes:
+            message += f", {format_bytes(event.bytes)} at {format_bytes(event.throughput or 0)}/s"
+        if event.retries:
+            message += f", {event.retries} retries"
+        if event.error:
+            message += f", failed: {event.error}"
+
+        self.logger.log(level, message)
+
+
+class InMemoryRecorder:
+    """Description: Exporter keeping the most recent events in memory, for tests, notebooks and ad hoc diagnosis.\n
+    Parameters:\n
+    - max_events [Optional, default 10000]: the number of events kept, older events are dropped\n
+    """
+
+    def __init__(self, max_events: int = 10000) -> None:
+        self.__events = deque(maxlen=max_events)
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: PhaseEvent) -> None:
+        with self.__lock:
+            self.__events.append(event)
+
+    @property
+    def events(self) -> list[PhaseEvent]:
+        with self.__lock:
+            return list(self.__events)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__events.clear()
+
+    def summary(self) -> list[dict]:
+        """Returns one row per operation and phase with the number of events, the total, mean and max durations in seconds, the bytes, the throughput in bytes per second, the retries and the errors"""
+        groups = {}
+
+        for event in self.events:
+            group = groups.setdefault((event.operation, event.phase), {
+                "operation": event.operation,
+                "phase": event.phase,
+                "count": 0,
+                "seconds_total": 0.0,
+                "seconds_max": 0.0,
+                "bytes": 0,
+                "retries": 0,
+                "errors": 0
+            })
+
+            group["count"] += 1
+            group["seconds_total"] += event.duration
+            group["seconds_max"] = max(group["seconds_max"], event.duration)
+            group["bytes"] += event.bytes
+            group["retries"] += event.retries
+            group["errors"] += event.error is not None
+
+        for group in groups.values():
+            group["seconds_mean"] = group["seconds_total"] / group["count"]
+            group["throughput"] = group["bytes"] / group["seconds_total"] if group["bytes"] and group["seconds_total"] > 0 else None
+
+        return list(groups.values())
+
+
+class PrometheusRegistry:
+    """Description: Exporter aggregating the events into Prometheus metrics, rendered in the text exposition format by `render()` for a /metrics endpoint or a push gateway.\n
+    Metrics: `<namespace>_phase_duration_seconds` (histogram), `<namespace>_transferred_bytes_total`, `<namespace>_retries_total` and `<namespace>_errors_total`, labeled by operation and phase.\n
+    Parameters:\n
+    - namespace [Optional, default "lakehouse"]: the prefix of the metric names\n
+    - buckets [Optional]: the upper bounds in seconds of the duration histogram buckets\n
+    """
+
+    def __init__(self, namespace: str = "lakehouse", buckets: tuple[float, ...] = HISTOGRAM_BUCKETS) -> None:
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+
+        self.__series = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: PhaseEvent) -> None:
+        with self.__lock:
+            series = self.__series.get((event.operation, event.phase))
+
+            if series is None:
+                series = self.__series[(event.operation, event.phase)] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                    "bytes": 0,
+                    "retries": 0,
+                    "errors": 0
+                }
+
+            index = bisect.bisect_left(self.buckets, event.duration)
+            if index < len(self.buckets):
+                series["buckets"][index] += 1
+
+            series["sum"] += event.duration
+            series["count"] += 1
+            series["bytes"] += event.bytes
+            series["retries"] += event.retries
+            series["errors"] += event.error is not None
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format"""
+        name = self.namespace
+
+        with self.__lock:
+            series = {labels: {**values, "buckets": list(values["buckets"])} for labels, values in self.__series.items()}
+
+        lines = [
+            f"# HELP {name}_phase_duration_seconds Duration of the client operation phases",
+            f"# TYPE {name}_phase_duration_seconds histogram"
+        ]
+
+        for (operation, phase), values in series.items():
+            labels = f'operation="{operation or ""}",phase="{phase}"'
+            cumulative = 0
+
+            for bound, count in zip(self.buckets, values["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_phase_duration_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+
+            lines.append(f'{name}_phase_duration_seconds_bucket{{{labels},le="+Inf"}} {values["count"]}')
+            lines.append(f"{name}_phase_duration_seconds_sum{{{labels}}} {values['sum']:.6f}")
+            lines.append(f"{name}_phase_duration_seconds_count{{{labels}}} {values['count']}")
+
+        for metric, key, description in (
+            ("transferred_bytes_total", "bytes", "Bytes sent and received"),
+            ("retries_total", "retries", "Retried requests"),
+            ("errors_total", "errors", "Failed phases")
+        ):
+            lines.append(f"# HELP {name}_{metric} {description}")
+            lines.append(f"# TYPE {name}_{metric} counter")
+
+            for (operation, phase), values in series.items():
+                lines.append(f'{name}_{metric}{{operation="{operation or ""}",phase="{phase}"}} {values[key]}')
+
+        return "\n".join(lines) + "\n"
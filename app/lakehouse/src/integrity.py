@@ -0,0 +1,105 @@
+import hashlib
+import io
+import os
+from typing import BinaryIO
+
+from .transfer import CHUNK_SIZE
+
+CHECKSUM_ALGORITHM = "sha256"
+
+
+class HashingReader(io.RawIOBase):
+    """Description: Read-only file object computing the checksum of the data read through it, so the checksum is ready once the data was sent.\n
+    Parameters:\n
+    - file: the binary file object the data is read from\n
+    - algorithm [Optional, default sha256]: any algorithm supported by hashlib\n
+    """
+
+    def __init__(self, file: BinaryIO, algorithm: str = CHECKSUM_ALGORITHM) -> None:
+        self.algorithm = algorithm
+        self.size = 0
+
+        self.__file = file
+        self.__hash = hashlib.new(algorithm)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.__file.read(size)
+        self.__hash.update(data)
+        self.size += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def hexdigest(self) -> str:
+        """Returns the checksum of the data read so far"""
+        return self.__hash.hexdigest()
+
+
+def file_checksum(file: BinaryIO, algorithm: str = CHECKSUM_ALGORITHM, chunk_size: int = CHUNK_SIZE) -> str:
+    """Description: Computes the checksum of a seekable file object from its current position to its end, then rewinds it to that position.\n
+    Parameters:\n
+    - file: a seekable binary file object\n
+    - algorithm [Optional, default sha256]: any algorithm supported by hashlib\n
+    - chunk_size [Optional, default 1 MB]: the size of the chunks read\n
+    """
+    position = file.tell()
+    checksum = hashlib.new(algorithm)
+
+    while chunk := file.read(chunk_size):
+        checksum.update(chunk)
+
+    file.seek(position)
+
+    return checksum.hexdigest()
+
+
+def checksum_metadata(checksum: str, algorithm: str = CHECKSUM_ALGORITHM) -> dict:
+    """Returns the catalog metadata properties recording a checksum"""
+    return {"checksum": checksum, "checksum_algorithm": algorithm}
+
+
+def record_checksum(catalog_item: dict) -> tuple[str, str] | None:
+    """Returns the checksum and algorithm recorded in a catalog record metadata, or None if the record has no checksum"""
+    metadata = catalog_item.get("metadata")
+
+    if not isinstance(metadata, dict) or not metadata.get("checksum"):
+        return None
+
+    return metadata["checksum"], metadata.get("checksum_algorithm", CHECKSUM_ALGORITHM)
+
+
+def verify_file(path: str, catalog_item: dict) -> None:
+    """Description: Checks a downloaded file against the checksum recorded in its catalog record. Files whose record has no checksum are not checked.\n
+    Parameters:\n
+    - path: the local path of the downloaded file\n
+    - catalog_item: the catalog record of the file\n
+    """
+    with open(path, "rb") as file:
+        verify_stream(file, catalog_item, os.path.basename(path))
+
+
+def verify_stream(file: BinaryIO, catalog_item: dict, name: str = None) -> None:
+    """Description: Checks an open binary file against the checksum recorded in its catalog record, from its start. The file is left at its start.\n
+    Parameters:\n
+    - file: a seekable binary file object, such as a cached object\n
+    - catalog_item: the catalog record of the file\n
+    - name [Optional]: the name used in the error message when the record has no file name\n
+    """
+    recorded = record_checksum(catalog_item)
+
+    if recorded is None:
+        return
+
+    checksum, algorithm = recorded
+
+    file.seek(0)
+    actual = file_checksum(file, algorithm)
+
+    if actual != checksum:
+        raise Exception(f"Checksum mismatch for {catalog_item.get('file_name') or name}: expected {algorithm} {checksum}, got {actual}")
@@ -0,0 +1,182 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, get_args
+
+from .types import CatalogTypes, FilterOperators
+
+# record keys stored as indexed columns, other keys are read from the stored json record
+MIRROR_INDEXED_KEYS = ("file_name", "collection_name", "inserted_at", "processing_level", "inserted_by")
+
+KEY_PATTERN = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def coerce_value(value: str) -> int | float | str:
+    """Converts a query string value to the number or boolean it represents, booleans are stored as 0 and 1"""
+    if value.lower() in ("true", "false"):
+        return int(value.lower() == "true")
+
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            continue
+
+    return value
+
+
+class CatalogMirror:
+    """Description: Local copy of the catalog records kept in SQLite, so catalog searches can be answered without a round trip.\n
+    The most searched keys are stored as indexed columns. The mirror is refreshed with `LakehouseClient.sync_catalog_mirror()`, which only fetches the records
+    inserted since the newest mirrored one. Records changed or deleted after being mirrored are refreshed by a full sync.\n
+    Parameters:\n
+    - path [Optional, default in memory]: the SQLite database file, set it to keep the mirror between runs\n
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__lock = threading.Lock()
+
+        columns = ", ".join(MIRROR_INDEXED_KEYS)
+
+        with self.__lock:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+
+            for catalog_type in get_args(CatalogTypes):
+                self.__connection.execute(f"CREATE TABLE IF NOT EXISTS {catalog_type} (id TEXT PRIMARY KEY, {columns}, record TEXT NOT NULL)")
+
+                for key in MIRROR_INDEXED_KEYS:
+                    self.__connection.execute(f"CREATE INDEX IF NOT EXISTS {catalog_type}_{key} ON {catalog_type} ({key})")
+
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS sync_state (catalog_type TEXT PRIMARY KEY, synced_at REAL NOT NULL)")
+
+    def __table(self, catalog_type: str) -> str:
+        if catalog_type not in get_args(CatalogTypes):
+            raise Exception(f"Invalid catalog type: {catalog_type!r}. Expected one of {list(get_args(CatalogTypes))}")
+
+        return catalog_type
+
+    def __write(self, catalog_type: str, records: Iterable[dict], replace: bool) -> int:
+        table = self.__table(catalog_type)
+
+        placeholders = ", ".join("?" for _ in range(len(MIRROR_INDEXED_KEYS) + 2))
+        updates = ", ".join(f"{key} = excluded.{key}" for key in MIRROR_INDEXED_KEYS + ("record",))
+
+        rows = [
+            (record["id"], *[record.get(key) for key in MIRROR_INDEXED_KEYS], json.dumps(record))
+            for record in records
+        ]
+
+        with self.__lock:
+            self.__connection.execute("BEGIN")
+            try:
+                if replace:
+                    self.__connection.execute(f"DELETE FROM {table}")
+
+                self.__connection.executemany(
+                    f"INSERT INTO {table} (id, {', '.join(MIRROR_INDEXED_KEYS)}, record) VALUES ({placeholders}) ON CONFLICT(id) DO UPDATE SET {updates}",
+                    rows
+                )
+                self.__connection.execute(
+                    "INSERT INTO sync_state (catalog_type, synced_at) VALUES (?, ?) ON CONFLICT(catalog_type) DO UPDATE SET synced_at = excluded.synced_at",
+                    (catalog_type, time.time())
+                )
+                self.__connection.execute("COMMIT")
+            except BaseException:
+                self.__connection.execute("ROLLBACK")
+                raise
+
+        return len(rows)
+
+    def replace(self, catalog_type: CatalogTypes, records: Iterable[dict]) -> int:
+        """Description: Replaces every mirrored record of a catalog. It returns the number of records stored.\n
+        Parameters:\n
+        - catalog_type: "files" or "collections"\n
+        - records: the full listing of the catalog\n
+        """
+        return self.__write(catalog_type, records, replace=True)
+
+    def upsert(self, catalog_type: CatalogTypes, records: Iterable[dict]) -> int:
+        """Description: Adds records to the mirror, replacing the mirrored records with the same id. It returns the number of records stored.\n
+        Parameters:\n
+        - catalog_type: "files" or "collections"\n
+        - records: the new or updated records\n
+        """
+        return self.__write(catalog_type, records, replace=False)
+
+    def watermark(self, catalog_type: CatalogTypes) -> int | float | None:
+        """Returns the newest 'inserted_at' value of the mirrored records, or None if the catalog was never synced"""
+        table = self.__table(catalog_type)
+
+        with self.__lock:
+            if self.__connection.execute("SELECT 1 FROM sync_state WHERE catalog_type = ?", (catalog_type,)).fetchone() is None:
+                return None
+
+            (watermark,) = self.__connection.execute(f"SELECT MAX(inserted_at) FROM {table}").fetchone()
+
+        return watermark if watermark is not None else 0
+
+    def synced_at(self, catalog_type: CatalogTypes) -> float | None:
+        """Returns the unix time of the last sync of a catalog, or None if it was never synced"""
+        with self.__lock:
+            row = self.__connection.execute("SELECT synced_at FROM sync_state WHERE catalog_type = ?", (self.__table(catalog_type),)).fetchone()
+
+        return row[0] if row else None
+
+    def count(self, catalog_type: CatalogTypes) -> int:
+        """Returns the number of mirrored records of a catalog"""
+        table = self.__table(catalog_type)
+
+        with self.__lock:
+            return self.__connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def search(self, catalog_type: CatalogTypes, parsed_args: list[tuple]) -> list[dict]:
+        """Description: Evaluates a catalog search against the mirrored records. It returns the matching records in the order they were mirrored.\n
+        Values are compared as numbers when the query value is a number and "True" and "False" match boolean values, the wildcard operator "*" is a case sensitive substring match.\n
+        Parameters:\n
+        - catalog_type: "files" or "collections"\n
+        - parsed_args: the (key, operator, value) tuples of the search, see `parse_query_args()`\n
+        """
+        table = self.__table(catalog_type)
+
+        conditions = []
+        params = []
+
+        for (key, op, value) in parsed_args:
+            if not KEY_PATTERN.match(key):
+                raise ValueError(f"Invalid key: {key!r}")
+            if op not in get_args(FilterOperators):
+                raise ValueError(f"Invalid operator: {op!r}")
+
+            column = key if key in MIRROR_INDEXED_KEYS or key == "id" else f"json_extract(record, '$.{key}')"
+
+            if op == "*":
+                conditions.append(f"instr(CAST({column} AS TEXT), ?) > 0")
+                params.append(value)
+            elif op == "=":
+                # a value like "2024" matches both the number and the text, keeping the indexes usable
+                conditions.append(f"{column} IN (?, ?)")
+                params.extend([coerce_value(value), value])
+            elif op == "!=":
+                # like the server, records without the key are different from any value
+                conditions.append(f"({column} IS NULL OR {column} NOT IN (?, ?))")
+                params.extend([coerce_value(value), value])
+            else:
+                conditions.append(f"{column} {op} ?")
+                params.append(coerce_value(value))
+
+        where = " AND ".join(conditions) if conditions else "1"
+
+        with self.__lock:
+            rows = self.__connection.execute(f"SELECT record FROM {table} WHERE {where} ORDER BY rowid", params).fetchall()
+
+        return [json.loads(record) for (record,) in rows]
+
+    def close(self) -> None:
+        """Closes the SQLite database"""
+        with self.__lock:
+            self.__connection.close()
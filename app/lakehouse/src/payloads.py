@@ -0,0 +1,286 @@
+from typing import BinaryIO, Iterable
+
+from .types import Storage
+from .transfer import PART_SIZE, UPLOAD_CHUNK_SIZE, ChunkReader, as_reader, count_parts
+from .tuning import AdaptiveTuner
+from .readers import DATAFRAME_FORMATS
+from .query import search_payload
+from .compression import TransferCodec, compress_chunks, select_codec
+from .integrity import CHECKSUM_ALGORITHM, HashingReader, checksum_metadata, record_checksum
+import io
+
+
+def request_headers(access_token: str, method: str) -> dict:
+    """Returns the headers of an API request, requests with a body are sent as json"""
+    headers = {
+        "Authorization": f"Bearer {access_token}"
+    }
+
+    if method.lower() != "get":
+        headers["Content-Type"] = "application/json"
+
+    return headers
+
+
+def error_detail(response) -> str:
+    """Returns the error detail of a failed API response, the 'detail' property of json errors or the response text"""
+    try:
+        return response.json().get("detail", response.text)
+    except ValueError:
+        return response.text or "No error details provided"
+
+
+def collection_payload(
+    storage_type: Storage,
+    collection_name: str,
+    bucket_name: str,
+    collection_description: str = None,
+    public: bool = False,
+    secret: bool = False
+) -> dict:
+    """Builds the body of a collection creation request, hdfs collections keep the namenode address in `bucket_name`"""
+    payload = {
+        "storage_type": storage_type,
+        "collection_name": collection_name,
+        "public": public,
+        "secret": secret
+    }
+
+    if collection_description:
+        payload["collection_description"] = collection_description
+
+    if storage_type == 'hdfs':
+        payload["namenode_address"] = bucket_name
+    elif bucket_name:
+        payload["bucket_name"] = bucket_name
+
+    return payload
+
+
+def upload_request_payload(
+    collection_catalog_id: str,
+    file_name: str,
+    file_category: str,
+    file_version: int,
+    file_size: int | None,
+    public: bool,
+    processing_level: str,
+    file_description: str = None,
+    metadata: dict = None,
+    part_size: int = None,
+    part_count: int = None
+) -> dict:
+    """Description: Builds the body of an upload request.\n
+    Parameters:\n
+    - collection_catalog_id, file_name, file_category, file_version, file_size, public, processing_level, file_description: the properties of the new catalog record\n
+    - metadata [Optional]: the extra properties stored with the catalog record\n
+    - part_size, part_count [Optional]: request part urls for a multipart upload\n
+    """
+    payload = {
+        "collection_catalog_id": collection_catalog_id,
+        "file_name": file_name,
+        "file_category": file_category,
+        "file_version": file_version,
+        "file_size": file_size or 0,
+        "public": public,
+        "processing_level": processing_level,
+        "file_description": file_description
+    }
+
+    if metadata:
+        payload["metadata"] = metadata
+
+    if part_count:
+        payload["part_size"] = part_size
+        payload["part_count"] = part_count
+
+    return payload
+
+
+def finalize_payload(metadata: dict, finalize_metadata: dict, file_size: int = None, parts: list[dict] = None) -> dict:
+    """Description: Builds the body of the request marking an uploaded file as ready.\n
+    Parameters:\n
+    - metadata: the metadata sent with the upload request\n
+    - finalize_metadata: the metadata only known once the data was sent, like its checksum\n
+    - file_size [Optional]: the size of data whose size was unknown when the upload started\n
+    - parts [Optional]: the parts of a multipart upload\n
+    """
+    payload = {"status": "ready"}
+
+    if parts:
+        payload["parts"] = parts
+
+    if file_size is not None:
+        payload["file_size"] = file_size
+
+    if finalize_metadata:
+        payload["metadata"] = {**metadata, **finalize_metadata}
+
+    return payload
+
+
+def dataframe_upload(df_name: str, file_format: str, compression: str = None) -> tuple[str, dict]:
+    """Description: Returns the file name and the catalog metadata of a dataframe upload, the codec defaults to snappy for parquet and lz4 for feather.\n
+    Parameters:\n
+    - df_name: the dataframe name, without the extension\n
+    - file_format: "parquet", "feather" or "csv"\n
+    - compression [Optional]: the codec the dataframe is written with\n
+    """
+    if file_format not in DATAFRAME_FORMATS:
+        raise Exception(f"Unsupported dataframe format: {file_format!r}. Expected one of {list(DATAFRAME_FORMATS)}")
+
+    metadata = {"file_format": file_format}
+
+    if file_format != "csv":
+        metadata["compression"] = compression or ("snappy" if file_format == "parquet" else "lz4")
+
+    return f"{df_name}{DATAFRAME_FORMATS[file_format]}", metadata
+
+
+class UploadPlan:
+    """Description: Plans the requests of an upload without sending them, so the sync and async clients only send the requests and the data.
+    Send the request of `identical_file_request()` when deduplicating, then the request of `upload_request()`, pass its response to `receive()`, send the data and finish with the request of `finalize_request()`.\n
+    Parameters:\n
+    - data: the content of the file, as bytes, a binary file object or an iterator of byte chunks\n
+    - final_file_name, collection_catalog_id, file_category, file_description, file_version, public, processing_level, metadata: the properties of the new catalog record\n
+    - file_size [Optional]: the size of the data in bytes, by default taken from bytes and seekable file objects\n
+    - multipart [Optional, default False]: requests part urls, only when the size is known and the data is not compressed\n
+    - part_size [Optional]: the size of each part, by default chosen by the tuner\n
+    - deduplicate [Optional, default False]: the checksum is computed before the upload, see `set_checksum()`\n
+    - transfer_compression [Optional]: the codec compressing text files while they are sent, see `select_codec()`\n
+    - tuner [Optional]: the client tuner choosing the part size\n
+    """
+
+    def __init__(
+        self,
+        data: bytes | BinaryIO | Iterable[bytes],
+        final_file_name: str,
+        collection_catalog_id: str,
+        file_category: str = "unstructured",
+        file_description: str = None,
+        file_version: int = 1,
+        file_size: int = None,
+        public: bool = False,
+        processing_level: str = "raw",
+        metadata: dict = None,
+        multipart: bool = False,
+        part_size: int = None,
+        deduplicate: bool = False,
+        transfer_compression: TransferCodec = None,
+        tuner: AdaptiveTuner = None
+    ) -> None:
+        self.final_file_name = final_file_name
+        self.collection_catalog_id = collection_catalog_id
+        self.file_category = file_category
+        self.file_description = file_description
+        self.file_version = file_version
+        self.public = public
+        self.processing_level = processing_level
+        self.deduplicate = deduplicate
+
+        self.file, detected_size = as_reader(data)
+        self.file_size = detected_size if file_size is None else file_size
+        self.metadata = dict(metadata or {})
+        self.codec = select_codec(final_file_name, transfer_compression)
+
+        if self.codec:
+            self.metadata["transfer_compression"] = self.codec
+
+        if deduplicate:
+            if not (hasattr(self.file, "seekable") and self.file.seekable()):
+                raise Exception("Deduplication requires bytes or a seekable file object")
+        else:
+            self.file = HashingReader(self.file)
+
+        # the compressed size is unknown until the data was sent, so compressed uploads are serial
+        self.multipart = multipart and self.file_size is not None and not self.codec
+        self.part_size = part_size
+
+        if self.multipart and not part_size:
+            self.part_size = tuner.part_size(self.file_size, "upload") if tuner else PART_SIZE
+
+        self.upload_url = None
+        self.catalog_record_id = None
+        self.method = None
+        self.part_method = None
+        self.part_urls = None
+
+    def set_checksum(self, checksum: str) -> None:
+        """Records the checksum of a deduplicated upload, computed by the caller with `file_checksum()` before the data is sent"""
+        self.metadata.update(checksum_metadata(checksum))
+
+    def identical_file_request(self) -> dict:
+        """Returns the request searching the collection for files with the same name, see `identical_file()`"""
+        parsed_args = [("collection_id", "=", self.collection_catalog_id), ("file_name", "=", self.final_file_name)]
+
+        return {"method": "POST", "endpoint": "/catalog/files/search", "json": search_payload(parsed_args)}
+
+    def identical_file(self, response: dict) -> dict | None:
+        """Returns the record of the search response holding the same data, or None"""
+        for record in response.get("records", []):
+            # records of interrupted uploads have a checksum but no data
+            if record_checksum(record) == (self.metadata["checksum"], CHECKSUM_ALGORITHM) and record.get("status", "ready") == "ready":
+                return record
+
+        return None
+
+    def upload_request(self) -> dict:
+        """Returns the request creating the catalog record and the signed urls the data is sent to"""
+        payload = upload_request_payload(
+            collection_catalog_id=self.collection_catalog_id,
+            file_name=self.final_file_name,
+            file_category=self.file_category,
+            file_version=self.file_version,
+            file_size=self.file_size,
+            public=self.public,
+            processing_level=self.processing_level,
+            file_description=self.file_description,
+            metadata=self.metadata,
+            part_size=self.part_size,
+            part_count=count_parts(self.file_size, self.part_size) if self.multipart else None
+        )
+
+        return {"method": "POST", "endpoint": "/storage/files/upload-request", "json": payload}
+
+    def receive(self, response: dict) -> None:
+        """Reads the signed urls and the http methods of the response to `upload_request()`, `part_urls` is only set for multipart uploads"""
+        method = str(response["method"])
+
+        self.upload_url = response["upload_url"]
+        self.catalog_record_id = response["catalog_record_id"]
+        self.method = "PUT" if method.lower() == "put" else "POST"
+        self.part_method = method.upper()
+
+        if self.multipart:
+            self.part_urls = response.get("part_urls")
+
+    def body(self) -> BinaryIO:
+        """Returns the file object the data of a serial upload is read from, compressed when a codec was selected"""
+        if not self.codec:
+            return self.file
+
+        return io.BufferedReader(ChunkReader(compress_chunks(iter(lambda: self.file.read(UPLOAD_CHUNK_SIZE), b""), self.codec)), buffer_size=UPLOAD_CHUNK_SIZE)
+
+    def finalize_request(self, bytes_sent: int = None, parts: list[dict] = None) -> dict:
+        """Description: Returns the request marking the uploaded file as ready.\n
+        Parameters:\n
+        - bytes_sent [Optional]: the number of bytes sent by a serial upload\n
+        - parts [Optional]: the parts of a multipart upload\n
+        """
+        sent_size = None
+
+        if self.file_size is None:
+            sent_size = self.file.size if self.codec else bytes_sent
+
+        # the checksum and compressed size are only known once the data was read, like the size of streams
+        finalize_metadata = {}
+
+        if not self.deduplicate:
+            finalize_metadata.update(checksum_metadata(self.file.hexdigest()))
+
+        if self.codec:
+            finalize_metadata["compressed_size"] = bytes_sent
+
+        payload = finalize_payload(self.metadata, finalize_metadata, file_size=sent_size, parts=parts)
+
+        return {"method": "PUT", "endpoint": f"/catalog/set-file-status/{self.catalog_record_id}", "json": payload}
@@ -0,0 +1,209 @@
+import re
+
+from .types import CatalogFilter, CatalogFilterPayload, ProcessingLevel
+
+QUERY_ARG_PATTERN = re.compile(r"^\s*([a-zA-Z_][a-zA-Z0-9_]+)\s*(=|!=|>=|<=|>|<|\*)\s*(.+?)\s*$")
+
+PAGE_SIZE = 1000
+
+# response keys that show the server honored the pagination parameters
+PAGINATION_KEYS = ("next_cursor", "has_more", "total", "offset")
+
+
+def parse_query_args(args: list[str]) -> list[tuple]:
+    """Description: Parses the query strings of the search functions. It returns a list of (key, operator, value) tuples.\n
+    Parameters:\n
+    - args: query strings shaped as KEY[OPERATOR]VALUE, where the operator is one of "=", "!=", ">", "<", ">=", "<=" or the wildcard "*" (substring match)\n
+    """
+
+    parsed_args = []
+
+    for arg in args:
+        if not isinstance(arg, str):
+            raise TypeError(f"Arguments must be a string, got: {type(arg).__name__}")
+
+        match = QUERY_ARG_PATTERN.match(arg)
+        if not match:
+            raise ValueError(f"Invalid format: {arg!r}. Expected format: (KEY)(OPERATOR)(VALUE). Ex: 'collection_name=lakehouse'")
+
+        key, op, value = match.groups()
+        parsed_args.append((key, op, value))
+
+    return parsed_args
+
+
+def search_payload(parsed_args: list[tuple]) -> dict:
+    """Builds the body of a catalog search request from parsed query arguments, see `parse_query_args()`"""
+    filters = [
+        CatalogFilter(
+            property_name=key,
+            operator=op,
+            property_value=value
+        )
+        for (key, op, value) in parsed_args
+    ]
+
+    try:
+        payload = CatalogFilterPayload(filters=filters)
+    except Exception:
+        raise Exception("Incorrect filter format!")
+
+    return payload.model_dump(exclude_none=True)
+
+
+def included_levels(include_raw: bool = True, include_processed: bool = True, include_curated: bool = True) -> list[str]:
+    """Returns the processing levels selected by the include flags of the listing functions"""
+    flags = [include_raw, include_processed, include_curated]
+
+    return [level for (level, included) in zip(ProcessingLevel, flags) if included]
+
+
+def first_page(page_size: int) -> dict:
+    """Returns the query parameters requesting the first page of a catalog listing"""
+    return {"limit": page_size, "offset": 0}
+
+
+def next_page(response: dict, params: dict, page_size: int) -> tuple[list[dict], dict | None]:
+    """Description: Reads one page of a catalog listing. It returns the records of the page and the query parameters of the next page, or None when the listing is complete.\n
+    Parameters:\n
+    - response: the response to the page request\n
+    - params: the query parameters of the page request, see `first_page()`\n
+    - page_size: the number of records requested per page\n
+    """
+
+    records = response.get("records", [])
+
+    # servers without pagination return the whole catalog at once
+    if not any(key in response for key in PAGINATION_KEYS) or len(records) > page_size:
+        return records, None
+
+    if "next_cursor" in response:
+        return records, {"limit": page_size, "cursor": response["next_cursor"]} if response["next_cursor"] else None
+
+    params = {"limit": page_size, "offset": params.get("offset", 0) + len(records)}
+
+    if not records or response.get("has_more") is False or len(records) < page_size:
+        return records, None
+    if "total" in response and params["offset"] >= response["total"]:
+        return records, None
+
+    return records, params
+
+
+def is_cut_short(response: dict, page_size: int) -> bool:
+    """Returns True if a search response may only hold part of the records found, because the server ignored the paging parameters and returned at least a full page"""
+    return not any(key in response for key in PAGINATION_KEYS) and len(response.get("records", [])) >= page_size
+
+
+def is_sorted(records: list[dict], sort_by_key: str, sort_desc: bool = False) -> bool:
+    """Returns True if the records are already ordered by the given key"""
+    if sort_desc:
+        return all(a[sort_by_key] >= b[sort_by_key] for a, b in zip(records, records[1:]))
+
+    return all(a[sort_by_key] <= b[sort_by_key] for a, b in zip(records, records[1:]))
+
+
+class FileListing:
+    """Description: Plans the requests of a file listing and filters and truncates the records they return, without sending them, so the sync and async clients share it.
+    Send the request of `next_request()` and pass its response to `receive()` until `next_request()` returns None.\n
+    - level filters are evaluated by the server with paged searches. Servers that do not page searches are listed with the paged `/catalog/files/all/` listing instead, and the levels are filtered on the client\n
+    - the limit only cuts the listing short when no sorting is asked, or when the server confirmed it sorted the records by echoing `sort_by` in its response. Otherwise every record is fetched and the caller sorts and truncates them, see `order_records()`\n
+    Parameters:\n
+    - levels: the processing levels to include, see `included_levels()`\n
+    - page_size [Optional, default 1000]: the number of records requested per page\n
+    - sort_by_key [Optional]: the record key the server should sort by\n
+    - sort_desc [Optional, default False]: whether the server should sort in descending order\n
+    - limit [Optional]: the maximum number of records needed\n
+    """
+
+    def __init__(self, levels: list[str], page_size: int = PAGE_SIZE, sort_by_key: str = None, sort_desc: bool = False, limit: int = None) -> None:
+        self.levels = levels
+        self.page_size = page_size
+        self.sort_by_key = sort_by_key
+        self.sort_desc = sort_desc
+
+        self.__filters = level_filters(levels)
+        self.__search = bool(self.__filters)
+        self.__remaining = limit
+        # records arrive in the requested order, so the first ones found are the ones kept
+        self.__ordered = not sort_by_key
+        self.__done = not levels or limit == 0
+        self.__params = first_page(self.__page_limit())
+
+    def __page_limit(self) -> int:
+        if self.__ordered and self.__remaining is not None:
+            return min(self.page_size, self.__remaining)
+
+        return self.page_size
+
+    def next_request(self) -> dict | None:
+        """Returns the keyword arguments of the next request (method, endpoint and params or json), or None when the listing is complete"""
+        if self.__done:
+            return None
+
+        if not self.__search:
+            return {"method": "GET", "endpoint": "/catalog/files/all/", "params": self.__params}
+
+        payload = CatalogFilterPayload(filters=self.__filters, sort_by=self.sort_by_key, sort_desc=self.sort_desc if self.sort_by_key else None, **self.__params)
+
+        return {"method": "POST", "endpoint": "/catalog/files/search", "json": payload.model_dump(exclude_none=True)}
+
+    def receive(self, response: dict) -> list[dict]:
+        """Reads the response to the last request and returns the records of the listing it holds"""
+        requested = self.__params["limit"]
+
+        records, params = next_page(response, self.__params, requested)
+
+        if self.__search:
+            if is_cut_short(response, requested):
+                # the server does not page searches, so this may not be every record found
+                self.__search = False
+                self.__params = first_page(self.__page_limit())
+                return []
+
+            if self.sort_by_key and response.get("sort_by") == self.sort_by_key and bool(response.get("sort_desc")) == bool(self.sort_desc):
+                self.__ordered = True
+        else:
+            records = [record for record in records if record.get("processing_level") in self.levels] if self.__filters else records
+
+        if self.__ordered and self.__remaining is not None:
+            records = records[:self.__remaining]
+            self.__remaining -= len(records)
+
+        if params is None or self.__remaining == 0:
+            self.__done = True
+        else:
+            self.__params = {**params, "limit": self.__page_limit()}
+
+        return records
+
+
+def level_filters(levels: list[str]) -> list[CatalogFilter]:
+    """Returns the search filters selecting the given processing levels, or an empty list when every level is included"""
+    excluded = [level for level in ProcessingLevel if level not in levels]
+
+    if not excluded:
+        return []
+
+    if len(levels) == 1:
+        return [CatalogFilter(property_name="processing_level", operator="=", property_value=levels[0])]
+
+    return [CatalogFilter(property_name="processing_level", operator="!=", property_value=level) for level in excluded]
+
+
+def order_records(records: list[dict], sort_by_key: str = None, sort_desc: bool = False, limit: int = None) -> list[dict]:
+    """Description: Applies on the client the sorting and limit the server may have ignored.\n
+    Parameters:\n
+    - records: the records returned by the server\n
+    - sort_by_key [Optional]: the record key to sort by\n
+    - sort_desc [Optional, default False]: whether to sort in descending order\n
+    - limit [Optional]: the maximum number of records to keep\n
+    """
+
+    if sort_by_key and not is_sorted(records, sort_by_key, sort_desc):
+        records = sorted(records, key=lambda item: item[sort_by_key], reverse=sort_desc)
+
+    if limit is not None:
+        records = records[:limit]
+
+    return records
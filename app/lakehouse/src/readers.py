@@ -0,0 +1,224 @@
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+# pandas and pyarrow are imported by the functions that use them, so the client imports without them
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+CSV_CHUNK_ROWS = 100000
+DATAFRAME_CHUNK_ROWS = 100000
+
+# formats parsed sequentially, which can be read while the file is still being transferred
+STREAMING_EXTENSIONS = (".csv", ".tsv", ".jsonl", ".ndjson")
+
+# file extension each dataframe upload format is stored with
+DATAFRAME_FORMATS = {
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "csv": ".csv"
+}
+
+
+FILTER_OPERATORS = {
+    "=": lambda column, value: column == value,
+    "==": lambda column, value: column == value,
+    "!=": lambda column, value: column != value,
+    "<": lambda column, value: column < value,
+    ">": lambda column, value: column > value,
+    "<=": lambda column, value: column <= value,
+    ">=": lambda column, value: column >= value,
+    "in": lambda column, value: column.isin(value),
+    "not in": lambda column, value: ~column.isin(value)
+}
+
+
+def normalize_filters(filters: list) -> list[list[tuple]]:
+    """Returns filters in disjunctive normal form: a list of alternatives, each one a list of (column, operator, value) conditions"""
+    if not filters:
+        return []
+
+    if isinstance(filters[0], tuple):
+        return [list(filters)]
+
+    return [list(conjunction) for conjunction in filters]
+
+
+def filter_columns(filters: list) -> list[str]:
+    """Returns the columns the filters refer to"""
+    return list(dict.fromkeys(column for conjunction in normalize_filters(filters) for (column, _, _) in conjunction))
+
+
+def apply_filters(df: "pd.DataFrame", filters: list) -> "pd.DataFrame":
+    """Description: Keeps the rows of a dataframe matching pyarrow style filters.\n
+    Parameters:\n
+    - df: the dataframe to be filtered\n
+    - filters: a list of (column, operator, value) tuples that must all match, or a list of such lists of which one must match. Operators are "=", "==", "!=", "<", ">", "<=", ">=", "in" and "not in"\n
+    """
+    import pandas as pd
+
+    conjunctions = normalize_filters(filters)
+
+    if not conjunctions:
+        return df
+
+    mask = pd.Series(False, index=df.index)
+
+    for conjunction in conjunctions:
+        conjunction_mask = pd.Series(True, index=df.index)
+
+        for (column, operator, value) in conjunction:
+            if operator not in FILTER_OPERATORS:
+                raise Exception(f"Invalid filter operator: {operator!r}. Expected one of {list(FILTER_OPERATORS)}")
+
+            conjunction_mask &= FILTER_OPERATORS[operator](df[column], value)
+
+        mask |= conjunction_mask
+
+    return df[mask]
+
+
+def project(df: "pd.DataFrame", columns: list[str] = None, filters: list = None) -> "pd.DataFrame":
+    """Applies the filters and keeps the requested columns of a fully loaded dataframe"""
+    if filters:
+        df = apply_filters(df, filters)
+
+    if columns is not None:
+        df = df[list(columns)]
+
+    return df
+
+
+def read_csv(file: BinaryIO, columns: list[str] = None, filters: list = None, **kwargs) -> "pd.DataFrame":
+    """Reads a delimited file decoding only the requested and filtered columns. With filters the file is read in chunks and only the matching rows are kept"""
+    import pandas as pd
+
+    usecols = None if columns is None else list(dict.fromkeys(list(columns) + filter_columns(filters)))
+
+    if not filters:
+        return pd.read_csv(file, usecols=usecols, **kwargs)
+
+    chunks = [
+        apply_filters(chunk, filters)
+        for chunk in pd.read_csv(file, usecols=usecols, chunksize=CSV_CHUNK_ROWS, **kwargs)
+    ]
+
+    if not chunks:
+        file.seek(0)
+        chunks = [pd.read_csv(file, usecols=usecols, nrows=0, **kwargs)]
+
+    df = pd.concat(chunks, ignore_index=True)
+
+    return df if columns is None else df[list(columns)]
+
+
+def read_dataframe(file: BinaryIO, file_name: str, columns: list[str] = None, filters: list = None) -> "pd.DataFrame | dict":
+    """Description: Parses a structured file into a dataframe based on its file name extension.\n
+    Files that are not CSV, XLSX, TSV, JSON, NDJSON, MD, HTML, PARQUET or FEATHER are returned as a dictionary with their text content.\n
+    Parameters:\n
+    - file: a seekable binary file object positioned at the start of the file\n
+    - file_name: the file name in the catalog, used to pick the parser\n
+    - columns [Optional]: the columns to keep, parquet, feather and csv files only decode these columns\n
+    - filters [Optional]: pyarrow style filters, see `apply_filters()`. Parquet files skip the row groups whose statistics cannot match\n
+    """
+    import pandas as pd
+
+    file_name_lower = file_name.lower()
+
+    if file_name_lower.endswith(".csv"):
+        return read_csv(file, columns, filters)
+    elif file_name_lower.endswith(".xlsx") or file_name_lower.endswith(".xls"):
+        return project(pd.read_excel(file), columns, filters)
+    elif file_name_lower.endswith(".tsv"):
+        return read_csv(file, columns, filters, sep="\t")
+    elif file_name_lower.endswith(".json"):
+        return project(pd.read_json(file), columns, filters)
+    elif file_name_lower.endswith(".jsonl") or file_name_lower.endswith(".ndjson"):
+        return project(pd.read_json(file, lines=True), columns, filters)
+    elif file_name_lower.endswith(".md"):
+        return project(pd.read_csv(file, delimiter="|", skipinitialspace=True), columns, filters)
+    elif file_name_lower.endswith(".html"):
+        df_list = pd.read_html(file)  # Returns a list of tables
+        return project(df_list[0], columns, filters) if df_list else None
+    elif file_name_lower.endswith(".parquet"):
+        return pd.read_parquet(file, engine="pyarrow", columns=columns, filters=filters or None)
+    elif file_name_lower.endswith(".feather") or file_name_lower.endswith(".arrow"):
+        feather_columns = None if columns is None else list(dict.fromkeys(list(columns) + filter_columns(filters)))
+        return project(pd.read_feather(file, columns=feather_columns), columns, filters)
+
+    return dict(
+        dataset_name=file_name,
+        content=file.read().decode("UTF-8")
+    )
+
+
+def iter_dataframe(
+    file: BinaryIO,
+    file_name: str,
+    chunksize: int = DATAFRAME_CHUNK_ROWS,
+    columns: list[str] = None,
+    as_arrow: bool = False
+) -> Iterator["pd.DataFrame | pa.RecordBatch"]:
+    """Description: Parses a structured file into dataframes of up to `chunksize` rows, yielding each one as soon as it is parsed.\n
+    Parquet files are read one batch at a time and CSV, TSV and NDJSON files are parsed sequentially, so only one chunk is in memory at once.
+    Other formats are loaded whole and then split.\n
+    Parameters:\n
+    - file: a binary file object positioned at the start of the file. Parquet and the formats that are loaded whole need a seekable file\n
+    - file_name: the file name in the catalog, used to pick the parser\n
+    - chunksize [Optional, default 100000]: the maximum number of rows of each chunk\n
+    - columns [Optional]: the columns to keep\n
+    - as_arrow [Optional, default False]: yields pyarrow record batches instead of pandas dataframes\n
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    file_name_lower = file_name.lower()
+
+    if file_name_lower.endswith(".parquet"):
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch if as_arrow else batch.to_pandas()
+        return
+
+    if file_name_lower.endswith(".csv"):
+        chunks = pd.read_csv(file, usecols=columns, chunksize=chunksize)
+    elif file_name_lower.endswith(".tsv"):
+        chunks = pd.read_csv(file, sep="\t", usecols=columns, chunksize=chunksize)
+    elif file_name_lower.endswith(".jsonl") or file_name_lower.endswith(".ndjson"):
+        chunks = (project(chunk, columns) for chunk in pd.read_json(file, lines=True, chunksize=chunksize))
+    else:
+        df = read_dataframe(file, file_name, columns=columns)
+
+        if not isinstance(df, pd.DataFrame):
+            raise Exception(f"The file {file_name} can not be read as a dataframe")
+
+        chunks = (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+
+    for chunk in chunks:
+        yield pa.RecordBatch.from_pandas(chunk, preserve_index=False) if as_arrow else chunk
+
+
+def write_dataframe(
+    df: "pd.DataFrame",
+    file: str | BinaryIO,
+    file_format: str = "parquet",
+    compression: str = None,
+    row_group_size: int = None
+) -> None:
+    """Description: Serializes a dataframe into a file.\n
+    Parameters:\n
+    - df: the dataframe to be serialized\n
+    - file: a file path or a binary file object\n
+    - file_format [Optional, default parquet]: one of "parquet", "feather" (Arrow IPC) or "csv"\n
+    - compression [Optional]: the parquet ("snappy", "zstd", "gzip", ...) or feather ("lz4", "zstd", "uncompressed") codec, by default the pyarrow default of the format. Ignored for csv, which is written without the index\n
+    - row_group_size [Optional]: the maximum number of rows in each parquet row group\n
+    """
+
+    if file_format == "parquet":
+        df.to_parquet(file, engine="pyarrow", compression=compression or "snappy", row_group_size=row_group_size)
+    elif file_format == "feather":
+        df.to_feather(file, compression=compression)
+    elif file_format == "csv":
+        # the index would come back as an "Unnamed: 0" column
+        df.to_csv(file, index=False)
+    else:
+        raise Exception(f"Unsupported dataframe format: {file_format!r}. Expected one of {list(DATAFRAME_FORMATS)}")
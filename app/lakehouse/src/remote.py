@@ -0,0 +1,220 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import requests
+
+from .transfer import CHUNK_SIZE, CONTENT_RANGE_PATTERN, SPILL_THRESHOLD, spool_response
+from .instrumentation import record_bytes
+from .transport import HTTPTransport
+
+if TYPE_CHECKING:
+    from .tuning import BandwidthLimiter
+
+REMOTE_BLOCK_SIZE = 1 * 1024 * 1024
+REMOTE_CACHE_BLOCKS = 64
+
+
+class RemoteFile(io.RawIOBase):
+    """Description: Seekable read-only file object over a signed download url. Reads are served with HTTP range requests
+    and the most recently read blocks are kept in memory, so parsers reading a few parts of a large file, like the footer
+    and some column chunks of a parquet file, only transfer those parts.\n
+    The file is opened with a request for its last block, which holds the footer of parquet files. If the server ignores
+    range requests, the whole body of that response is buffered and every read is served from it.\n
+    Parameters:\n
+    - transport: the transport used for the range requests\n
+    - url: the signed download url\n
+    - block_size [Optional, default 1 MB]: the size of the blocks fetched and cached, consecutive missing blocks are fetched in a single request\n
+    - cache_blocks [Optional, default 64]: the maximum number of blocks kept in memory\n
+    - spill_threshold [Optional, default 64 MB]: the number of bytes kept in memory when the server ignores range requests, the rest is spilled to a temporary file\n
+    - bandwidth_limiter [Optional]: the BandwidthLimiter the fetched bytes are counted against\n
+    """
+
+    def __init__(
+        self,
+        transport: HTTPTransport,
+        url: str,
+        block_size: int = REMOTE_BLOCK_SIZE,
+        cache_blocks: int = REMOTE_CACHE_BLOCKS,
+        spill_threshold: int = SPILL_THRESHOLD,
+        bandwidth_limiter: "BandwidthLimiter" = None
+    ) -> None:
+        self.url = url
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.requests_count = 0
+        self.bytes_fetched = 0
+
+        self.__transport = transport
+        self.__spill_threshold = spill_threshold
+        self.__limiter = bandwidth_limiter
+        self.__blocks = OrderedDict()
+        self.__buffer = None
+        self.__position = 0
+        self.__lock = threading.Lock()
+
+        self.size = self.__open()
+
+    @property
+    def supports_ranges(self) -> bool:
+        """False when the server ignored range requests and the file is served from a local buffer"""
+        return self.__buffer is None
+
+    def __open(self) -> int:
+        response = self.__request(f"bytes=-{self.block_size}")
+
+        with response:
+            if response.status_code == 200:
+                self.__buffer = spool_response(response, max_size=self.__spill_threshold, chunk_size=CHUNK_SIZE, limiter=self.__limiter)
+                self.bytes_fetched += self.__buffer.seek(0, os.SEEK_END)
+                return self.__buffer.tell()
+
+            # 416 is returned for ranges over empty objects
+            if response.status_code == 416:
+                return 0
+
+            if response.status_code != 206:
+                raise Exception(f"Failed to open remote file. Status Code: {response.status_code}, Error: {response.text}")
+
+            match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+
+            if not match:
+                raise Exception(f"Invalid Content-Range header: {response.headers.get('Content-Range')!r}")
+
+            start, size = int(match.group(1)), int(match.group(3))
+            data = response.content
+
+        # a short tail would be stored as a complete last block
+        if len(data) != size - start:
+            raise Exception(f"Incomplete range {start}-{size - 1}: received {len(data)} bytes")
+
+        self.__count(len(data))
+
+        # only the last block is complete, the rest of the tail belongs to a block that was partially fetched
+        last_block = (size - 1) // self.block_size
+        self.__store(last_block, data[last_block * self.block_size - start:])
+
+        return size
+
+    def __count(self, size: int) -> None:
+        self.bytes_fetched += size
+        record_bytes(size)
+
+        if self.__limiter:
+            self.__limiter.acquire(size)
+
+    def __request(self, byte_range: str) -> requests.Response:
+        self.requests_count += 1
+        return self.__transport.request("GET", self.url, stream=True, headers={"Range": byte_range})
+
+    def __store(self, index: int, block: bytes) -> None:
+        self.__blocks[index] = block
+        self.__blocks.move_to_end(index)
+
+        while len(self.__blocks) > self.cache_blocks:
+            self.__blocks.popitem(last=False)
+
+    def __fetch(self, first_block: int, last_block: int) -> list[bytes]:
+        start = first_block * self.block_size
+        end = min((last_block + 1) * self.block_size, self.size) - 1
+
+        with self.__request(f"bytes={start}-{end}") as response:
+            if response.status_code != 206:
+                raise Exception(f"Failed to read range {start}-{end}. Status Code: {response.status_code}")
+
+            data = response.content
+
+        if len(data) != end - start + 1:
+            raise Exception(f"Incomplete range {start}-{end}: received {len(data)} bytes")
+
+        self.__count(len(data))
+
+        return [data[offset:offset + self.block_size] for offset in range(0, len(data), self.block_size)]
+
+    def __read_blocks(self, first_block: int, last_block: int) -> list[bytes]:
+        blocks = {}
+        missing = []
+
+        for index in range(first_block, last_block + 1):
+            if index in self.__blocks:
+                self.__blocks.move_to_end(index)
+                blocks[index] = self.__blocks[index]
+            else:
+                missing.append(index)
+
+        # consecutive missing blocks are fetched with a single request
+        runs = []
+        for index in missing:
+            if runs and runs[-1][1] == index - 1:
+                runs[-1][1] = index
+            else:
+                runs.append([index, index])
+
+        for (first, last) in runs:
+            for index, block in enumerate(self.__fetch(first, last), start=first):
+                blocks[index] = block
+                self.__store(index, block)
+
+        return [blocks[index] for index in range(first_block, last_block + 1)]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self.__position + offset
+        elif whence == os.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+
+        self.__position = position
+
+        return position
+
+    def readinto(self, buffer) -> int:
+        with self.__lock:
+            start = self.__position
+            end = min(start + len(buffer), self.size)
+
+            if start >= end:
+                return 0
+
+            if self.__buffer is not None:
+                self.__buffer.seek(start)
+                size = self.__buffer.readinto(memoryview(buffer)[:end - start])
+                self.__position += size
+                return size
+
+            first_block = start // self.block_size
+            last_block = (end - 1) // self.block_size
+
+            data = b"".join(self.__read_blocks(first_block, last_block))
+            offset = start - first_block * self.block_size
+
+            buffer[:end - start] = data[offset:offset + end - start]
+            self.__position = end
+
+            return end - start
+
+    def readall(self) -> bytes:
+        return self.read(max(self.size - self.__position, 0))
+
+    def close(self) -> None:
+        if self.__buffer is not None:
+            self.__buffer.close()
+        self.__blocks.clear()
+        super().close()
@@ -0,0 +1,436 @@
+import contextvars
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from queue import Full, Queue
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator
+
+import requests
+
+from .compression import decompress_chunks
+from .instrumentation import record_bytes
+from .transport import HTTPTransport
+
+if TYPE_CHECKING:
+    from .tuning import AdaptiveTuner, BandwidthLimiter
+
+CHUNK_SIZE = 1 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+PART_SIZE = 16 * 1024 * 1024
+MAX_WORKERS = 4
+SPILL_THRESHOLD = 64 * 1024 * 1024
+PREFETCH_CHUNKS = 8
+
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes\s+(\d+)-(\d+)/(\d+)$")
+
+
+class ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks. Closing it closes the iterator"""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self.__chunks = iter(chunks)
+        self.__chunk = b""
+        self.__offset = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self.__offset >= len(self.__chunk):
+            try:
+                self.__chunk = memoryview(next(self.__chunks))
+            except StopIteration:
+                return 0
+            self.__offset = 0
+
+        size = min(len(buffer), len(self.__chunk) - self.__offset)
+        buffer[:size] = self.__chunk[self.__offset:self.__offset + size]
+        self.__offset += size
+
+        return size
+
+    def close(self) -> None:
+        if hasattr(self.__chunks, "close"):
+            self.__chunks.close()
+        super().close()
+
+
+def prefetch(chunks: Iterable[bytes], depth: int = PREFETCH_CHUNKS) -> Iterator[bytes]:
+    """Description: Iterates over byte chunks read ahead by a background thread, so the network transfer overlaps with the work done on each chunk.
+    At most `depth` chunks are held in memory. Closing the iterator stops the background thread.\n
+    Parameters:\n
+    - chunks: an iterator of byte chunks, like the body of a streamed response\n
+    - depth [Optional, default 8]: the maximum number of chunks read ahead\n
+    """
+    queue = Queue(maxsize=depth)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except BaseException as error:
+            put(error)
+        else:
+            put(done)
+
+    # the reader thread reports the bytes it receives to the phase of the caller
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = queue.get()
+
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def as_reader(data: bytes | BinaryIO | Iterable[bytes]) -> tuple[BinaryIO, int | None]:
+    """Description: Wraps upload data into a binary file object. It returns the file object and the number of bytes left to read, or None when it is unknown.\n
+    Parameters:\n
+    - data: bytes, a binary file object or an iterator of byte chunks\n
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return io.BytesIO(data), len(data)
+
+    if hasattr(data, "read"):
+        if hasattr(data, "seekable") and data.seekable():
+            position = data.tell()
+            size = data.seek(0, os.SEEK_END) - position
+            data.seek(position)
+            return data, size
+        return data, None
+
+    return io.BufferedReader(ChunkReader(data), buffer_size=CHUNK_SIZE), None
+
+
+def count_parts(file_size: int, part_size: int) -> int:
+    """Returns the number of parts needed to send `file_size` bytes, at least one"""
+    return max(1, -(-file_size // part_size))
+
+
+def worker_limits(max_workers: int = None, tuner: "AdaptiveTuner" = None) -> tuple[int, Callable[[], int]]:
+    """Returns the size of the worker pool of a parallel transfer and a function returning the number of parts to transfer at once, which follows the tuner unless `max_workers` is set"""
+    if max_workers or not tuner:
+        workers = max_workers or MAX_WORKERS
+        return workers, lambda: workers
+
+    return tuner.max_concurrency, lambda: tuner.concurrency
+
+
+def send_chunk(
+    transport: HTTPTransport,
+    method: str,
+    url: str,
+    chunk: bytes,
+    tuner: "AdaptiveTuner" = None,
+    limiter: "BandwidthLimiter" = None,
+    parallel: bool = False
+) -> requests.Response:
+    """Description: Sends one chunk or part of an upload and raises for error responses.\n
+    Parameters:\n
+    - transport: the transport used for the request\n
+    - method: the HTTP method of the signed url\n
+    - url: the signed url\n
+    - chunk: the bytes sent\n
+    - tuner [Optional]: the AdaptiveTuner the duration of the request is reported to\n
+    - limiter [Optional]: the BandwidthLimiter waited for before sending\n
+    - parallel [Optional, default False]: whether the chunk is one of the parts of a parallel upload\n
+    """
+    if limiter:
+        limiter.acquire(len(chunk))
+
+    started = time.perf_counter()
+
+    response = transport.request(method, url, data=chunk, headers={"Content-Type": "application/octet-stream"})
+    response.raise_for_status()
+
+    if tuner:
+        tuner.observe(len(chunk), time.perf_counter() - started, direction="upload", parallel=parallel)
+
+    record_bytes(len(chunk))
+
+    return response
+
+
+def upload_parts(
+    transport: HTTPTransport,
+    part_urls: list[str],
+    file: BinaryIO,
+    part_size: int = PART_SIZE,
+    max_workers: int = None,
+    method: str = "PUT",
+    tuner: "AdaptiveTuner" = None,
+    limiter: "BandwidthLimiter" = None
+) -> list[dict]:
+    """Description: Sends a file to its signed part urls over a bounded worker pool. It returns the list of uploaded parts.\n
+    Parts are read in order by the calling thread and at most one part per worker is held in memory at once.
+    The first failing part cancels the parts not yet sent and its error is raised.\n
+    Parameters:\n
+    - transport: the transport used for the part requests\n
+    - part_urls: one signed url per part, in part order\n
+    - file: a binary file object positioned at the start of the data\n
+    - part_size [Optional, default 16 MB]: the size of every part but the last one\n
+    - max_workers [Optional]: the number of parts sent concurrently. By default it follows the tuner, or 4 without one\n
+    - method [Optional, default PUT]: the HTTP method of the part urls\n
+    - tuner [Optional]: the AdaptiveTuner observing the parts\n
+    - limiter [Optional]: the BandwidthLimiter shared with the other transfers\n
+    """
+
+    def send_part(part_number: int, url: str, chunk: bytes) -> dict:
+        response = send_chunk(transport, method, url, chunk, tuner=tuner, limiter=limiter, parallel=True)
+        return {"part_number": part_number, "size": len(chunk), "etag": response.headers.get("ETag")}
+
+    parts = []
+    pending = set()
+
+    workers, in_flight = worker_limits(max_workers, tuner)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for part_number, url in enumerate(part_urls, start=1):
+                while len(pending) >= in_flight():
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    parts.extend(future.result() for future in done)
+
+                chunk = file.read(part_size)
+
+                if not chunk and part_number > 1:
+                    raise Exception(f"File ended before part {part_number} of {len(part_urls)}")
+
+                pending.add(executor.submit(contextvars.copy_context().run, send_part, part_number, url, chunk))
+
+            if file.read(1):
+                raise Exception(f"File is larger than the {len(part_urls)} parts granted by the server")
+
+            parts.extend(future.result() for future in wait(pending).done)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+    return sorted(parts, key=lambda part: part["part_number"])
+
+
+def output_file_names(records: dict[str, dict]) -> dict[str, str]:
+    """Returns the local file name of each catalog file of a batch download, keyed by id. Files sharing a name, like the versions of one file, get their id appended to it so they are not written to the same path"""
+    counts = Counter(record["file_name"] for record in records.values())
+    names = {}
+
+    for catalog_file_id, record in records.items():
+        name = record["file_name"]
+
+        if counts[name] > 1:
+            stem, extension = os.path.splitext(name)
+            name = f"{stem}_{catalog_file_id}{extension}"
+
+        names[catalog_file_id] = name
+
+    return names
+
+
+@contextmanager
+def atomic_output(path: str) -> Iterator[str]:
+    """Yields a temporary path next to `path`, moved over `path` once the block completes and removed if it raises, so a failed or unverified download never replaces the file"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or None, prefix=f".{os.path.basename(path)}.", suffix=".part")
+    os.close(fd)
+
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def response_chunks(response: requests.Response, chunk_size: int = CHUNK_SIZE, codec: str = None, limiter: "BandwidthLimiter" = None) -> Iterator[bytes]:
+    """Iterates over a streamed response body, decompressing it when it was uploaded with a transfer codec"""
+    chunks = counted_chunks(response.iter_content(chunk_size=chunk_size), limiter)
+
+    return decompress_chunks(chunks, codec) if codec else chunks
+
+
+def counted_chunks(chunks: Iterable[bytes], limiter: "BandwidthLimiter" = None) -> Iterator[bytes]:
+    """Iterates over byte chunks received from the network, adding their size to the active instrumentation phase and waiting for the bandwidth limiter"""
+    for chunk in chunks:
+        record_bytes(len(chunk))
+
+        # the next chunk is not read until the limiter allows it, so the sender is slowed down by flow control
+        if limiter:
+            limiter.acquire(len(chunk))
+
+        yield chunk
+
+
+def write_response(response: requests.Response, file: BinaryIO, chunk_size: int = CHUNK_SIZE, codec: str = None, limiter: "BandwidthLimiter" = None) -> int:
+    """Writes a streamed response body into an open file, decompressing it with `codec` if set. It returns the number of bytes written"""
+    written = 0
+
+    for chunk in response_chunks(response, chunk_size, codec, limiter):
+        if chunk:
+            file.write(chunk)
+            written += len(chunk)
+
+    return written
+
+
+def spool_response(response: requests.Response, max_size: int, chunk_size: int = CHUNK_SIZE, codec: str = None, limiter: "BandwidthLimiter" = None) -> tempfile.SpooledTemporaryFile:
+    """Description: Buffers a streamed response body in memory, spilling to a temporary file in the system temp directory once it grows over `max_size` bytes. It returns the buffer positioned at its start.\n
+    Parameters:\n
+    - response: a streamed response\n
+    - max_size: the number of bytes kept in memory before spilling to disk\n
+    - chunk_size [Optional, default 1 MB]: the size of the chunks read from the network\n
+    - codec [Optional]: the transfer compression of the body, "gzip" or "zstd"\n
+    - limiter [Optional]: the BandwidthLimiter shared with the other transfers\n
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=max_size)
+
+    try:
+        write_response(response, buffer, chunk_size, codec, limiter)
+        buffer.seek(0)
+    except BaseException:
+        buffer.close()
+        raise
+
+    return buffer
+
+
+def download_ranges(
+    transport: HTTPTransport,
+    url: str,
+    output_file_path: str,
+    part_size: int = PART_SIZE,
+    max_workers: int = None,
+    chunk_size: int = None,
+    tuner: "AdaptiveTuner" = None,
+    limiter: "BandwidthLimiter" = None
+) -> None:
+    """Description: Downloads a signed url into a file by fetching byte ranges concurrently.\n
+    The first range request doubles as the probe for the object size. If the server answers it with the whole body
+    instead of a partial response, the body is streamed into the file over that single connection.\n
+    Parameters:\n
+    - transport: the transport used for the range requests\n
+    - url: the signed download url\n
+    - output_file_path: the local file path the data is written to\n
+    - part_size [Optional, default 16 MB]: the size of every range\n
+    - max_workers [Optional]: the number of ranges fetched concurrently. By default it follows the tuner, or 4 without one\n
+    - chunk_size [Optional]: the size of the chunks written to disk. By default it follows the tuner, or 1 MB without one\n
+    - tuner [Optional]: the AdaptiveTuner observing the ranges\n
+    - limiter [Optional]: the BandwidthLimiter shared with the other transfers\n
+    """
+
+    def read_size() -> int:
+        return chunk_size or (tuner.chunk_size() if tuner else CHUNK_SIZE)
+
+    def fetch_range(start: int, end: int) -> None:
+        started = time.perf_counter()
+
+        with transport.request("GET", url, stream=True, headers={"Range": f"bytes={start}-{end}"}) as response:
+            if response.status_code != 206:
+                raise Exception(f"Failed to download range {start}-{end}. Status Code: {response.status_code}")
+
+            with open(output_file_path, "r+b") as file:
+                file.seek(start)
+                written = write_response(response, file, read_size(), limiter=limiter)
+
+        if written != end - start + 1:
+            raise Exception(f"Incomplete range {start}-{end}: received {written} bytes")
+
+        if tuner:
+            tuner.observe(written, time.perf_counter() - started, latency=response.elapsed.total_seconds(), parallel=True)
+
+    def stream_whole(response: requests.Response) -> None:
+        nonlocal written_to_disk
+        written_to_disk = True
+        with open(output_file_path, "wb") as file:
+            write_response(response, file, read_size(), limiter=limiter)
+
+    written_to_disk = False
+
+    try:
+        with transport.request("GET", url, stream=True, headers={"Range": f"bytes=0-{part_size - 1}"}) as response:
+            if response.status_code == 200:
+                return stream_whole(response)
+
+            # 416 is returned for ranges over empty objects
+            if response.status_code not in (206, 416):
+                raise Exception(f"Failed to download file. Status Code: {response.status_code}, Error: {response.text}")
+
+            match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", "")) if response.status_code == 206 else None
+
+            if match:
+                total_size = int(match.group(3))
+                written_to_disk = True
+
+                first_start, first_end = int(match.group(1)), int(match.group(2))
+
+                with open(output_file_path, "wb") as file:
+                    file.truncate(total_size)
+                    file.seek(first_start)
+                    written = write_response(response, file, read_size(), limiter=limiter)
+
+                # the probe range is checked like the others, a short body would leave zeros in the file
+                if written != first_end - first_start + 1:
+                    raise Exception(f"Incomplete range {first_start}-{first_end}: received {written} bytes")
+
+        # the server answered with an empty object or a range of unknown total size
+        if not match:
+            with transport.request("GET", url, stream=True) as response:
+                response.raise_for_status()
+                return stream_whole(response)
+
+        ranges = [
+            (start, min(start + part_size, total_size) - 1)
+            for start in range(int(match.group(2)) + 1, total_size, part_size)
+        ]
+
+        pending = set()
+        workers, in_flight = worker_limits(max_workers, tuner)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                # ranges are submitted as others complete, so the number in flight follows the tuner
+                for start, end in ranges:
+                    while len(pending) >= in_flight():
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+
+                    pending.add(executor.submit(contextvars.copy_context().run, fetch_range, start, end))
+
+                for future in wait(pending).done:
+                    future.result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+    except BaseException:
+        if written_to_disk and os.path.exists(output_file_path):
+            os.remove(output_file_path)
+        raise
@@ -0,0 +1,126 @@
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .instrumentation import record_retry
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE", "OPTIONS"])
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryPolicy:
+    """Description: Retry and backoff rules shared by the sync and async transports.\n
+    Parameters:\n
+    - max_retries [Optional, default 3]: number of retries for failed idempotent calls and 429/5xx responses\n
+    - backoff_factor [Optional, default 0.5]: base delay in seconds, doubled on every attempt and jittered\n
+    - backoff_max [Optional, default 30]: upper bound in seconds for a single backoff delay\n
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5, backoff_max: float = 30) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+
+    def backoff_delay(self, attempt: int, response=None) -> float:
+        """Returns the delay before the given retry attempt, honoring the Retry-After header when present"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+
+        delay = min(self.backoff_factor * (2 ** attempt), self.backoff_max)
+
+        # full jitter spreads concurrent retries over the whole window
+        return random.uniform(0, delay)
+
+    def should_retry_status(self, method: str, status_code: int, retry: bool = None) -> bool:
+        """Returns True if a response status shows the call can safely be sent again"""
+        if status_code not in RETRY_STATUS_CODES:
+            return False
+
+        # a 429 means the server rejected the call before processing it
+        return self.is_retryable(method, retry) or status_code == 429
+
+    def is_retryable(self, method: str, retry: bool = None) -> bool:
+        """Returns True if a call may be sent again after a connection error, by default only idempotent methods are"""
+        return method.upper() in IDEMPOTENT_METHODS if retry is None else retry
+
+
+class HTTPTransport(RetryPolicy):
+    """Description: Pooled keep-alive HTTP transport shared by every request made by the LakehouseClient.\n
+    Parameters:\n
+    - pool_size [Optional, default 10]: maximum number of keep-alive connections kept per host\n
+    - connect_timeout [Optional, default 10]: seconds to wait for a connection to be established\n
+    - read_timeout [Optional, default 300]: seconds to wait for the server between bytes\n
+    - max_retries [Optional, default 3]: number of retries for failed idempotent calls and 429/5xx responses\n
+    - backoff_factor [Optional, default 0.5]: base delay in seconds, doubled on every attempt and jittered\n
+    - backoff_max [Optional, default 30]: upper bound in seconds for a single backoff delay\n
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 10,
+        read_timeout: float = 300,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30
+    ) -> None:
+        super().__init__(max_retries=max_retries, backoff_factor=backoff_factor, backoff_max=backoff_max)
+
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def should_retry(self, method: str, response: requests.Response = None, error: Exception = None, retry: bool = None) -> bool:
+        """Returns True if a failed call can safely be sent again"""
+        if error is not None:
+            return self.is_retryable(method, retry) and isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+        if response is None:
+            return False
+
+        return self.should_retry_status(method, response.status_code, retry)
+
+    def request(self, method: str, url: str, retry: bool = None, **kwargs) -> requests.Response:
+        """Description: Sends an HTTP request through the pooled session, retrying with jittered backoff.\n
+        Parameters:\n
+        - method: HTTP method ("GET", "POST", "PUT", "DELETE", etc.)\n
+        - url: the full request url\n
+        - retry [Optional]: forces retries on or off. By default only idempotent methods are retried, and any method is retried on 429\n
+        - **kwargs: additional arguments for `requests.Session.request()` (e.g. `json`, `data`, `headers`, `stream`)\n
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+
+        while True:
+            try:
+                response = self.session.request(method=method, url=url, **kwargs)
+            except requests.exceptions.RequestException as error:
+                if attempt >= self.max_retries or not self.should_retry(method, error=error, retry=retry):
+                    raise
+                record_retry()
+                time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if attempt >= self.max_retries or not self.should_retry(method, response=response, retry=retry):
+                return response
+
+            delay = self.backoff_delay(attempt, response)
+            record_retry()
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Closes every pooled connection"""
+        self.session.close()
@@ -0,0 +1,243 @@
+import threading
+import time
+from typing import Literal
+
+from .transfer import CHUNK_SIZE, MAX_WORKERS, PART_SIZE, UPLOAD_CHUNK_SIZE
+
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+# object stores reject multipart parts under 5 MB, except the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 512 * 1024 * 1024
+
+MAX_CONCURRENCY = 16
+
+# each request should take about this long, long enough for its latency not to matter and short enough to adapt quickly
+TARGET_SECONDS = 0.5
+
+# a request lasting this many times the latency spends at least 80% of its time transferring
+LATENCY_FACTOR = 4
+
+# parts are this many target durations long, they are sent concurrently so their number matters more than their size
+PART_TARGETS = 8
+
+# weight of the latest sample in the throughput and latency averages
+SMOOTHING = 0.3
+
+# relative throughput change under which a concurrency change is considered to make no difference
+CONCURRENCY_TOLERANCE = 0.1
+
+Direction = Literal["download", "upload"]
+
+
+def clamp(value: float, lower: float, upper: float) -> float:
+    return max(lower, min(upper, value))
+
+
+class AdaptiveTuner:
+    """Description: Chooses the chunk size, part size and concurrency of transfers from the throughput and latency observed on the previous ones.
+    Downloads and uploads are tuned separately, and every value stays within the caps given.\n
+    - chunk size: about `target_seconds` of transfer at the observed throughput, and at least `LATENCY_FACTOR` times the latency. It changes at most twofold per request\n
+    - part size: about `PART_TARGETS` chunks, and small enough for every worker to get a part\n
+    - concurrency: hill climbing on the combined throughput of parallel transfers, workers are added while they make transfers faster and removed when they do not\n
+    Parameters:\n
+    - min_chunk_size, max_chunk_size [Optional, default 64 KB and 64 MB]: the bounds of the chunks read from the network and of the requests of serial uploads\n
+    - min_part_size, max_part_size [Optional, default 5 MB and 512 MB]: the bounds of the parts of multipart uploads and parallel downloads\n
+    - min_concurrency, max_concurrency [Optional, default 1 and 16]: the bounds of the number of parts transferred at once\n
+    - concurrency [Optional, default 4]: the number of parts transferred at once before any throughput is observed\n
+    - target_seconds [Optional, default 0.5]: the duration each chunk should take\n
+    """
+
+    def __init__(
+        self,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+        min_part_size: int = MIN_PART_SIZE,
+        max_part_size: int = MAX_PART_SIZE,
+        min_concurrency: int = 1,
+        max_concurrency: int = MAX_CONCURRENCY,
+        concurrency: int = MAX_WORKERS,
+        target_seconds: float = TARGET_SECONDS
+    ) -> None:
+        for name, lower, upper in (
+            ("chunk size", min_chunk_size, max_chunk_size),
+            ("part size", min_part_size, max_part_size),
+            ("concurrency", min_concurrency, max_concurrency)
+        ):
+            if lower < 1 or lower > upper:
+                raise Exception(f"Invalid {name} bounds: {lower} to {upper}")
+
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.min_part_size = min_part_size
+        self.max_part_size = max_part_size
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_seconds = target_seconds
+
+        self.__lock = threading.Lock()
+        self.__chunk_sizes = {
+            "download": int(clamp(CHUNK_SIZE, min_chunk_size, max_chunk_size)),
+            "upload": int(clamp(UPLOAD_CHUNK_SIZE, min_chunk_size, max_chunk_size))
+        }
+        self.__throughput = {"download": None, "upload": None}
+        self.__latency = {"download": None, "upload": None}
+        self.__concurrency = int(clamp(concurrency, min_concurrency, max_concurrency))
+
+        # the parallel transfers completed since the concurrency last changed
+        self.__window_bytes = 0
+        self.__window_count = 0
+        self.__window_started = None
+        self.__previous_rate = None
+        self.__direction = 1
+
+    @property
+    def concurrency(self) -> int:
+        return self.__concurrency
+
+    def chunk_size(self, direction: Direction = "download") -> int:
+        return self.__chunk_sizes[direction]
+
+    def cap_concurrency(self, limit: int) -> None:
+        """Lowers the maximum concurrency to `limit`, like the number of connections of the transport the transfers share, so the tuner measures the server rather than requests waiting for a connection"""
+        with self.__lock:
+            self.max_concurrency = max(self.min_concurrency, min(self.max_concurrency, limit))
+            self.__concurrency = min(self.__concurrency, self.max_concurrency)
+
+    def part_size(self, file_size: int = None, direction: Direction = "download") -> int:
+        """Returns the part size for a transfer of `file_size` bytes, so it is split in at least as many parts as there are workers"""
+        throughput = self.__throughput[direction]
+
+        size = PART_SIZE if throughput is None else throughput * self.target_seconds * PART_TARGETS
+
+        if file_size:
+            size = min(size, -(-file_size // self.__concurrency))
+
+        return int(clamp(size, self.min_part_size, self.max_part_size))
+
+    def stats(self) -> dict:
+        """Returns the current chunk sizes, concurrency, and the throughput in bytes per second and latency in seconds observed in each direction"""
+        with self.__lock:
+            return {
+                "concurrency": self.__concurrency,
+                **{f"{direction}_chunk_size": size for direction, size in self.__chunk_sizes.items()},
+                **{f"{direction}_throughput": rate for direction, rate in self.__throughput.items()},
+                **{f"{direction}_latency": latency for direction, latency in self.__latency.items()}
+            }
+
+    def observe(self, size: int, seconds: float, latency: float = None, direction: Direction = "download", parallel: bool = False) -> None:
+        """Description: Records a completed request or chunk and adapts the chunk size, and the concurrency for parallel transfers.\n
+        Parameters:\n
+        - size: the number of bytes transferred\n
+        - seconds: the duration of the transfer, including its latency\n
+        - latency [Optional]: the seconds until the response headers were received\n
+        - direction [Optional, default download]: "download" or "upload"\n
+        - parallel [Optional, default False]: whether the transfer was one of the parts of a parallel transfer\n
+        """
+        if size <= 0 or seconds <= 0:
+            return
+
+        with self.__lock:
+            throughput = self.__average(self.__throughput[direction], size / seconds)
+            self.__throughput[direction] = throughput
+
+            if latency is not None:
+                self.__latency[direction] = self.__average(self.__latency[direction], latency)
+
+            ideal = throughput * max(self.target_seconds, (self.__latency[direction] or 0) * LATENCY_FACTOR)
+            current = self.__chunk_sizes[direction]
+
+            # chunks are kept a multiple of 64 KB, the size of the socket reads
+            chunk_size = clamp(ideal, current / 2, current * 2) // MIN_CHUNK_SIZE * MIN_CHUNK_SIZE
+            self.__chunk_sizes[direction] = int(clamp(chunk_size, self.min_chunk_size, self.max_chunk_size))
+
+            if parallel:
+                self.__observe_parallel(size)
+
+    @staticmethod
+    def __average(average: float | None, sample: float) -> float:
+        return sample if average is None else average + SMOOTHING * (sample - average)
+
+    def __observe_parallel(self, size: int) -> None:
+        now = time.monotonic()
+
+        if self.__window_started is None:
+            self.__window_started = now
+            return
+
+        self.__window_bytes += size
+        self.__window_count += 1
+
+        elapsed = now - self.__window_started
+
+        # every worker completes a part before the throughput at this concurrency is judged
+        if self.__window_count < self.__concurrency or elapsed < self.target_seconds:
+            return
+
+        rate = self.__window_bytes / elapsed
+        previous = self.__previous_rate
+
+        if previous is None or rate > previous * (1 + CONCURRENCY_TOLERANCE):
+            step = self.__direction
+        elif rate < previous * (1 - CONCURRENCY_TOLERANCE):
+            self.__direction = -self.__direction
+            step = self.__direction
+        elif self.__direction > 0:
+            # the workers added made no difference, they are removed
+            self.__direction = -1
+            step = -1
+        else:
+            step = 0
+
+        self.__concurrency = int(clamp(self.__concurrency + step, self.min_concurrency, self.max_concurrency))
+        self.__previous_rate = rate
+        self.__window_bytes = 0
+        self.__window_count = 0
+        self.__window_started = now
+
+
+class BandwidthLimiter:
+    """Description: Token bucket limiting the combined throughput of every transfer that shares it.
+    Pass the same limiter to several clients, sync or async, so batch jobs leave bandwidth for the other services of a shared link.\n
+    Parameters:\n
+    - rate: the maximum bytes per second\n
+    - burst [Optional, default one second of `rate`]: the number of bytes that can be sent at once after an idle period\n
+    """
+
+    def __init__(self, rate: float, burst: float = None) -> None:
+        if rate <= 0:
+            raise Exception(f"Invalid bandwidth limit: {rate}. Expected a positive number of bytes per second")
+
+        self.rate = rate
+        self.burst = burst if burst else rate
+
+        self.__lock = threading.Lock()
+        self.__tokens = self.burst
+        self.__updated = time.monotonic()
+
+    def reserve(self, size: int) -> float:
+        """Takes `size` bytes from the bucket and returns the number of seconds to wait before transferring them"""
+        with self.__lock:
+            now = time.monotonic()
+
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__updated) * self.rate) - size
+            self.__updated = now
+
+            return max(0.0, -self.__tokens / self.rate)
+
+    def acquire(self, size: int) -> None:
+        """Waits until `size` bytes can be transferred"""
+        delay = self.reserve(size)
+
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, size: int) -> None:
+        """Waits until `size` bytes can be transferred without blocking the event loop"""
+        import asyncio
+
+        delay = self.reserve(size)
+
+        if delay:
+            await asyncio.sleep(delay)
@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import Any, List, Literal
 
 from pydantic import BaseModel
 
@@ -14,4 +14,32 @@ class CatalogFilter(BaseModel):
     property_value: str | int | float
 
 class CatalogFilterPayload(BaseModel):
-    filters: List[CatalogFilter]
\ No newline at end of file
+    filters: List[CatalogFilter]
+    sort_by: str | None = None
+    sort_desc: bool | None = None
+    limit: int | None = None
+    offset: int | None = None
+    cursor: str | None = None
+
+class BatchItemResult(BaseModel):
+    key: str
+    value: Any = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class PhaseEvent(BaseModel):
+    operation: str | None = None
+    phase: str
+    key: str | None = None
+    started_at: float
+    duration: float
+    bytes: int = 0
+    retries: int = 0
+    error: str | None = None
+
+    @property
+    def throughput(self) -> float | None:
+        return self.bytes / self.duration if self.bytes and self.duration > 0 else None
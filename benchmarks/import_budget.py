@@ -0,0 +1,113 @@
+"""Checks that importing the lakehouse package stays fast and does not load the dataframe libraries.
+
+`import lakehouse`, creating a client and formatting records as dict or json must not import pandas, numpy,
+pyarrow or httpx, and the import must take less than the budget. Every run uses a fresh interpreter.
+
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget-ms 250 --runs 10
+
+The exit code is 1 when the budget is exceeded or a heavy module is loaded, so it can run in CI.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_MS = 400
+
+# modules only the dataframe functions and the async client may import
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "httpx")
+
+CHILD_SCRIPT = f"""
+import json, sys, time
+
+started = time.perf_counter()
+import lakehouse
+elapsed = time.perf_counter() - started
+
+from lakehouse.src.formatting import format_output
+
+client = lakehouse.LakehouseClient("localhost")
+format_output([{{"id": "1", "file_name": "a.csv"}}], "dict")
+format_output([{{"id": "1", "file_name": "a.csv"}}], "json")
+
+print(json.dumps({{"seconds": elapsed, "heavy_modules": [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def child_environment() -> dict:
+    env = dict(os.environ)
+    # the working tree is measured, not an installed copy of the library
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(REPO_DIR, "app"), env.get("PYTHONPATH")]))
+    return env
+
+
+def run_once() -> dict:
+    completed = subprocess.run([sys.executable, "-c", CHILD_SCRIPT], capture_output=True, text=True, env=child_environment())
+
+    if completed.returncode != 0:
+        raise Exception(f"Importing lakehouse failed:\n{completed.stderr}")
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(count: int = 10) -> list[tuple[str, int]]:
+    """Returns the modules with the largest cumulative import time in microseconds, from `python -X importtime`"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import lakehouse"], capture_output=True, text=True, env=child_environment())
+
+    modules = []
+
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+
+        modules.append((fields[2].strip(), int(fields[1])))
+
+    return sorted(modules, key=lambda module: module[1], reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Checks the import time of the lakehouse package")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="maximum median import time in milliseconds")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters measured")
+    parser.add_argument("--json", action="store_true", help="prints the result as json")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+
+    median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+    heavy_modules = sorted({name for run in runs for name in run["heavy_modules"]})
+
+    passed = median_ms <= args.budget_ms and not heavy_modules
+
+    if args.json:
+        print(json.dumps({
+            "median_ms": median_ms,
+            "budget_ms": args.budget_ms,
+            "runs_ms": [run["seconds"] * 1000 for run in runs],
+            "heavy_modules": heavy_modules,
+            "passed": passed
+        }, indent=2))
+    else:
+        print(f"import lakehouse: {median_ms:.0f} ms median over {args.runs} runs, budget {args.budget_ms:.0f} ms")
+
+        if heavy_modules:
+            print(f"heavy modules loaded: {', '.join(heavy_modules)}")
+
+    if not passed:
+        print("\nslowest imports (cumulative):", file=sys.stderr)
+        for name, microseconds in slowest_imports():
+            print(f"  {microseconds / 1000:8.1f} ms  {name}", file=sys.stderr)
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
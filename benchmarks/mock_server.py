@@ -0,0 +1,603 @@
+"""A local stand-in for the lakehouse API, used by the benchmarks.
+
+It serves the endpoints called by LakehouseClient and AsyncLakehouseClient (/auth/login, /catalog/*, /storage/*)
+and the signed urls the files are uploaded to and downloaded from. The catalog holds `catalog_size` synthetic file
+records generated on demand, so listings of a million records do not need a million records in memory, plus the
+records of the files uploaded while the server runs.
+
+Run it on its own to try the client against it:
+
+    python benchmarks/mock_server.py --port 8000 --catalog-size 100000 --latency 0.02 --bandwidth 50MB
+"""
+
+import argparse
+import json
+import re
+import socket
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+PROCESSING_LEVELS = ("raw", "processed", "curated")
+FILE_CATEGORIES = ("structured", "unstructured")
+
+# synthetic records are inserted one second apart from this timestamp
+BASE_TIMESTAMP = 1700000000
+
+# bandwidth is enforced by sending and receiving bodies in slices of this size
+THROTTLE_SLICE = 64 * 1024
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(value: str) -> int:
+    """Parses a byte size like 512, 64KB or 10MB"""
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$", str(value).upper())
+
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {value!r}. Expected a number of bytes like 512, 64KB or 10MB")
+
+    number, unit = match.groups()
+
+    return int(float(number) * SIZE_UNITS[unit])
+
+
+def synthetic_collection(index: int) -> dict:
+    """Returns the catalog record of the synthetic collection `index`"""
+    return {
+        "id": f"c{index:023d}",
+        "collection_name": f"collection_{index}",
+        "collection_description": f"Synthetic collection {index}",
+        "storage_type": "gcs",
+        "bucket_name": f"bucket_{index % 3}",
+        "inserted_by": f"u:user{index % 50}@lakehouse.org",
+        "inserted_at": BASE_TIMESTAMP + index,
+        "public": index % 2 == 0,
+        "secret": False
+    }
+
+
+def synthetic_file(index: int, collections: int = 10) -> dict:
+    """Returns the catalog record of the synthetic file `index`, records are deterministic so runs can be compared"""
+    collection = synthetic_collection(index % collections)
+
+    return {
+        "id": f"f{index:023d}",
+        "file_name": f"sample_{index}.csv",
+        "file_category": FILE_CATEGORIES[index % 4 == 3],
+        "file_size": 1024 * (index % 5000 + 1),
+        "file_version": 1,
+        "file_description": None,
+        "processing_level": PROCESSING_LEVELS[index % 3],
+        "public": index % 7 == 0,
+        "inserted_by": f"u:user{index % 50}@lakehouse.org",
+        "inserted_at": BASE_TIMESTAMP + index,
+        "collection_id": collection["id"],
+        "collection_name": collection["collection_name"],
+        "file_location": f"gs://{collection['bucket_name']}/{collection['collection_name']}/sample_{index}.csv",
+        "status": "ready",
+        "metadata": {}
+    }
+
+
+def synthetic_content(size: int) -> bytes:
+    """Returns the content served for a synthetic file: a csv file of `size` bytes"""
+    header = b"id,value\n"
+    row = b"1,0.5\n"
+
+    if size <= len(header):
+        return header[:size]
+
+    rows = (size - len(header)) // len(row)
+
+    return (header + row * rows + b"0" * ((size - len(header)) % len(row)))[:size]
+
+
+def matches(record: dict, flt: dict) -> bool:
+    """Evaluates one filter of a search payload, values are compared as numbers when both sides are numeric"""
+    operator = flt["operator"]
+    expected = flt["property_value"]
+    value = record.get(flt["property_name"])
+
+    if operator == "*":
+        return str(expected).lower() in str(value).lower()
+
+    if isinstance(value, bool) or isinstance(expected, bool) or str(expected).lower() in ("true", "false"):
+        value, expected = str(value).lower(), str(expected).lower()
+    else:
+        try:
+            value, expected = float(value), float(expected)
+        except (TypeError, ValueError):
+            value, expected = str(value), str(expected)
+
+    if operator == "=":
+        return value == expected
+    if operator == "!=":
+        return value != expected
+    if operator == ">":
+        return value > expected
+    if operator == "<":
+        return value < expected
+    if operator == ">=":
+        return value >= expected
+    if operator == "<=":
+        return value <= expected
+
+    return False
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server that ignores clients closing their connections"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockLakehouseServer:
+    """Description: An in-process HTTP server implementing the lakehouse API, started in a background thread.\n
+    Parameters:\n
+    - catalog_size [Optional, default 0]: the number of synthetic file records in the catalog\n
+    - collections [Optional, default 10]: the number of synthetic collections the files belong to\n
+    - latency [Optional, default 0]: seconds added before every response, API calls and signed urls alike\n
+    - bandwidth [Optional]: bytes per second each request body and response body is limited to, unlimited by default\n
+    - paginate [Optional, default True]: honors the `limit` and `offset` parameters of the listings, like the production API\n
+    - paginate_searches [Optional, default True]: honors the `limit` and `offset` of the search payloads. Without it searches only apply `limit`\n
+    - sorting [Optional, default True]: honors the `sort_by` of searches and echoes it in the response. Set it to False to stand in for a server that ignores sorting but applies `limit`\n
+    - first_range_error [Optional, default 0]: bytes added to, or cut from when negative, the body of ranges starting at byte 0 while their Content-Range is unchanged, to stand in for a faulty storage\n
+    - host, port [Optional]: the address to listen on, by default a free port of the loopback interface\n
+    """
+
+    def __init__(
+        self,
+        catalog_size: int = 0,
+        collections: int = 10,
+        latency: float = 0,
+        bandwidth: int = None,
+        paginate: bool = True,
+        paginate_searches: bool = True,
+        sorting: bool = True,
+        first_range_error: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ) -> None:
+        self.catalog_size = catalog_size
+        self.collections = collections
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.paginate = paginate
+        self.paginate_searches = paginate_searches
+        self.sorting = sorting
+        self.first_range_error = first_range_error
+
+        self.uploaded_files = {}
+        self.uploaded_collections = {}
+        self.blobs = {}
+        self.request_counts = {}
+        self.lock = threading.Lock()
+
+        self.__httpd = QuietHTTPServer((host, port), self.__handler())
+        self.__thread = None
+
+    @property
+    def address(self) -> str:
+        """The host:port address to pass to the clients as `lakehouse_url`, with protocol="http\""""
+        host, port = self.__httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "MockLakehouseServer":
+        self.__thread = threading.Thread(target=self.__httpd.serve_forever, daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.__httpd.shutdown()
+        self.__httpd.server_close()
+
+    def __enter__(self) -> "MockLakehouseServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_counts(self) -> None:
+        with self.lock:
+            self.request_counts.clear()
+
+    # Catalog
+
+    def file_count(self) -> int:
+        return self.catalog_size + len(self.uploaded_files)
+
+    def file_record(self, file_id: str) -> dict | None:
+        if file_id in self.uploaded_files:
+            return self.uploaded_files[file_id]
+
+        if re.fullmatch(r"f\d{23}", file_id) and int(file_id[1:]) < self.catalog_size:
+            return synthetic_file(int(file_id[1:]), self.collections)
+
+        return None
+
+    def file_records(self, start: int = 0, stop: int = None) -> list[dict]:
+        """Returns the records between two positions of the listing, synthetic files first"""
+        stop = self.file_count() if stop is None else min(stop, self.file_count())
+
+        records = [synthetic_file(index, self.collections) for index in range(start, min(stop, self.catalog_size))]
+
+        if stop > self.catalog_size:
+            with self.lock:
+                uploaded = list(self.uploaded_files.values())
+            records.extend(uploaded[max(0, start - self.catalog_size):stop - self.catalog_size])
+
+        return records
+
+    def iter_file_records(self) -> Iterator[dict]:
+        """Yields every file record, so searches over large catalogs only hold the records found"""
+        for index in range(self.catalog_size):
+            yield synthetic_file(index, self.collections)
+
+        with self.lock:
+            uploaded = list(self.uploaded_files.values())
+
+        yield from uploaded
+
+    def collection_records(self) -> list[dict]:
+        with self.lock:
+            uploaded = list(self.uploaded_collections.values())
+
+        return [synthetic_collection(index) for index in range(self.collections)] + uploaded
+
+    def search(self, records: Iterable[dict], payload: dict) -> dict:
+        filters = payload.get("filters") or []
+
+        found = [record for record in records if all(matches(record, flt) for flt in filters)]
+        response = {}
+
+        if payload.get("sort_by") and self.sorting:
+            found.sort(key=lambda record: record.get(payload["sort_by"]), reverse=bool(payload.get("sort_desc")))
+            response.update(sort_by=payload["sort_by"], sort_desc=bool(payload.get("sort_desc")))
+
+        if self.paginate_searches and payload.get("limit") is not None:
+            offset = int(payload.get("offset") or 0)
+            response.update(total=len(found), offset=offset, limit=payload["limit"])
+            found = found[offset:offset + payload["limit"]]
+        elif payload.get("limit") is not None:
+            found = found[:payload["limit"]]
+
+        return {"records": found, **response}
+
+    def listing(self, records_between: Callable[[int, int], list[dict]], total: int, query: dict) -> dict:
+        if not self.paginate or "limit" not in query:
+            return {"records": records_between(0, total)}
+
+        limit = int(query["limit"])
+        offset = int(query.get("offset", 0))
+
+        return {"records": records_between(offset, offset + limit), "total": total, "offset": offset, "limit": limit}
+
+    # Storage
+
+    def create_upload(self, payload: dict) -> tuple[str, dict]:
+        file_id = uuid.uuid4().hex[:24]
+
+        record = {
+            "id": file_id,
+            "file_name": payload["file_name"],
+            "file_category": payload.get("file_category"),
+            "file_size": payload.get("file_size", 0),
+            "file_version": payload.get("file_version", 1),
+            "file_description": payload.get("file_description"),
+            "processing_level": payload.get("processing_level"),
+            "public": payload.get("public", False),
+            "inserted_by": "u:benchmark@lakehouse.org",
+            "inserted_at": int(time.time()),
+            "collection_id": payload["collection_catalog_id"],
+            "collection_name": payload["collection_catalog_id"],
+            "file_location": f"mock://{file_id}",
+            "status": "pending",
+            "metadata": payload.get("metadata") or {}
+        }
+
+        with self.lock:
+            self.uploaded_files[file_id] = record
+            self.blobs[file_id] = {} if payload.get("part_count") else bytearray()
+
+        return file_id, record
+
+    def finalize_upload(self, file_id: str, payload: dict) -> dict:
+        with self.lock:
+            record = self.uploaded_files[file_id]
+            blob = self.blobs[file_id]
+
+            if isinstance(blob, dict):
+                self.blobs[file_id] = bytearray(b"".join(blob[part] for part in sorted(blob)))
+
+            record["status"] = payload.get("status", "ready")
+
+            if "file_size" in payload:
+                record["file_size"] = payload["file_size"]
+            if "metadata" in payload:
+                record["metadata"] = {**record["metadata"], **payload["metadata"]}
+
+            return dict(record)
+
+    def delete_file(self, file_id: str) -> None:
+        """Removes an uploaded file and its data, so repeated uploads do not accumulate in memory"""
+        with self.lock:
+            self.uploaded_files.pop(file_id, None)
+            self.blobs.pop(file_id, None)
+
+    def content(self, file_id: str) -> bytes | None:
+        with self.lock:
+            blob = self.blobs.get(file_id)
+
+        if blob is not None:
+            return bytes(blob) if not isinstance(blob, dict) else b""
+
+        record = self.file_record(file_id)
+
+        return synthetic_content(record["file_size"]) if record else None
+
+    def __handler(self) -> type:
+        server = self
+
+        class Handler(MockRequestHandler):
+            mock = server
+
+        return Handler
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Routes the requests of the clients to the state of a MockLakehouseServer"""
+
+    protocol_version = "HTTP/1.1"
+    mock: MockLakehouseServer = None
+
+    def setup(self) -> None:
+        super().setup()
+        # without it small responses wait for delayed acknowledgements and every request takes 40 ms or more
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_request(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        body = self.read_body()
+
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+
+        route = self.route_name(path)
+
+        with self.mock.lock:
+            self.mock.request_counts[route] = self.mock.request_counts.get(route, 0) + 1
+
+        try:
+            self.route(path, query, body)
+        except (KeyError, ValueError) as error:
+            self.send_json(400, {"detail": f"Bad request: {error}"})
+
+    do_GET = do_POST = do_PUT = do_HEAD = do_request
+
+    @staticmethod
+    def route_name(path: str) -> str:
+        for prefix in ("/catalog/file/id/", "/catalog/set-file-status/", "/signed/"):
+            if path.startswith(prefix):
+                return prefix + "{id}"
+        return path
+
+    def route(self, path: str, query: dict, body: bytes) -> None:
+        mock = self.mock
+        method = self.command
+
+        if path == "/auth/login":
+            return self.send_json(200, {"access_token": "benchmark-token", "token_type": "bearer"})
+
+        if path.startswith("/catalog/file/id/"):
+            record = mock.file_record(path.rsplit("/", 1)[1])
+            return self.send_json(200, record) if record else self.send_json(404, {"detail": "File not found"})
+
+        if path == "/catalog/files/all/":
+            return self.send_json(200, mock.listing(mock.file_records, mock.file_count(), query))
+
+        if path == "/catalog/collections/all/":
+            collections = mock.collection_records()
+            return self.send_json(200, mock.listing(lambda start, stop: collections[start:stop], len(collections), query))
+
+        if path == "/catalog/files/search":
+            return self.send_json(200, mock.search(mock.iter_file_records(), json.loads(body)))
+
+        if path == "/catalog/collections/search":
+            return self.send_json(200, mock.search(mock.collection_records(), json.loads(body)))
+
+        if path.startswith("/catalog/set-file-status/"):
+            file_id = path.rsplit("/", 1)[1]
+            if file_id not in mock.uploaded_files:
+                return self.send_json(404, {"detail": "File not found"})
+            return self.send_json(200, mock.finalize_upload(file_id, json.loads(body)))
+
+        if path == "/storage/bucket-list":
+            return self.send_json(200, {"bucket_list": [{"bucket_name": f"bucket_{index}"} for index in range(3)]})
+
+        if path == "/storage/collections/create":
+            payload = json.loads(body)
+            collection_id = uuid.uuid4().hex[:24]
+            with mock.lock:
+                mock.uploaded_collections[collection_id] = {
+                    **payload,
+                    "id": collection_id,
+                    "inserted_by": "u:benchmark@lakehouse.org",
+                    "inserted_at": int(time.time())
+                }
+            return self.send_json(200, {"collection_name": payload["collection_name"], "id": collection_id})
+
+        if path == "/storage/files/download-request":
+            file_id = json.loads(body)["catalog_file_id"]
+            if mock.file_record(file_id) is None:
+                return self.send_json(404, {"detail": "File not found"})
+            return self.send_json(200, {"download_url": f"http://{self.headers['Host']}/signed/{file_id}"})
+
+        if path == "/storage/files/upload-request":
+            payload = json.loads(body)
+            file_id, _ = mock.create_upload(payload)
+            signed_url = f"http://{self.headers['Host']}/signed/{file_id}"
+            response = {"upload_url": signed_url, "catalog_record_id": file_id, "method": "PUT"}
+            if payload.get("part_count"):
+                response["part_urls"] = [f"{signed_url}?part={number}" for number in range(1, payload["part_count"] + 1)]
+            return self.send_json(200, response)
+
+        if path.startswith("/signed/"):
+            file_id = path.rsplit("/", 1)[1]
+            if method in ("PUT", "POST"):
+                return self.receive_blob(file_id, query, body)
+            return self.send_blob(file_id)
+
+        return self.send_json(404, {"detail": f"Not found: {path}"})
+
+    # Signed urls
+
+    def receive_blob(self, file_id: str, query: dict, body: bytes) -> None:
+        with self.mock.lock:
+            blob = self.mock.blobs.get(file_id)
+
+            if blob is not None and "part" in query:
+                blob[int(query["part"])] = body
+            elif blob is not None:
+                blob += body
+
+        if blob is None:
+            return self.send_json(404, {"detail": "Upload not found"})
+
+        self.send_bytes(200, b"", {"ETag": f'"{file_id}-{query.get("part", 0)}"'})
+
+    def send_blob(self, file_id: str) -> None:
+        data = self.mock.content(file_id)
+
+        if data is None:
+            return self.send_bytes(404, b"Not found")
+
+        match = RANGE_PATTERN.match(self.headers.get("Range", ""))
+
+        if not match:
+            return self.send_bytes(200, data, {"Accept-Ranges": "bytes"})
+
+        first, last = match.groups()
+
+        if not first:
+            first, last = max(0, len(data) - int(last)), len(data) - 1
+        else:
+            first, last = int(first), min(int(last) if last else len(data) - 1, len(data) - 1)
+
+        if first >= len(data):
+            return self.send_bytes(416, b"", {"Content-Range": f"bytes */{len(data)}"})
+
+        body = data[first:last + 1 + (self.mock.first_range_error if first == 0 else 0)]
+
+        self.send_bytes(206, body, {"Content-Range": f"bytes {first}-{last}/{len(data)}", "Accept-Ranges": "bytes"})
+
+    # IO
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self.throttled_read(size)
+                self.rfile.readline()
+
+        return self.throttled_read(int(self.headers.get("Content-Length") or 0))
+
+    def throttled_read(self, size: int) -> bytes:
+        if not self.mock.bandwidth:
+            return self.rfile.read(size)
+
+        data = bytearray()
+        started = time.perf_counter()
+
+        while len(data) < size:
+            data += self.rfile.read(min(THROTTLE_SLICE, size - len(data)))
+            self.throttle(len(data), started)
+
+        return bytes(data)
+
+    def throttle(self, transferred: int, started: float) -> None:
+        delay = transferred / self.mock.bandwidth - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+
+    def send_json(self, status: int, payload) -> None:
+        self.send_bytes(status, json.dumps(payload).encode(), content_type="application/json")
+
+    def send_bytes(self, status: int, data: bytes, headers: dict = None, content_type: str = "application/octet-stream") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+        if self.command == "HEAD" or not data:
+            return
+
+        if not self.mock.bandwidth:
+            self.wfile.write(data)
+            return
+
+        started = time.perf_counter()
+        view = memoryview(data)
+
+        for offset in range(0, len(data), THROTTLE_SLICE):
+            self.wfile.write(view[offset:offset + THROTTLE_SLICE])
+            self.throttle(min(offset + THROTTLE_SLICE, len(data)), started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs a local stand-in for the lakehouse API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--catalog-size", type=int, default=1000, help="number of synthetic file records")
+    parser.add_argument("--collections", type=int, default=10, help="number of synthetic collections")
+    parser.add_argument("--latency", type=float, default=0, help="seconds added before every response")
+    parser.add_argument("--bandwidth", type=parse_size, default=None, help="bytes per second per request body, like 50MB")
+    parser.add_argument("--no-pagination", action="store_true", help="return whole listings like servers without pagination")
+    parser.add_argument("--no-sorting", action="store_true", help="ignore the sort_by of searches like servers without sorting")
+    args = parser.parse_args()
+
+    server = MockLakehouseServer(
+        catalog_size=args.catalog_size,
+        collections=args.collections,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        paginate=not args.no_pagination,
+        sorting=not args.no_sorting,
+        host=args.host,
+        port=args.port
+    ).start()
+
+    print(f"Mock lakehouse listening on http://{server.address}, use LakehouseClient(\"{server.address}\", protocol=\"http\")")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
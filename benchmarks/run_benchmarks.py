@@ -0,0 +1,340 @@
+"""Benchmarks of the lakehouse client against a local MockLakehouseServer.
+
+Suites:
+- transfer: upload and download throughput by file size, and by part size for multipart uploads and parallel downloads
+- listing: latency of the file listings and searches for catalogs of 10k, 100k and 1M records
+- formatting: cost of each output_format for catalog records already in memory
+
+Results are written as json so runs can be compared:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --baseline before.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# the working tree is measured, not an installed copy of the library
+sys.path.insert(0, os.path.join(REPO_DIR, "app"))
+
+from lakehouse import InMemoryRecorder, Instrumentation, LakehouseClient  # noqa: E402
+from lakehouse.src.formatting import FILE_COLUMNS, format_output, pages_to_df  # noqa: E402
+from lakehouse.src.query import PAGE_SIZE  # noqa: E402
+from mock_server import MockLakehouseServer, parse_size, synthetic_content, synthetic_file  # noqa: E402
+
+MB = 1024 * 1024
+
+FILE_SIZES = [1 * MB, 16 * MB, 64 * MB]
+PART_SIZES = [4 * MB, 8 * MB, 16 * MB]
+LISTING_SIZES = [10_000, 100_000, 1_000_000]
+FORMATTING_SIZES = [10_000, 100_000]
+OUTPUT_FORMATS = ["dict", "json", "df", "table"]
+
+QUICK_FILE_SIZES = [1 * MB, 8 * MB]
+QUICK_PART_SIZES = [4 * MB]
+QUICK_LISTING_SIZES = [10_000]
+QUICK_FORMATTING_SIZES = [10_000]
+
+SUITES = ("transfer", "listing", "formatting")
+
+
+def log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def measure(function: Callable, repeat: int, setup: Callable = None) -> dict:
+    """Runs `function` `repeat` times and returns the min, median, mean and max durations in seconds, `setup` runs untimed before every run"""
+    durations = []
+
+    for _ in range(repeat):
+        if setup:
+            setup()
+
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+
+    return {
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+        "max": max(durations)
+    }
+
+
+def result(suite: str, name: str, params: dict, seconds: dict, size: int = None, records: int = None, **extra) -> dict:
+    entry = {"suite": suite, "name": name, "params": params, "seconds": seconds}
+
+    if size is not None:
+        entry["bytes"] = size
+        entry["throughput_mb_s"] = size / MB / seconds["median"] if seconds["median"] > 0 else None
+
+    if records is not None:
+        entry["records"] = records
+        entry["records_per_s"] = records / seconds["median"] if seconds["median"] > 0 else None
+
+    entry.update(extra)
+
+    log(f"  {name} {params}: {seconds['median'] * 1000:.1f} ms" + (f", {entry['throughput_mb_s']:.1f} MB/s" if size else ""))
+
+    return entry
+
+
+def phase_means(recorder: InMemoryRecorder, operation: str) -> dict:
+    """Returns the mean duration in seconds of each phase of an operation, from the events recorded by the client"""
+    return {row["phase"]: row["seconds_mean"] for row in recorder.summary() if row["operation"] == operation}
+
+
+def run_transfer(args: argparse.Namespace) -> list[dict]:
+    results = []
+    recorder = InMemoryRecorder()
+
+    with MockLakehouseServer(latency=args.latency, bandwidth=args.bandwidth) as server, tempfile.TemporaryDirectory() as work_dir:
+        client = LakehouseClient(server.address, protocol="http", instrumentation=Instrumentation(exporters=[recorder]))
+        client.auth(email="benchmark@lakehouse.org", password="benchmark")
+
+        output_dir = os.path.join(work_dir, "downloads")
+        os.makedirs(output_dir)
+
+        # the record of the last upload, downloaded by the next benchmarks
+        uploaded = {}
+
+        def drop_upload() -> None:
+            if uploaded:
+                server.delete_file(uploaded.pop("id"))
+                uploaded.clear()
+
+        for file_size in args.file_sizes:
+            log(f"transfer: {file_size / MB:g} MB")
+
+            local_path = os.path.join(work_dir, f"data_{file_size}.csv")
+
+            with open(local_path, "wb") as file:
+                file.write(synthetic_content(file_size))
+
+            params = {"file_size": file_size, "latency": args.latency, "bandwidth": args.bandwidth}
+
+            def upload() -> None:
+                uploaded.update(client.upload_file(local_path, f"data_{file_size}", "benchmark"))
+
+            recorder.clear()
+            seconds = measure(upload, args.repeat, setup=drop_upload)
+            results.append(result("transfer", "upload_file", params, seconds, size=file_size, phases=phase_means(recorder, "upload_file")))
+
+            recorder.clear()
+            seconds = measure(lambda: client.download_file(uploaded["id"], output_dir), args.repeat)
+            results.append(result("transfer", "download_file", params, seconds, size=file_size, phases=phase_means(recorder, "download_file")))
+
+            recorder.clear()
+            seconds = measure(lambda: client.get_dataframe(uploaded["id"]), args.repeat)
+            results.append(result("transfer", "get_dataframe", params, seconds, size=file_size, phases=phase_means(recorder, "get_dataframe")))
+
+            drop_upload()
+
+        # part sizes are compared on the largest file, where they matter
+        file_size = max(args.file_sizes)
+        data = synthetic_content(file_size)
+
+        for part_size in args.part_sizes:
+            log(f"transfer: {file_size / MB:g} MB in {part_size / MB:g} MB parts")
+
+            params = {"file_size": file_size, "part_size": part_size, "max_workers": args.max_workers, "latency": args.latency, "bandwidth": args.bandwidth}
+
+            def upload_parts() -> None:
+                uploaded.update(client.upload_stream(data, f"parts_{file_size}.csv", "benchmark", multipart=True, part_size=part_size, max_workers=args.max_workers))
+
+            recorder.clear()
+            seconds = measure(upload_parts, args.repeat, setup=drop_upload)
+            results.append(result("transfer", "upload_stream_multipart", params, seconds, size=file_size, phases=phase_means(recorder, "upload_stream")))
+
+            recorder.clear()
+            seconds = measure(lambda: client.download_file(uploaded["id"], output_dir, parallel=True, part_size=part_size, max_workers=args.max_workers), args.repeat)
+            results.append(result("transfer", "download_file_parallel", params, seconds, size=file_size, phases=phase_means(recorder, "download_file")))
+
+            drop_upload()
+
+        # without part_size and max_workers the client tuner chooses them, it keeps adapting across the repeats
+        log(f"transfer: {file_size / MB:g} MB with adaptive parts")
+
+        params = {"file_size": file_size, "part_size": "adaptive", "max_workers": "adaptive", "latency": args.latency, "bandwidth": args.bandwidth}
+
+        def upload_adaptive() -> None:
+            uploaded.update(client.upload_stream(data, f"adaptive_{file_size}.csv", "benchmark", multipart=True))
+
+        recorder.clear()
+        seconds = measure(upload_adaptive, args.repeat, setup=drop_upload)
+        results.append(result("transfer", "upload_stream_multipart", params, seconds, size=file_size, phases=phase_means(recorder, "upload_stream")))
+
+        recorder.clear()
+        seconds = measure(lambda: client.download_file(uploaded["id"], output_dir, parallel=True), args.repeat)
+        results.append(result("transfer", "download_file_parallel", params, seconds, size=file_size, phases=phase_means(recorder, "download_file")))
+
+        drop_upload()
+
+    return results
+
+
+def run_listing(args: argparse.Namespace) -> list[dict]:
+    results = []
+
+    for catalog_size in args.listing_sizes:
+        log(f"listing: {catalog_size} records")
+
+        with MockLakehouseServer(catalog_size=catalog_size, latency=args.latency) as server:
+            client = LakehouseClient(server.address, protocol="http")
+            client.auth(email="benchmark@lakehouse.org", password="benchmark")
+
+            # the largest catalogs take a while to list, they are measured once unless asked otherwise
+            repeat = args.repeat if catalog_size < 1_000_000 else min(args.repeat, args.large_repeat)
+            params = {"catalog_size": catalog_size, "page_size": PAGE_SIZE, "latency": args.latency}
+
+            for name, function in (
+                ("list_files_dict", lambda: client.list_files_dict()),
+                ("list_files_df", lambda: client.list_files_df()),
+                ("list_files_dict_limit_100", lambda: client.list_files_dict(sort_by_key="inserted_at", sort_desc=True, limit=100, include_raw=False)),
+                ("search_files_query", lambda: client.search_files_query("processing_level=raw", "public=True", output_format="dict"))
+            ):
+                server.reset_counts()
+                seconds = measure(function, repeat)
+                requests_made = sum(server.request_counts.values()) // repeat
+                results.append(result("listing", name, params, seconds, records=catalog_size, requests=requests_made))
+
+    return results
+
+
+def run_formatting(args: argparse.Namespace) -> list[dict]:
+    results = []
+
+    for record_count in args.formatting_sizes:
+        log(f"formatting: {record_count} records")
+
+        records = [synthetic_file(index) for index in range(record_count)]
+        params = {"records": record_count}
+
+        for output_format in OUTPUT_FORMATS:
+            seconds = measure(lambda: format_output(data=records, output_format=output_format), args.repeat)
+            results.append(result("formatting", f"format_output_{output_format}", params, seconds, records=record_count))
+
+        # the dataframe of the list_*_df functions, built page by page with readable dates, users and sizes
+        pages = [records[start:start + PAGE_SIZE] for start in range(0, record_count, PAGE_SIZE)]
+
+        seconds = measure(lambda: pages_to_df(pages, FILE_COLUMNS), args.repeat)
+        results.append(result("formatting", "pages_to_df", params, seconds, records=record_count))
+
+    return results
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def result_key(entry: dict) -> tuple:
+    return (entry["suite"], entry["name"], json.dumps(entry["params"], sort_keys=True))
+
+
+def compare(results: list[dict], baseline: list[dict]) -> None:
+    """Prints the change of the median duration of every benchmark also found in the baseline"""
+    previous = {result_key(entry): entry for entry in baseline}
+
+    log("\ncomparison with the baseline (median):")
+
+    for entry in results:
+        old = previous.get(result_key(entry))
+
+        if old is None:
+            continue
+
+        before, after = old["seconds"]["median"], entry["seconds"]["median"]
+        change = (after - before) / before * 100 if before > 0 else 0
+
+        log(f"  {entry['suite']}/{entry['name']} {entry['params']}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms ({change:+.1f}%)")
+
+
+def parse_args() -> argparse.Namespace:
+    sizes = lambda value: [parse_size(size) for size in value.split(",")]  # noqa: E731
+    counts = lambda value: [int(count) for count in value.split(",")]  # noqa: E731
+
+    parser = argparse.ArgumentParser(description="Benchmarks the lakehouse client against a local mock server")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"comma separated suites to run, from {', '.join(SUITES)}")
+    parser.add_argument("--output", default="-", help="path of the json results, - prints them")
+    parser.add_argument("--baseline", help="json results of a previous run to compare with")
+    parser.add_argument("--quick", action="store_true", help="smaller files and catalogs, for a fast check")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of every benchmark")
+    parser.add_argument("--large-repeat", type=int, default=1, help="runs of the listings of catalogs of 1M records or more")
+    parser.add_argument("--latency", type=float, default=0, help="seconds the mock server waits before every response")
+    parser.add_argument("--bandwidth", type=parse_size, default=None, help="bytes per second per request body, like 100MB, unlimited by default")
+    parser.add_argument("--file-sizes", type=sizes, help="comma separated file sizes, like 1MB,16MB")
+    parser.add_argument("--part-sizes", type=sizes, help="comma separated part sizes of the multipart and parallel transfers")
+    parser.add_argument("--max-workers", type=int, default=4, help="parts sent or received at once")
+    parser.add_argument("--listing-sizes", type=counts, help="comma separated catalog sizes, like 10000,100000")
+    parser.add_argument("--formatting-sizes", type=counts, help="comma separated record counts formatted")
+
+    args = parser.parse_args()
+
+    args.suites = [suite.strip() for suite in args.suites.split(",")]
+
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"Unknown suite {suite!r}, expected one of {', '.join(SUITES)}")
+
+    args.file_sizes = args.file_sizes or (QUICK_FILE_SIZES if args.quick else FILE_SIZES)
+    args.part_sizes = args.part_sizes or (QUICK_PART_SIZES if args.quick else PART_SIZES)
+    args.listing_sizes = args.listing_sizes or (QUICK_LISTING_SIZES if args.quick else LISTING_SIZES)
+    args.formatting_sizes = args.formatting_sizes or (QUICK_FORMATTING_SIZES if args.quick else FORMATTING_SIZES)
+
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+
+    runners = {"transfer": run_transfer, "listing": run_listing, "formatting": run_formatting}
+
+    results = []
+
+    for suite in args.suites:
+        results.extend(runners[suite](args))
+
+    report = {
+        "environment": environment(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "results": results
+    }
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        log(f"\nresults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(results, json.load(file)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,9 @@ setup(
         "pydantic>=2.11.4"
     ],
     extras_require={
-        "dev": ["pytest>=7.0", "twine>=4.0.2"]
+        "dev": ["pytest>=7.0", "twine>=4.0.2"],
+        "zstd": ["zstandard>=0.22.0"],
+        "async": ["httpx>=0.27.0"]
     },
     python_requires=">=3.9",
     include_package_data=True,
@@ -0,0 +1,8 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the tests run against the working tree and the mock server of the benchmarks
+sys.path.insert(0, os.path.join(REPO_DIR, "app"))
+sys.path.insert(0, os.path.join(REPO_DIR, "benchmarks"))
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+pd = pytest.importorskip("pandas")
+
+from lakehouse import AsyncLakehouseClient
+from mock_server import MockLakehouseServer
+
+DATA = bytes(range(256)) * 4000
+
+
+def run(server: MockLakehouseServer, work):
+    async def main():
+        async with AsyncLakehouseClient(server.address, protocol="http") as client:
+            return await work(client)
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def disk_writes(monkeypatch) -> list:
+    """Records the file writes sent to worker threads"""
+    writes = []
+    to_thread = asyncio.to_thread
+
+    def counting(function, *args, **kwargs):
+        if getattr(function, "__name__", None) == "write":
+            writes.append(len(args[0]))
+        return to_thread(function, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", counting)
+
+    return writes
+
+
+@pytest.mark.parametrize("multipart", [False, True])
+def test_upload_file(tmp_path, multipart):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+
+    with MockLakehouseServer() as server:
+        record = run(server, lambda client: client.upload_file(str(path), "data", "c1", multipart=multipart, part_size=100000))
+
+        assert record["file_name"] == "data.bin"
+        assert server.content(record["id"]) == DATA
+
+
+def test_download_file_writes_in_worker_threads(tmp_path, disk_writes):
+    with MockLakehouseServer() as server:
+        async def work(client):
+            record = await client.upload_stream(DATA, "data.bin", "c1")
+            return await client.download_file(record["id"], str(tmp_path))
+
+        path = run(server, work)
+
+        assert open(path, "rb").read() == DATA
+        assert sum(disk_writes) == len(DATA)
+
+
+@pytest.mark.parametrize("spill_threshold, spilled", [(64 * 1024 * 1024, False), (1024, True)])
+def test_get_dataframe_only_offloads_spilled_writes(disk_writes, spill_threshold, spilled):
+    df = pd.DataFrame({"a": range(100000), "b": [f"row {index}" for index in range(100000)]})
+
+    with MockLakehouseServer() as server:
+        async def work(client):
+            record = await client.upload_dataframe(df, "df", "c1")
+            disk_writes.clear()
+            return await client.get_dataframe(record["id"], spill_threshold=spill_threshold)
+
+        loaded = run(server, work)
+
+        pd.testing.assert_frame_equal(loaded, df)
+        assert bool(disk_writes) == spilled
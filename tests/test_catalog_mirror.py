@@ -0,0 +1,77 @@
+import pytest
+
+from lakehouse import CatalogMirror, LakehouseClient
+from mock_server import MockLakehouseServer
+
+CATALOG_SIZE = 2500
+
+QUERIES = [
+    ("processing_level=curated",),
+    ("processing_level!=raw",),
+    ("file_size>=2048000", "public=True"),
+    ("inserted_by=u:user7@lakehouse.org", "file_size<100000"),
+    ("file_name*sample_12",),
+    ("file_version=1", "file_category!=structured"),
+    # synthetic records have no description, the server and the mirror keep them for !=
+    ("file_description!=notes",),
+    ("collection_id!=c1",),
+]
+
+
+def search_requests(server: MockLakehouseServer) -> int:
+    return server.request_counts.get("/catalog/files/search", 0)
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=lambda query: " ".join(query))
+def test_mirror_search_matches_the_server(query):
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE) as server:
+        client = LakehouseClient(server.address, protocol="http", mirror=CatalogMirror())
+
+        assert client.sync_catalog_mirror(["files"]) == {"files": CATALOG_SIZE}
+
+        served = client.search_files_query(*query, output_format="dict")
+        mirrored = client.search_files_query(*query, output_format="dict", use_mirror=True)
+
+        assert served
+        assert [record["id"] for record in mirrored] == [record["id"] for record in served]
+
+
+def test_incremental_sync_fetches_new_records():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE) as server:
+        mirror = CatalogMirror()
+        client = LakehouseClient(server.address, protocol="http", mirror=mirror)
+
+        client.sync_catalog_mirror(["files"])
+
+        uploaded = [client.upload_stream(b"data", f"new_{index}.csv", "c1")["id"] for index in range(3)]
+        counts = client.sync_catalog_mirror(["files"])
+
+        assert 3 <= counts["files"] < CATALOG_SIZE
+        assert mirror.count("files") == CATALOG_SIZE + 3
+        assert [record["id"] for record in mirror.search("files", [("file_name", "*", "new_")])] == uploaded
+
+
+def test_incremental_sync_is_paged():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE) as server:
+        mirror = CatalogMirror()
+        client = LakehouseClient(server.address, protocol="http", mirror=mirror)
+
+        # an empty mirror that was synced searches every record inserted since 0
+        mirror.replace("files", [])
+
+        assert client.sync_catalog_mirror(["files"]) == {"files": CATALOG_SIZE}
+        assert mirror.count("files") == CATALOG_SIZE
+        assert search_requests(server) == -(-CATALOG_SIZE // 1000)
+
+
+def test_incremental_sync_falls_back_to_a_full_sync():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE, paginate_searches=False) as server:
+        mirror = CatalogMirror()
+        client = LakehouseClient(server.address, protocol="http", mirror=mirror)
+
+        mirror.replace("files", [])
+
+        assert client.sync_catalog_mirror(["files"]) == {"files": CATALOG_SIZE}
+        assert mirror.count("files") == CATALOG_SIZE
+        assert search_requests(server) == 1
+        assert server.request_counts["/catalog/files/all/"] == -(-CATALOG_SIZE // 1000)
@@ -0,0 +1,95 @@
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.compression import StreamDecompressor, compress_chunks, decompress_chunks, select_codec
+from mock_server import MockLakehouseServer
+
+CODECS = ["gzip", pytest.param("zstd", marks=pytest.mark.skipif(not importlib.util.find_spec("zstandard"), reason="zstandard is not installed"))]
+
+DATA = b"".join(f"{index},sample_{index}.csv,{index * 1024}\n".encode() for index in range(50000))
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("chunk_size", [1, 1000, 1024 * 1024])
+def test_chunks_round_trip(codec, chunk_size):
+    compressed = b"".join(compress_chunks(chunked(DATA, 65536), codec))
+
+    assert len(compressed) < len(DATA) / 2
+    assert b"".join(decompress_chunks(chunked(compressed, chunk_size), codec)) == DATA
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("cut", [1, 100])
+def test_truncated_transfers_raise(codec, cut):
+    compressed = b"".join(compress_chunks([DATA], codec))
+    decompressor = StreamDecompressor(codec)
+
+    decompressor.decompress(compressed[:-cut])
+
+    with pytest.raises(Exception, match=f"Truncated {codec} transfer"):
+        decompressor.flush()
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_empty_transfers_are_complete(codec):
+    assert b"".join(decompress_chunks(compress_chunks([], codec), codec)) == b""
+
+
+def test_codec_selection():
+    assert select_codec("data.csv", "gzip") == "gzip"
+    assert select_codec("data.parquet", "gzip") is None
+    assert select_codec("data.csv") is None
+
+    with pytest.raises(Exception, match="Unsupported transfer compression"):
+        select_codec("data.csv", "lz4")
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_compressed_upload_and_download(tmp_path, codec):
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        record = client.upload_stream(iter(chunked(DATA, 100000)), "data.csv", "c1", transfer_compression=codec)
+        stored = server.content(record["id"])
+
+        assert record["file_size"] == len(DATA)
+        assert record["metadata"]["transfer_compression"] == codec
+        assert record["metadata"]["compressed_size"] == len(stored) < len(DATA)
+
+        path = client.download_file(record["id"], str(tmp_path))
+
+        assert open(path, "rb").read() == DATA
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("asynchronous", [False, True], ids=["sync", "async"])
+def test_truncated_stored_files_raise(tmp_path, codec, asynchronous):
+    if asynchronous:
+        lakehouse = pytest.importorskip("lakehouse")
+        pytest.importorskip("httpx")
+
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+        file_id = client.upload_stream(DATA, "data.csv", "c1", transfer_compression=codec)["id"]
+
+        del server.blobs[file_id][-100:]
+
+        async def download():
+            async with lakehouse.AsyncLakehouseClient(server.address, protocol="http") as async_client:
+                return await async_client.download_file(file_id, str(tmp_path), verify=False)
+
+        with pytest.raises(Exception, match=f"Truncated {codec} transfer"):
+            if asynchronous:
+                asyncio.run(download())
+            else:
+                client.download_file(file_id, str(tmp_path), verify=False)
+
+        assert os.listdir(tmp_path) == []
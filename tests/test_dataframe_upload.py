@@ -0,0 +1,28 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from lakehouse import LakehouseClient
+from mock_server import MockLakehouseServer
+
+DF = pd.DataFrame({"id": range(1000), "name": [f"sample_{index}" for index in range(1000)], "size": [index * 0.5 for index in range(1000)]})
+
+
+@pytest.mark.parametrize("file_format, extension, compression", [("parquet", ".parquet", "snappy"), ("feather", ".feather", "lz4"), ("csv", ".csv", None)])
+def test_dataframe_round_trip(file_format, extension, compression):
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        record = client.upload_dataframe(DF, "samples", "c1", file_format=file_format)
+
+        assert record["file_name"] == f"samples{extension}"
+        assert record["metadata"]["file_format"] == file_format
+        assert record["metadata"].get("compression") == compression
+
+        pd.testing.assert_frame_equal(client.get_dataframe(record["id"]), DF)
+
+
+def test_unsupported_formats_raise():
+    with pytest.raises(Exception, match="Unsupported dataframe format"):
+        LakehouseClient("localhost").upload_dataframe(DF, "samples", "c1", file_format="xlsx")
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.transfer import download_ranges
+from lakehouse.src.transport import HTTPTransport
+from mock_server import MockLakehouseServer
+
+DATA = bytes(range(256)) * 4000
+PART_SIZE = 100000
+
+
+def upload(server: MockLakehouseServer) -> tuple[LakehouseClient, str]:
+    client = LakehouseClient(server.address, protocol="http")
+
+    return client, client.upload_stream(DATA, "data.bin", "c1")["id"]
+
+
+def test_ranges_are_assembled(tmp_path):
+    with MockLakehouseServer() as server:
+        _, file_id = upload(server)
+        output_file_path = str(tmp_path / "data.bin")
+
+        download_ranges(HTTPTransport(), f"http://{server.address}/signed/{file_id}", output_file_path, part_size=PART_SIZE, max_workers=4)
+
+        assert open(output_file_path, "rb").read() == DATA
+
+
+@pytest.mark.parametrize("first_range_error", [-1000, 1000])
+def test_probe_range_of_wrong_length_raises(tmp_path, first_range_error):
+    with MockLakehouseServer(first_range_error=first_range_error) as server:
+        _, file_id = upload(server)
+        output_file_path = str(tmp_path / "data.bin")
+
+        with pytest.raises(Exception, match="Incomplete range 0-99999"):
+            download_ranges(HTTPTransport(), f"http://{server.address}/signed/{file_id}", output_file_path, part_size=PART_SIZE)
+
+        assert not os.path.exists(output_file_path)
+
+
+def test_parallel_download_file_leaves_no_truncated_file(tmp_path):
+    with MockLakehouseServer(first_range_error=-1000) as server:
+        client, file_id = upload(server)
+
+        with pytest.raises(Exception, match="Incomplete range"):
+            client.download_file(file_id, str(tmp_path), parallel=True, part_size=PART_SIZE, verify=False)
+
+        assert os.listdir(tmp_path) == []
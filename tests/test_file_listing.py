@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from lakehouse import LakehouseClient
+from mock_server import MockLakehouseServer
+
+CATALOG_SIZE = 2500
+
+
+def expected_records(server: MockLakehouseServer, levels: list[str], sort_by_key: str = None, sort_desc: bool = False, limit: int = None) -> list[dict]:
+    records = [record for record in server.iter_file_records() if record["processing_level"] in levels]
+
+    if sort_by_key:
+        records = sorted(records, key=lambda record: record[sort_by_key], reverse=sort_desc)
+
+    return records if limit is None else records[:limit]
+
+
+def search_requests(server: MockLakehouseServer) -> int:
+    return server.request_counts.get("/catalog/files/search", 0)
+
+
+@pytest.mark.parametrize("sorting", [False, True])
+def test_sorted_limit_without_raw_files(sorting):
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE, sorting=sorting) as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        records = client.list_files_dict(include_raw=False, sort_by_key="file_size", sort_desc=True, limit=1)
+
+        assert [record["file_size"] for record in records] == [max(record["file_size"] for record in expected_records(server, ["processed", "curated"]))]
+
+        # the limit is only pushed to the server once it confirmed the sorting
+        assert search_requests(server) == (1 if sorting else 2)
+
+
+def test_sorted_limit_dataframe_from_server_ignoring_sorting():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE, sorting=False) as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        df = client.list_files_df(include_raw=False, include_processed=False, sort_by_key="file_size", limit=3)
+
+        assert list(df["id"]) == [record["id"] for record in expected_records(server, ["curated"], "file_size", limit=3)]
+
+
+def test_filtered_listing_is_paged():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE) as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        ids = [record["id"] for record in client.list_files_iter(include_raw=False, page_size=100)]
+
+        assert ids == [record["id"] for record in expected_records(server, ["processed", "curated"])]
+        assert search_requests(server) == -(-len(ids) // 100)
+
+
+def test_filtered_listing_falls_back_to_paged_listing():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE, paginate_searches=False) as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        ids = [record["id"] for record in client.list_files_iter(include_curated=False, page_size=100)]
+
+        assert ids == [record["id"] for record in expected_records(server, ["raw", "processed"])]
+        assert search_requests(server) == 1
+        assert server.request_counts["/catalog/files/all/"] == CATALOG_SIZE // 100
+
+
+def test_unsorted_limit_stops_early():
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE) as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        records = client.list_files_dict(include_raw=False, limit=5)
+
+        assert [record["id"] for record in records] == [record["id"] for record in expected_records(server, ["processed", "curated"], limit=5)]
+        assert search_requests(server) == 1
+
+
+def test_async_sorted_limit_from_server_ignoring_sorting():
+    lakehouse = pytest.importorskip("lakehouse")
+    pytest.importorskip("httpx")
+
+    async def run(server: MockLakehouseServer) -> list[dict]:
+        async with lakehouse.AsyncLakehouseClient(server.address, protocol="http") as client:
+            return await client.list_files_dict(include_raw=False, sort_by_key="file_size", sort_desc=True, limit=1)
+
+    with MockLakehouseServer(catalog_size=CATALOG_SIZE, sorting=False) as server:
+        records = asyncio.run(run(server))
+
+        assert [record["file_size"] for record in records] == [max(record["file_size"] for record in expected_records(server, ["processed", "curated"]))]
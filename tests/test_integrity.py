@@ -0,0 +1,99 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.cache import ObjectCache
+from lakehouse.src.integrity import HashingReader
+from mock_server import MockLakehouseServer
+
+DATA = os.urandom(300000)
+
+
+def cache_entries(cache: ObjectCache) -> list[str]:
+    objects_dir = os.path.join(cache.directory, "objects")
+    return [os.path.join(root, name) for root, _, files in os.walk(objects_dir) for name in files]
+
+
+def test_hashing_reader():
+    reader = HashingReader(io.BytesIO(DATA))
+    buffer = bytearray(1000)
+
+    read = reader.readinto(buffer)
+    rest = reader.read()
+
+    assert bytes(buffer[:read]) + rest == DATA
+    assert reader.size == len(DATA)
+    assert reader.hexdigest() == hashlib.sha256(DATA).hexdigest()
+
+
+def test_uploads_record_their_checksum():
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        record = client.upload_stream(iter([DATA[:1000], DATA[1000:]]), "data.bin", "c1")
+
+        assert record["metadata"]["checksum"] == hashlib.sha256(DATA).hexdigest()
+        assert record["metadata"]["checksum_algorithm"] == "sha256"
+
+
+def test_deduplicated_uploads_skip_the_transfer():
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        first = client.upload_stream(DATA, "data.bin", "c1", deduplicate=True)
+        transfers = server.request_counts["/signed/{id}"]
+        second = client.upload_stream(DATA, "data.bin", "c1", deduplicate=True)
+
+        assert second["id"] == first["id"]
+        assert server.request_counts["/signed/{id}"] == transfers
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_corrupted_downloads_raise(tmp_path, parallel):
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+        file_id = client.upload_stream(DATA, "data.bin", "c1")["id"]
+
+        server.blobs[file_id][10] ^= 0xFF
+
+        with pytest.raises(Exception, match="Checksum mismatch"):
+            client.download_file(file_id, str(tmp_path), parallel=parallel, part_size=100000)
+
+        assert os.listdir(tmp_path) == []
+
+        path = client.download_file(file_id, str(tmp_path), verify=False)
+
+        assert open(path, "rb").read() != DATA
+
+
+def test_cache_hits_are_verified(tmp_path):
+    cache = ObjectCache(str(tmp_path / "cache"))
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http", cache=cache)
+        file_id = client.upload_stream(DATA, "data.bin", "c1")["id"]
+
+        client.download_file(file_id, str(output_dir))
+
+        (entry,) = cache_entries(cache)
+        with open(entry, "r+b") as file:
+            file.write(b"corrupted")
+
+        # the corrupted entry is only returned when verification is off
+        path = client.download_file(file_id, str(output_dir), verify=False)
+        assert open(path, "rb").read().startswith(b"corrupted")
+
+        with pytest.raises(Exception, match="Checksum mismatch"):
+            client.download_file(file_id, str(output_dir))
+
+        assert cache_entries(cache) == []
+
+        path = client.download_file(file_id, str(output_dir))
+
+        assert open(path, "rb").read() == DATA
+        assert len(cache_entries(cache)) == 1
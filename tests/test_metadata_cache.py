@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.cache import MetadataCache
+from mock_server import MockLakehouseServer
+
+
+class Fetcher:
+    """Counts its calls and returns a new value on each of them"""
+
+    def __init__(self, delay: float = 0) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self) -> int:
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls += 1
+            return self.calls
+
+
+def test_ttl_of_the_longest_prefix():
+    cache = MetadataCache({"/catalog/": 10, "/catalog/files/": 1})
+
+    assert cache.ttl_for("/catalog/files/all/") == 1
+    assert cache.ttl_for("/catalog/collections/all/") == 10
+    assert cache.ttl_for("/storage/files/upload-request") is None
+
+
+def test_responses_expire():
+    cache = MetadataCache({"/catalog/": 0.1})
+    fetch = Fetcher()
+
+    assert [cache.get_or_fetch(("key",), "/catalog/files/all/", fetch) for _ in range(3)] == [1, 1, 1]
+
+    time.sleep(0.15)
+
+    assert cache.get_or_fetch(("key",), "/catalog/files/all/", fetch) == 2
+
+
+def test_uncached_endpoints_are_always_fetched():
+    cache = MetadataCache({"/catalog/": 10})
+    fetch = Fetcher()
+
+    assert [cache.get_or_fetch(("key",), "/storage/bucket-list", fetch) for _ in range(3)] == [1, 2, 3]
+
+
+def test_identical_requests_share_one_fetch():
+    cache = MetadataCache({"/catalog/": 10})
+    fetch = Fetcher(delay=0.2)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: cache.get_or_fetch(("key",), "/catalog/files/all/", fetch), range(8)))
+
+    assert values == [1] * 8
+    assert fetch.calls == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = MetadataCache({"/catalog/": 10})
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.2)
+        raise Exception("server error")
+
+    def call(fetch):
+        try:
+            return cache.get_or_fetch(("key",), "/catalog/files/all/", fetch)
+        except Exception as error:
+            return str(error)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        owner = executor.submit(call, fail)
+        started.wait()
+        waiters = [executor.submit(call, Fetcher()) for _ in range(3)]
+
+    assert [future.result() for future in [owner, *waiters]] == ["server error"] * 4
+    assert cache.get_or_fetch(("key",), "/catalog/files/all/", lambda: "fetched") == "fetched"
+
+
+def test_responses_fetched_during_an_invalidation_are_not_cached():
+    cache = MetadataCache({"/catalog/": 10})
+
+    def fetch():
+        cache.invalidate("/catalog/files")
+        return "stale"
+
+    assert cache.get_or_fetch(("key",), "/catalog/files/all/", fetch) == "stale"
+    assert cache.get_or_fetch(("key",), "/catalog/files/all/", lambda: "fresh") == "fresh"
+
+
+@pytest.mark.parametrize("prefix, hit", [(None, False), ("/catalog/files", False), ("/catalog/collections", True)])
+def test_invalidation_by_prefix(prefix, hit):
+    cache = MetadataCache({"/catalog/": 10})
+    cache.get_or_fetch(("key",), "/catalog/files/all/", lambda: "cached")
+
+    cache.invalidate(prefix)
+
+    assert (cache.get_or_fetch(("key",), "/catalog/files/all/", lambda: "fetched") == "cached") == hit
+
+
+def test_client_reuses_listings_until_an_upload():
+    with MockLakehouseServer(catalog_size=10) as server:
+        client = LakehouseClient(server.address, protocol="http", metadata_cache=MetadataCache())
+
+        assert len(client.list_files_dict()) == 10
+        assert len(client.list_files_dict()) == 10
+        assert server.request_counts["/catalog/files/all/"] == 1
+
+        client.upload_stream(b"data", "data.bin", "c1")
+
+        assert len(client.list_files_dict()) == 11
+        assert server.request_counts["/catalog/files/all/"] == 2
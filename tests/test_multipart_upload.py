@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.transfer import upload_parts
+from lakehouse.src.transport import HTTPTransport
+from mock_server import MockLakehouseServer
+
+DATA = bytes(range(256)) * 4000
+PART_SIZE = 100000
+PARTS = -(-len(DATA) // PART_SIZE)
+
+
+class Unseekable(io.RawIOBase):
+    """A file object whose size can not be known in advance, like a pipe"""
+
+    def __init__(self, data: bytes) -> None:
+        self.__file = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        return self.__file.readinto(buffer)
+
+
+def blob_requests(server: MockLakehouseServer) -> int:
+    return server.request_counts.get("/signed/{id}", 0)
+
+
+def test_multipart_upload_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        record = client.upload_file(str(path), "data", "c1", multipart=True, part_size=PART_SIZE, max_workers=4)
+
+        assert server.content(record["id"]) == DATA
+        assert record["file_size"] == len(DATA)
+        assert blob_requests(server) == PARTS
+
+
+@pytest.mark.parametrize("data", [lambda: iter([DATA[:5000], DATA[5000:]]), lambda: Unseekable(DATA)], ids=["iterator", "unseekable"])
+def test_multipart_upload_of_unknown_size_is_serial(data):
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http")
+
+        record = client.upload_stream(data(), "data.bin", "c1", multipart=True, part_size=PART_SIZE)
+
+        assert server.content(record["id"]) == DATA
+        # the size is only known once the data was sent
+        assert record["file_size"] == len(DATA)
+        assert "part_urls" not in record
+
+
+@pytest.mark.parametrize("size, error", [((PARTS - 2) * PART_SIZE, "File ended before part"), (PARTS * PART_SIZE + 1, "larger than")])
+def test_upload_parts_checks_the_size_against_the_parts(size, error):
+    with MockLakehouseServer() as server:
+        file_id, _ = server.create_upload({"file_name": "data.bin", "collection_catalog_id": "c1", "part_count": PARTS})
+        url = f"http://{server.address}/signed/{file_id}"
+        part_urls = [f"{url}?part={number}" for number in range(1, PARTS + 1)]
+
+        with pytest.raises(Exception, match=error):
+            upload_parts(HTTPTransport(), part_urls, io.BytesIO(bytes(size)), part_size=PART_SIZE, max_workers=2)
@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.cache import ObjectCache
+from mock_server import MockLakehouseServer
+
+RECORD = {"id": "f1", "file_version": 1, "file_size": 100, "etag": "a"}
+
+
+def writer(content: bytes):
+    def write(path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(content)
+
+    return write
+
+
+def cached_files(cache: ObjectCache) -> list[str]:
+    return [name for _, _, files in os.walk(cache.directory) for name in files if name != ".lock"]
+
+
+def test_store_and_open(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+    key = ObjectCache.key_for(RECORD)
+
+    assert cache.open(key) is None
+
+    with cache.store(key, writer(b"x" * 100)) as file:
+        assert file.read() == b"x" * 100
+
+    with cache.open(key) as file:
+        assert file.read() == b"x" * 100
+
+
+@pytest.mark.parametrize("change", [{"file_version": 2}, {"file_size": 101}, {"etag": "b"}, {"id": "f2"}])
+def test_new_versions_do_not_hit_old_entries(change):
+    assert ObjectCache.key_for({**RECORD, **change}) != ObjectCache.key_for(RECORD)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ObjectCache(str(tmp_path), max_bytes=250)
+
+    for name in ("a", "b"):
+        cache.store(name * 64, writer(b"x" * 100)).close()
+        time.sleep(0.02)
+
+    # opening an entry marks it as recently used, so "b" is the oldest
+    cache.open("a" * 64).close()
+    time.sleep(0.02)
+
+    cache.store("c" * 64, writer(b"x" * 100)).close()
+
+    assert cache.open("b" * 64) is None
+    assert cache.open("a" * 64) is not None
+    assert cache.open("c" * 64) is not None
+
+
+def test_failed_writes_leave_nothing(tmp_path):
+    cache = ObjectCache(str(tmp_path))
+
+    def fail(path: str) -> None:
+        writer(b"partial")(path)
+        raise Exception("transfer failed")
+
+    with pytest.raises(Exception, match="transfer failed"):
+        cache.store("a" * 64, fail)
+
+    assert cached_files(cache) == []
+
+
+def store_entries(directory: str, worker: int) -> None:
+    cache = ObjectCache(directory, max_bytes=1000)
+
+    for index in range(30):
+        content = f"{worker}-{index}".encode() * 20
+
+        with cache.store(f"{worker:02d}{index:062d}", writer(content)) as file:
+            assert file.read() == content
+
+
+def test_processes_share_a_cache(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=store_entries, args=(str(tmp_path), worker)) for worker in range(4)]
+
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0] * 4
+
+    cache = ObjectCache(str(tmp_path), max_bytes=1000)
+    sizes = [os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(os.path.join(cache.directory, "objects")) for name in files]
+
+    assert not any(name.endswith(".tmp") for name in cached_files(cache))
+    assert sum(sizes) <= 1000
+
+
+def test_client_downloads_cached_files_once(tmp_path):
+    with MockLakehouseServer() as server:
+        client = LakehouseClient(server.address, protocol="http", cache=ObjectCache(str(tmp_path / "cache")))
+
+        file_id = client.upload_stream(b"x" * 1000, "data.bin", "c1")["id"]
+
+        for output in ("first", "second", "third"):
+            (tmp_path / output).mkdir()
+
+        for output in ("first", "second"):
+            path = client.download_file(file_id, str(tmp_path / output))
+            assert open(path, "rb").read() == b"x" * 1000
+
+        # one upload request and one download request reached the signed urls
+        assert server.request_counts["/signed/{id}"] == 2
+
+        # a new version of the record is a cache miss
+        server.uploaded_files[file_id]["file_version"] = 2
+        client.download_file(file_id, str(tmp_path / "third"))
+
+        assert server.request_counts["/signed/{id}"] == 3
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from lakehouse import LakehouseClient
+from lakehouse.src.remote import RemoteFile
+from lakehouse.src.transport import HTTPTransport
+from mock_server import MockLakehouseServer
+
+DATA = os.urandom(300000)
+
+
+def signed_url(server: MockLakehouseServer) -> str:
+    file_id = LakehouseClient(server.address, protocol="http").upload_stream(DATA, "data.bin", "c1")["id"]
+
+    return f"http://{server.address}/signed/{file_id}"
+
+
+def test_reads_are_served_by_ranges():
+    with MockLakehouseServer() as server:
+        remote = RemoteFile(HTTPTransport(), signed_url(server), block_size=10000)
+
+        assert remote.size == len(DATA)
+        assert remote.supports_ranges
+
+        remote.seek(123456)
+        assert remote.read(50000) == DATA[123456:173456]
+
+        remote.seek(-100, os.SEEK_END)
+        assert remote.read() == DATA[-100:]
+
+        # the tail block and the blocks of the middle read
+        assert remote.bytes_fetched < len(DATA) / 4
+
+
+def test_short_tail_raises():
+    with MockLakehouseServer(first_range_error=-1000) as server:
+        url = signed_url(server)
+
+        # files smaller than a block are opened with a range starting at 0
+        with pytest.raises(Exception, match=f"Incomplete range 0-{len(DATA) - 1}"):
+            RemoteFile(HTTPTransport(), url, block_size=1024 * 1024)
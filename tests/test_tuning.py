@@ -0,0 +1,42 @@
+import pytest
+
+from lakehouse import AdaptiveTuner, LakehouseClient
+from lakehouse.src.transport import HTTPTransport
+
+
+def test_concurrency_is_capped_at_the_pool_size():
+    tuner = AdaptiveTuner(max_concurrency=16, concurrency=12)
+
+    LakehouseClient("localhost", transport=HTTPTransport(pool_size=6), tuner=tuner)
+
+    assert tuner.max_concurrency == 6
+    assert tuner.concurrency == 6
+
+
+def test_default_pool_caps_the_tuner():
+    tuner = AdaptiveTuner(max_concurrency=16)
+
+    LakehouseClient("localhost", tuner=tuner)
+
+    assert tuner.max_concurrency == HTTPTransport().pool_size
+
+
+def test_cap_keeps_the_minimum_concurrency():
+    tuner = AdaptiveTuner(min_concurrency=4, max_concurrency=16)
+
+    tuner.cap_concurrency(2)
+
+    assert tuner.max_concurrency == 4
+
+
+def test_async_concurrency_is_capped_at_the_connections():
+    pytest.importorskip("httpx")
+
+    from lakehouse import AsyncLakehouseClient
+    from lakehouse.src.async_transport import AsyncHTTPTransport
+
+    tuner = AdaptiveTuner()
+
+    AsyncLakehouseClient("localhost", transport=AsyncHTTPTransport(max_connections=3), tuner=tuner)
+
+    assert tuner.max_concurrency == 3